@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Build orchestrator for the site generators
+
+Runs the generator scripts in dependency order, each from the working
+directory it expects, and skips every step whose inputs have not changed
+since it last succeeded. Inputs are compared by content hash, not mtime, so
+touching a file or switching branches back and forth does not make a step
+stale.
+
+Dependencies are derived from the declared inputs and outputs: a step that
+writes what another reads runs first, wherever it is listed, so one build
+settles the tree. Steps that read and write the same files (the converters
+and the _publications fixers) keep the order they are listed in. Steps with
+no such relation run in parallel.
+
+A step that exits with EXIT_SKIPPED (an optional tool is missing) is
+reported as skipped and is not recorded as done, so it runs again once the
+tool is installed.
+
+Steps marked default=False only run when named on the command line.
+
+Usage:
+    python3 build.py                  # run whatever is out of date
+    python3 build.py --dry-run        # show what would run
+    python3 build.py --force talkmap  # rerun one step regardless of its inputs
+    python3 build.py publications     # regenerate _publications from publications.tsv
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date
+
+from build_utils import CACHE_DIR, EXIT_SKIPPED, SITE_ROOT, content_hash, file_hash, load_json, save_json
+
+CACHE_FILE = CACHE_DIR / "build.json"
+
+
+@dataclass
+class Step:
+    name: str
+    command: list
+    cwd: str = "."
+    inputs: list = field(default_factory=list)
+    outputs: list = field(default_factory=list)
+    required: list = field(default_factory=list)  # inputs that must match something
+    default: bool = True  # run without being named on the command line
+    dated: bool = False  # output depends on today's date (future-dated posts), so rerun daily
+
+
+# Modules the converters import; a fix to any of them must rerun the converters
+GENERATOR_MODULES = [
+    "markdown_generator/__init__.py",
+    "markdown_generator/latex.py",
+    "markdown_generator/output_sink.py",
+    "markdown_generator/venues.py",
+]
+
+
+# Inputs and outputs are globs relative to the site root. Input globs may
+# match nothing (no drafts, no projects); a step is only skipped when one of
+# its required globs, the primary sources it converts, matches nothing, e.g.
+# the BibTeX step without a .bib file.
+STEPS = [
+    # publications.tsv lags behind the hand-edited _publications/*.md (dates,
+    # slugs), so regenerating from it would overwrite those edits and add
+    # duplicates. Run it by name once the TSV is brought up to date.
+    Step(
+        "publications",
+        ["python3", "custom_publication_generator.py"],
+        cwd="markdown_generator",
+        inputs=["markdown_generator/custom_publication_generator.py", "markdown_generator/publications.tsv", *GENERATOR_MODULES],
+        outputs=["_publications/*.md"],
+        required=["markdown_generator/publications.tsv"],
+        default=False,
+    ),
+    Step(
+        "bibtex",
+        ["sh", "-c", 'for f in *.bib; do python3 simple_bibtex_converter.py "$f"; done'],
+        cwd="markdown_generator",
+        inputs=["markdown_generator/simple_bibtex_converter.py", "markdown_generator/*.bib", *GENERATOR_MODULES],
+        outputs=["_publications/*.md"],
+        required=["markdown_generator/*.bib"],
+    ),
+    Step(
+        "talks",
+        ["python3", "talks.py"],
+        cwd="markdown_generator",
+        inputs=["markdown_generator/talks.py", "markdown_generator/talks.tsv", *GENERATOR_MODULES],
+        outputs=["_talks/*.md"],
+        required=["markdown_generator/talks.tsv"],
+    ),
+    Step(
+        "talks_ics",
+        ["sh", "-c", 'for f in *.ics; do python3 talks_from_ics.py "$f"; done'],
+        cwd="markdown_generator",
+        inputs=["markdown_generator/talks_from_ics.py", "markdown_generator/*.ics", *GENERATOR_MODULES],
+        outputs=["_talks/*.md"],
+        required=["markdown_generator/*.ics"],
+    ),
+    Step(
+        "add_category",
+        ["python3", "add_category.py"],
+        inputs=["add_category.py", "_publications/*.md"],
+        outputs=["_publications/*.md"],
+    ),
+    Step(
+        "add_teaser",
+        ["python3", "add_teaser.py"],
+        inputs=["add_teaser.py", "_publications/*.md"],
+        outputs=["_publications/*.md"],
+    ),
+    Step(
+        "talkmap",
+        ["python3", "../talkmap.py"],
+        cwd="_talks",
+        inputs=["talkmap.py", "_talks/*.md"],
+        outputs=["talkmap/*"],
+    ),
+    Step(
+        "prerender_publications",
+        ["python3", "prerender_publications.py"],
+        inputs=["prerender_publications.py", "_publications/*.md"],
+        outputs=["_includes/publication-cards/*", "_data/publication_cards.yml"],
+    ),
+    Step(
+        "precompute_archives",
+        ["python3", "precompute_archives.py"],
+        inputs=["precompute_archives.py", "_posts/*", "_data/news.yml"],
+        outputs=["_data/archive/*"],
+        dated=True,
+    ),
+    Step(
+        "icon_subset",
+        ["python3", "subset_icons.py"],
+        inputs=[
+            "subset_icons.py", "_config.yml", "_includes/**/*", "_layouts/*", "_pages/*", "_posts/*",
+            "_publications/*", "_projects/*", "_data/*.yml", "assets/css/academicons.css",
+            "assets/webfonts/*.ttf", "_sass/vendor/font-awesome/_variables.scss",
+        ],
+        outputs=["assets/fonts/subset/*", "assets/css/icons.css", "_data/icon_subset.yml"],
+    ),
+    Step(
+        "content_stats",
+        ["python3", "precompute_content_stats.py"],
+        inputs=["precompute_content_stats.py", "_config.yml", "_pages/*", "_posts/*", "_drafts/*", "_publications/*", "_projects/*"],
+        outputs=["_data/content_stats.yml"],
+    ),
+    Step(
+        "sitemap",
+        ["python3", "generate_sitemap.py"],
+        inputs=["generate_sitemap.py", "_config.yml", "_pages/*", "_posts/*", "_publications/*.md", "_projects/*"],
+        outputs=["sitemap.xml", "sitemaps/*", "feed.xml", "feed/*"],
+        dated=True,
+    ),
+]
+
+
+def glob_root(pattern):
+    """The directory part of a glob, used to decide whether two globs can overlap"""
+    parts = []
+    for part in pattern.split("/"):
+        if any(c in part for c in "*?["):
+            break
+        parts.append(part)
+    return "/".join(parts)
+
+
+def glob_regex(pattern):
+    """Regex for the paths a glob matches: * and ? stay within one path segment"""
+    parts = re.split(r"(\*\*/|\*|\?)", pattern)
+    wildcards = {"**/": "(?:.*/)?", "*": "[^/]*", "?": "[^/]"}
+    return re.compile("".join(wildcards.get(part, re.escape(part)) for part in parts) + r"\Z")
+
+
+def glob_overlap(a, b):
+    """Whether two globs can match the same path"""
+    wild_a, wild_b = any(c in a for c in "*?["), any(c in b for c in "*?[")
+    if not wild_a or not wild_b:
+        return bool(glob_regex(b).match(a)) if not wild_a else bool(glob_regex(a).match(b))
+    if "**" not in a and "**" not in b and a.count("/") != b.count("/"):
+        return False  # _data/*.yml never matches _data/archive/2024.yml
+    ra, rb = glob_root(a), glob_root(b)
+    return ra == rb or ra.startswith(rb + "/") or rb.startswith(ra + "/")
+
+
+def overlaps(patterns_a, patterns_b):
+    return any(glob_overlap(a, b) for a in patterns_a for b in patterns_b)
+
+
+def dependencies(steps):
+    """Map each step name to the steps it has to wait for
+
+    A step that writes what another reads comes first. Related steps that
+    both read what the other writes, or only write the same files, keep the
+    order they are listed in.
+    """
+    deps = {step.name: set() for step in steps}
+    for i, a in enumerate(steps):
+        for b in steps[i + 1:]:
+            a_feeds_b = overlaps(a.outputs, b.inputs)
+            b_feeds_a = overlaps(b.outputs, a.inputs)
+            if b_feeds_a and not a_feeds_b:
+                deps[a.name].add(b.name)
+            elif a_feeds_b or b_feeds_a or overlaps(a.outputs, b.outputs):
+                deps[b.name].add(a.name)
+    return deps
+
+
+def build_order(steps):
+    """The steps sorted so each comes after the steps it depends on, else in listed order"""
+    deps = dependencies(steps)
+    order, done = [], set()
+    while len(order) < len(steps):
+        ready = [step for step in steps if step.name not in done and deps[step.name] <= done]
+        if not ready:
+            cycle = sorted(step.name for step in steps if step.name not in done)
+            raise ValueError(f"dependency cycle between steps: {', '.join(cycle)}")
+        order.append(ready[0])
+        done.add(ready[0].name)
+    return order
+
+
+def input_files(step):
+    """Every file matched by the step's inputs, or None if a required glob matches nothing"""
+    files = set()
+    for pattern in step.inputs:
+        matched = [p for p in SITE_ROOT.glob(pattern) if p.is_file()]
+        if not matched and pattern in step.required:
+            return None
+        files.update(matched)
+    return sorted(files)
+
+
+def fingerprint(step, files):
+    """Hash the command together with the content of every input file"""
+    parts = [" ".join(step.command), step.cwd]
+    if step.dated:
+        parts.append(date.today().isoformat())
+    parts += [f"{p.relative_to(SITE_ROOT).as_posix()}:{file_hash(p)}" for p in files]
+    return content_hash("\n".join(parts))
+
+
+def run_step(step, cache, force, dry_run):
+    """Run one step if it is out of date; return (status, seconds)"""
+    files = input_files(step)
+    if files is None:
+        return "no inputs", 0.0
+    if not force and cache.get(step.name) == fingerprint(step, files):
+        return "up to date", 0.0
+    if dry_run:
+        return "would run", 0.0
+
+    start = time.perf_counter()
+    result = subprocess.run(step.command, cwd=SITE_ROOT / step.cwd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode == EXIT_SKIPPED:
+        # Nothing was produced; leave the step out of date so it runs once the tool is there
+        cache.pop(step.name, None)
+        print(f"{step.name}: {result.stdout.strip()}", file=sys.stderr)
+        return "skipped", elapsed
+    if result.returncode != 0:
+        print(f"✗ {step.name} failed:\n{result.stdout}{result.stderr}", file=sys.stderr)
+        return "failed", elapsed
+
+    # Fingerprint after the run so steps that rewrite their own inputs
+    # (add_category, add_teaser) are not considered stale next time
+    cache[step.name] = fingerprint(step, input_files(step))
+    return "ran", elapsed
+
+
+def build(steps, jobs=4, force=(), dry_run=False):
+    """Run the DAG and return {step name: (status, seconds)}"""
+    cache = load_json(CACHE_FILE)
+    deps = dependencies(steps)
+    by_name = {step.name: step for step in steps}
+    results = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while len(results) < len(steps):
+            for name, step in by_name.items():
+                if name in results or name in running.values():
+                    continue
+                dep_status = {results[dep][0] for dep in deps[name] if dep in results}
+                if dep_status & {"failed", "blocked"}:
+                    results[name] = ("blocked", 0.0)
+                elif dry_run and "would run" in dep_status and input_files(step) is not None:
+                    results[name] = ("would run", 0.0)
+                elif all(dep in results for dep in deps[name]):
+                    future = pool.submit(run_step, step, cache, name in force, dry_run)
+                    running[future] = name
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    if not dry_run:
+        save_json(CACHE_FILE, cache)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the site generators that are out of date")
+    parser.add_argument("steps", nargs="*", help="Only consider these steps (default: all but publications)")
+    parser.add_argument("--jobs", "-j", type=int, default=4, help="Steps to run in parallel")
+    parser.add_argument("--force", action="store_true", help="Run the selected steps even if up to date")
+    parser.add_argument("--dry-run", "-n", action="store_true", help="Only report what would run")
+
+    args = parser.parse_args()
+
+    unknown = set(args.steps) - {step.name for step in STEPS}
+    if unknown:
+        print(f"Error: unknown step(s): {', '.join(sorted(unknown))}")
+        sys.exit(1)
+    steps = build_order([step for step in STEPS if step.name in args.steps or (not args.steps and step.default)])
+    force = {step.name for step in steps} if args.force else set()
+
+    start = time.perf_counter()
+    results = build(steps, args.jobs, force, args.dry_run)
+
+    for step in steps:
+        status, elapsed = results[step.name]
+        timing = f"{elapsed:6.2f}s" if status in ("ran", "failed", "skipped") else " " * 7
+        print(f"{timing}  {step.name:<24} {status}")
+    print(f"\nTotal {time.perf_counter() - start:.2f}s")
+
+    sys.exit(1 if any(status == "failed" for status, _ in results.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Shared helpers for the site build scripts.
+
+Every script in the repository root runs from the site root (like
+add_category.py), so paths here are relative to the directory this file
+lives in rather than to the current working directory. Post-build scripts
+work on the generated site in SITE_DIR after ``jekyll build``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+
+SITE_ROOT = Path(__file__).resolve().parent
+CACHE_DIR = SITE_ROOT / ".build-cache"
+SITE_DIR = SITE_ROOT / "_site"  # Jekyll's output, read by the post-build scripts
+
+# Exit status of a build step that did nothing because an optional tool is
+# missing (EX_TEMPFAIL); build.py reports it as skipped and retries next time
+EXIT_SKIPPED = 75
+
+
+def content_hash(data):
+    """Return a short, stable hex digest of bytes or text"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def file_hash(path):
+    """Return the content hash of a file on disk"""
+    with open(path, "rb") as f:
+        return content_hash(f.read())
+
+
+def is_future(day):
+    """Whether a YYYY-MM-DD date (or a longer timestamp) lies after today
+
+    Future-dated posts stay out of the archives, the sitemap and the feeds
+    until their date.
+    """
+    return str(day or "")[:10] > date.today().isoformat()
+
+
+def load_json(path, default=None):
+    """Load a JSON cache file, falling back to ``default`` if it is missing or corrupt"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {} if default is None else default
+
+
+def save_json(path, data):
+    """Write JSON atomically so an interrupted run never leaves a truncated cache"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1, sort_keys=True, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Link checker for publication buttons and talk URLs
+
+Collects the `buttons` URLs of every publication and the `talk_url` (or
+"More information here" link) of every talk, then checks them concurrently
+with a pooled aiohttp session. Connections are capped per host so a site
+with many links on one domain (arxiv.org, github.com, ...) is not hammered.
+
+Results are cached in .build-cache/links.json together with the ETag and
+Last-Modified headers of each response. A link checked recently is not
+requested again at all; an older one is re-checked with a conditional
+request, which the server can answer with a cheap 304.
+
+Usage:
+    python3 check_links.py
+    python3 check_links.py --max-age 0 --per-host 2 _publications/2025-09-28-care.md
+"""
+
+import argparse
+import asyncio
+import re
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import frontmatter
+
+from build_utils import CACHE_DIR, SITE_ROOT, load_json, save_json
+
+try:
+    import aiohttp
+except ImportError:
+    print("Error: aiohttp library not found. Install with: pip install aiohttp")
+    sys.exit(1)
+
+CACHE_FILE = CACHE_DIR / "links.json"
+COLLECTIONS = ["_publications", "_talks"]
+USER_AGENT = "academicpages-link-checker/1.0"
+MARKDOWN_LINK = re.compile(r"\[[^\]]*\]\((https?://[^)\s]+)\)")
+
+# Some servers refuse HEAD outright; retry those with a GET
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+
+def extract_links(filepath):
+    """Return the external URLs referenced by one publication or talk file"""
+    post = frontmatter.load(filepath)
+    urls = []
+
+    for button in post.get("buttons") or []:
+        if isinstance(button, dict) and button.get("url"):
+            urls.append(str(button["url"]))
+
+    if post.get("talk_url"):
+        urls.append(str(post["talk_url"]))
+    if post.get("collection") == "talks":
+        # talks.py writes the talk URL into the body instead of the front matter
+        urls.extend(MARKDOWN_LINK.findall(post.content))
+
+    return [url for url in dict.fromkeys(urls) if url.startswith(("http://", "https://"))]
+
+
+def collect_links(paths):
+    """Map each file to its links, expanding collection directories"""
+    links_by_file = {}
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.glob("*.md")) if path.is_dir() else [path]
+        for filepath in files:
+            links = extract_links(filepath)
+            if links:
+                links_by_file[str(filepath)] = links
+    return links_by_file
+
+
+def is_fresh(entry, max_age):
+    """A cached result is reused without a request if it is recent and was OK"""
+    return entry.get("ok") and time.time() - entry.get("checked", 0) < max_age
+
+
+async def fetch_status(session, method, url, headers):
+    async with session.request(method, url, headers=headers, allow_redirects=True) as resp:
+        return resp.status, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+
+async def check_url(session, url, cached):
+    """Check one URL, sending a conditional request if validators are cached"""
+    headers = {}
+    if cached.get("ok"):
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        status, etag, last_modified = await fetch_status(session, "HEAD", url, headers)
+        if status in HEAD_UNSUPPORTED:
+            status, etag, last_modified = await fetch_status(session, "GET", url, headers)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        return {"ok": False, "status": None, "error": str(e) or type(e).__name__, "checked": time.time()}
+
+    if status == 304:
+        return dict(cached, checked=time.time())
+
+    return {
+        "ok": status < 400,
+        "status": status,
+        "etag": etag,
+        "last_modified": last_modified,
+        "checked": time.time(),
+    }
+
+
+async def check_urls(urls, cache, per_host=4, total=32, timeout=15, max_age=86400):
+    """Check every URL that the cache cannot answer, updating ``cache`` in place.
+
+    Returns the number of requests that were actually sent.
+    """
+    pending = [url for url in urls if not is_fresh(cache.get(url, {}), max_age)]
+    if not pending:
+        return 0
+
+    connector = aiohttp.TCPConnector(limit=total, limit_per_host=per_host)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(
+        connector=connector, timeout=client_timeout, headers={"User-Agent": USER_AGENT}
+    ) as session:
+        results = await asyncio.gather(
+            *(check_url(session, url, cache.get(url, {})) for url in pending)
+        )
+
+    for url, result in zip(pending, results):
+        cache[url] = result
+    return len(pending)
+
+
+def report(links_by_file, cache):
+    """Print broken links grouped by file and return how many were found"""
+    broken = defaultdict(list)
+    for filepath, links in links_by_file.items():
+        for url in links:
+            result = cache.get(url, {})
+            if not result.get("ok"):
+                broken[filepath].append((url, result.get("status") or result.get("error")))
+
+    for filepath, failures in sorted(broken.items()):
+        print(f"✗ {filepath}")
+        for url, reason in failures:
+            print(f"    {reason}: {url}")
+
+    return sum(len(failures) for failures in broken.values())
+
+
+def main():
+    """Main function to handle command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Check publication buttons and talk URLs for dead links"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[str(SITE_ROOT / c) for c in COLLECTIONS],
+        help="Files or collection directories to check (default: _publications and _talks)",
+    )
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent connections per host")
+    parser.add_argument("--total", type=int, default=32, help="Concurrent connections overall")
+    parser.add_argument("--timeout", type=float, default=15, help="Per-request timeout in seconds")
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=86400,
+        help="Seconds a passing result is trusted without any request (default: 1 day)",
+    )
+    parser.add_argument("--cache", default=str(CACHE_FILE), help="Result cache file")
+
+    args = parser.parse_args()
+
+    links_by_file = collect_links(args.paths)
+    urls = list(dict.fromkeys(url for links in links_by_file.values() for url in links))
+
+    cache = load_json(args.cache)
+    sent = asyncio.run(
+        check_urls(urls, cache, args.per_host, args.total, args.timeout, args.max_age)
+    )
+    save_json(args.cache, cache)
+
+    broken = report(links_by_file, cache)
+    print(
+        f"\nChecked {len(urls)} links in {len(links_by_file)} files "
+        f"({sent} requests, {len(urls) - sent} from cache), {broken} broken"
+    )
+    sys.exit(1 if broken else 0)
+
+
+if __name__ == "__main__":
+    main()
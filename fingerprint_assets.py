@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Fingerprint static assets in the generated site
+
+Run after ``jekyll build`` and minify_site.py. Every asset under _site/assets, _site/images and
+_site/files gets a copy named after its content hash (main.min.js becomes
+main.min.3f2a9c01d4.js), and every reference to it in the generated HTML and
+CSS is rewritten to the copy. Since a fingerprinted name never changes its
+content, those files can be served with a far-future
+``Cache-Control: public, max-age=31536000, immutable`` and repeat visits do
+not revalidate them. The original files stay in place for links from
+outside the site.
+
+_site/assets/manifest.json maps each asset to its fingerprinted name.
+
+Each HTML page is rewritten in a single pass over its attributes
+(src, href, srcset, ...) and inline url(...) values. Fonts and images
+referenced from stylesheets are fingerprinted first, so a stylesheet's hash
+covers the names it points to. Asset hashes are cached by size and mtime,
+and pages already rewritten against the current manifest are skipped, so a
+second run over an unchanged _site does nothing.
+
+Usage:
+    python3 fingerprint_assets.py
+    python3 fingerprint_assets.py --site path/to/_site
+"""
+
+import argparse
+import json
+import posixpath
+import re
+import shutil
+import sys
+from pathlib import Path
+
+import yaml
+
+from build_utils import CACHE_DIR, SITE_DIR, SITE_ROOT, content_hash, load_json, save_json
+
+ASSET_DIRS = ["assets", "images", "files"]
+ASSET_EXTENSIONS = {
+    ".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+    ".pdf", ".woff", ".woff2", ".ttf", ".eot", ".otf",
+}
+MANIFEST = "assets/manifest.json"
+CACHE_FILE = CACHE_DIR / "fingerprints.json"
+HASH_LENGTH = 10
+
+FINGERPRINT = re.compile(r"\.([0-9a-f]{%d})(\.[^./]+)$" % HASH_LENGTH)
+ATTRIBUTE_REF = re.compile(r"""(\b(?:src|href|poster|content|data-src)\s*=\s*)(["'])(.*?)\2""", re.I | re.S)
+SRCSET_REF = re.compile(r"""(\bsrcset\s*=\s*)(["'])(.*?)\2""", re.I | re.S)
+CSS_URL = re.compile(r"""(url\(\s*)(["']?)([^"')]+)\2(\s*\))""")
+URL_PARTS = re.compile(r"([^?#]*)(.*)$", re.S)  # path, then query and fragment
+
+
+def fingerprinted_name(relpath, digest):
+    stem, ext = posixpath.splitext(relpath)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def original_name(relpath):
+    """Strip a fingerprint so rewritten pages can be rewritten again"""
+    return FINGERPRINT.sub(r"\2", relpath)
+
+
+class Rewriter:
+    """Map URLs as written in a page to their fingerprinted form"""
+
+    def __init__(self, manifest, site_url, baseurl):
+        self.manifest = manifest
+        self.prefixes = [p for p in (site_url + baseurl, baseurl) if p]
+
+    def resolve(self, path, base_dir):
+        """Site-relative path of a URL path, or None if it points elsewhere"""
+        for prefix in self.prefixes:
+            if path.startswith(prefix + "/"):
+                return path[len(prefix) + 1:]
+        if path.startswith("/"):
+            return path[1:] if not path.startswith("//") else None
+        if re.match(r"^[a-z][a-z0-9+.-]*:", path, re.I):
+            return None
+        return posixpath.normpath(posixpath.join(base_dir, path))
+
+    def url(self, url, base_dir):
+        path, rest = URL_PARTS.match(url).groups()
+        if not path:
+            return url
+        relpath = self.resolve(path, base_dir)
+        if relpath is None:
+            return url
+        target = self.manifest.get(original_name(relpath))
+        if target is None:
+            return url
+        # The copy sits next to the original, so only the file name changes
+        head = path.rsplit("/", 1)[0] + "/" if "/" in path else ""
+        return head + posixpath.basename(target) + rest
+
+    def srcset(self, value, base_dir):
+        candidates = []
+        for candidate in value.split(","):
+            parts = candidate.strip().split(None, 1)
+            if parts:
+                parts[0] = self.url(parts[0], base_dir)
+            candidates.append(" ".join(parts))
+        return ", ".join(candidates)
+
+    def css(self, text, base_dir):
+        return CSS_URL.sub(lambda m: m.group(1) + m.group(2) + self.url(m.group(3), base_dir) + m.group(2) + m.group(4), text)
+
+    def html(self, text, base_dir):
+        text = SRCSET_REF.sub(lambda m: m.group(1) + m.group(2) + self.srcset(m.group(3), base_dir) + m.group(2), text)
+        text = ATTRIBUTE_REF.sub(lambda m: m.group(1) + m.group(2) + self.url(m.group(3), base_dir) + m.group(2), text)
+        return self.css(text, base_dir)  # inline style="background: url(...)"
+
+
+def asset_files(site_dir):
+    for name in ASSET_DIRS:
+        for path in sorted((site_dir / name).rglob("*")):
+            relpath = path.relative_to(site_dir).as_posix()
+            if (path.is_file() and path.suffix.lower() in ASSET_EXTENSIONS
+                    and not FINGERPRINT.search(relpath) and relpath != MANIFEST):
+                yield relpath, path
+
+
+def cached_digest(path, relpath, cache):
+    """Content hash of an asset, reusing the cached one while size and mtime match"""
+    stat = path.stat()
+    entry = cache.get(relpath)
+    if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime_ns:
+        return entry["digest"]
+    with open(path, "rb") as f:
+        digest = content_hash(f.read())
+    cache[relpath] = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "digest": digest}
+    return digest
+
+
+def place_copy(source, target):
+    """Create the fingerprinted file; its name guarantees an existing one is identical"""
+    if target.exists():
+        return False
+    # A real copy, not a hard link: Jekyll may rewrite the original in place
+    shutil.copy2(source, target)
+    return True
+
+
+def write_if_changed(path, text):
+    data = text.encode("utf-8")
+    if path.is_file() and path.read_bytes() == data:
+        return False
+    path.write_bytes(data)
+    return True
+
+
+def fingerprint(site_dir, site_url="", baseurl=""):
+    """Fingerprint every asset and rewrite references; return (assets, pages rewritten)"""
+    cache = load_json(CACHE_FILE, default={"assets": {}, "pages": {}})
+    assets_cache, pages_cache = cache.setdefault("assets", {}), cache.setdefault("pages", {})
+    previous = load_json(site_dir / MANIFEST)
+    manifest = {}
+    rewriter = Rewriter(manifest, site_url, baseurl)
+    stylesheets = []
+
+    for relpath, path in asset_files(site_dir):
+        if path.suffix.lower() == ".css":
+            stylesheets.append((relpath, path))
+            continue
+        manifest[relpath] = fingerprinted_name(relpath, cached_digest(path, relpath, assets_cache))
+        place_copy(path, site_dir / manifest[relpath])
+
+    # Stylesheets point at fonts and images, so they are hashed after rewriting
+    for relpath, path in stylesheets:
+        text = rewriter.css(path.read_text(encoding="utf-8"), posixpath.dirname(relpath))
+        manifest[relpath] = fingerprinted_name(relpath, content_hash(text))
+        target = site_dir / manifest[relpath]
+        if not target.exists():
+            target.write_text(text, encoding="utf-8")
+
+    # Copies the previous run made that nothing refers to any more. Only names
+    # from its manifest: a file that merely looks fingerprinted may be a source
+    current = set(manifest.values())
+    for relpath in set(previous.values()) - current:
+        path = site_dir / relpath
+        if FINGERPRINT.search(relpath) and path.is_file():
+            path.unlink()
+
+    manifest_text = json.dumps(manifest, indent=1, sort_keys=True) + "\n"
+    manifest_path = site_dir / MANIFEST
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(manifest_path, manifest_text)
+    manifest_digest = content_hash(manifest_text)
+
+    rewritten = 0
+    for path in sorted(site_dir.rglob("*.html")):
+        relpath = path.relative_to(site_dir).as_posix()
+        text = path.read_text(encoding="utf-8", errors="surrogateescape")
+        digest = content_hash(text.encode("utf-8", "surrogateescape"))
+        if pages_cache.get(relpath) == [digest, manifest_digest]:
+            continue
+        text = rewriter.html(text, posixpath.dirname(relpath))
+        data = text.encode("utf-8", "surrogateescape")
+        if content_hash(data) != digest:
+            path.write_bytes(data)
+            rewritten += 1
+        pages_cache[relpath] = [content_hash(data), manifest_digest]
+
+    for relpath in list(assets_cache):
+        if relpath not in manifest:
+            del assets_cache[relpath]
+    for relpath in list(pages_cache):
+        if not (site_dir / relpath).is_file():
+            del pages_cache[relpath]
+    save_json(CACHE_FILE, cache)
+    return len(manifest), rewritten
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint static assets in the generated site")
+    parser.add_argument("--site", type=Path, default=SITE_DIR, help="Generated site directory (default: _site)")
+    args = parser.parse_args()
+
+    if not args.site.is_dir():
+        print(f"✗ {args.site} not found; run jekyll build first")
+        sys.exit(1)
+
+    with open(SITE_ROOT / "_config.yml", "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    site_url = str(config.get("url") or "").rstrip("/")
+    baseurl = str(config.get("baseurl") or "").rstrip("/")
+
+    assets, rewritten = fingerprint(args.site, site_url, baseurl)
+    print(f"✓ {assets} assets fingerprinted, {rewritten} pages rewritten")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Generate sitemap.xml and the Atom feeds from front matter
+
+jekyll-sitemap and jekyll-feed rebuild every URL on every build and have no
+reliable per-page lastmod, so crawlers refetch the whole site. This script
+writes the same files as static sources instead; both plugins leave a file
+alone when it already exists in the source tree.
+
+    sitemap.xml               sitemap index, one <sitemap> per shard
+    sitemaps/<section>-N.xml  up to SHARD_SIZE URLs of one section
+                              (pages, posts, or an output collection)
+    feed.xml                  Atom feed of the latest posts
+    feed/<collection>.xml     Atom feed of every other output collection
+
+A page's lastmod is the time its source last changed: the cached value while
+its content hash stays the same, otherwise its last commit date if the file
+is committed as is, and its modification time if it has local changes. Only
+changed sources are re-parsed, and only shards whose URLs or lastmods changed
+are rewritten, so an unchanged shard keeps its mtime and its lastmod in the
+index.
+
+Usage:
+    python3 generate_sitemap.py
+"""
+
+import subprocess
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+import frontmatter
+import yaml
+
+from build_utils import CACHE_DIR, SITE_ROOT, file_hash, is_future, load_json, save_json
+from precompute_archives import POST_FILENAME, first_paragraph, post_url
+
+CONFIG_FILE = SITE_ROOT / "_config.yml"
+SITEMAP_FILE = SITE_ROOT / "sitemap.xml"
+SHARD_DIR = SITE_ROOT / "sitemaps"
+CACHE_FILE = CACHE_DIR / "sitemap.json"
+SHARD_SIZE = 1000  # well below the 50,000 URLs allowed per sitemap file
+FEED_LIMIT = 10  # same default as jekyll-feed
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def load_config():
+    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def sources(config):
+    """Yield (section, path) for every file that becomes a page of the site"""
+    for path in sorted((SITE_ROOT / "_pages").glob("*")):
+        yield "pages", path
+    for path in sorted((SITE_ROOT / "_posts").glob("*")):
+        yield "posts", path
+    for label, settings in (config.get("collections") or {}).items():
+        if settings and settings.get("output"):
+            for path in sorted((SITE_ROOT / f"_{label}").glob("*")):
+                yield label, path
+
+
+def page_url(section, path, metadata, config):
+    """Resolve the URL Jekyll gives a page, post or collection document"""
+    if section == "posts":
+        match = POST_FILENAME.match(path.name)
+        return post_url(metadata, match.group(4)) if match else None
+    if metadata.get("permalink"):
+        return str(metadata["permalink"])
+    if section == "pages":
+        return f"/{path.stem}/"
+    pattern = config["collections"][section].get("permalink") or "/:collection/:path"
+    return pattern.replace(":collection", section).replace(":path", path.stem).replace(":name", path.stem)
+
+
+def load_record(section, path, config):
+    """Parse one source into the fields the sitemap and feeds need"""
+    post = frontmatter.load(path)
+    metadata = post.metadata
+    url = page_url(section, path, metadata, config)
+    excluded = (
+        url is None
+        or metadata.get("published") is False
+        or metadata.get("sitemap") is False
+        or url.rstrip("/").endswith("404.html")
+    )
+    published = metadata.get("date")
+    if section == "posts" and not published:
+        match = POST_FILENAME.match(path.name)
+        published = "-".join(match.group(1, 2, 3)) if match else None
+    return {
+        "section": section,
+        "url": url,
+        "excluded": excluded,
+        "title": str(metadata.get("title") or path.stem),
+        "published": str(published)[:10] if published else None,
+        "summary": str(metadata.get("excerpt") or first_paragraph(post.content)),
+        "updated": str(metadata["last_modified_at"]) if metadata.get("last_modified_at") else None,
+    }
+
+
+def git_dates(paths):
+    """Return ({relpath: last commit date}, {relpaths with local changes}); empty outside git"""
+    relpaths = [str(p.relative_to(SITE_ROOT)) for p in paths]
+    try:
+        log = subprocess.run(
+            ["git", "log", "--format=%x00%cI", "--name-only", "--no-renames", "--"] + relpaths,
+            cwd=SITE_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=all", "--"] + relpaths,
+            cwd=SITE_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return {}, set()
+
+    dates, current = {}, None
+    for line in log.splitlines():
+        if line.startswith("\0"):
+            current = line[1:]
+        elif line and current:
+            dates.setdefault(line, current)  # newest commit comes first
+    dirty = {line[3:] for line in status.splitlines() if len(line) > 3}
+    return dates, dirty
+
+
+def mtime(path):
+    return datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat(timespec="seconds")
+
+
+def collect(config, cache):
+    """Return the records of every page, re-parsing only changed sources"""
+    files = list(sources(config))
+    stale = []
+    records = {}
+    for section, path in files:
+        if not path.is_file():
+            continue
+        relpath = str(path.relative_to(SITE_ROOT))
+        source = file_hash(path)
+        cached = cache.get(relpath)
+        if cached and cached["source"] == source:
+            records[relpath] = cached["record"]
+        else:
+            records[relpath] = load_record(section, path, config)
+            stale.append((relpath, path, source))
+
+    if stale:
+        dates, dirty = git_dates([path for _, path, _ in stale])
+        for relpath, path, source in stale:
+            if relpath in dates and relpath not in dirty:
+                lastmod = dates[relpath]
+            else:
+                lastmod = mtime(path)
+            records[relpath]["lastmod"] = records[relpath]["updated"] or lastmod
+            cache[relpath] = {"source": source, "record": records[relpath]}
+
+    for relpath in list(cache):
+        if relpath not in records:
+            del cache[relpath]
+    return records
+
+
+def absolute(config, url):
+    return str(config.get("url") or "").rstrip("/") + str(config.get("baseurl") or "") + url
+
+
+def is_future_post(record):
+    return record["section"] == "posts" and is_future(record["published"])
+
+
+def sitemap_shards(records, config):
+    """Return {shard name: [(loc, lastmod), ...]}, URLs sorted within each section"""
+    sections = {}
+    for record in records.values():
+        if record["excluded"] or is_future_post(record):
+            continue
+        sections.setdefault(record["section"], []).append((absolute(config, record["url"]), record["lastmod"]))
+
+    shards = {}
+    for section, urls in sorted(sections.items()):
+        urls.sort()
+        for i in range(0, len(urls), SHARD_SIZE):
+            shards[f"{section}-{i // SHARD_SIZE + 1}"] = urls[i:i + SHARD_SIZE]
+    return shards
+
+
+def render_urlset(urls):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}">']
+    for loc, lastmod in urls:
+        lines.append(f"<url><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></url>")
+    lines.append("</urlset>")
+    return "\n".join(lines) + "\n"
+
+
+def render_index(shards, config):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NS}">']
+    for name, urls in shards.items():
+        loc = absolute(config, f"/sitemaps/{name}.xml")
+        lastmod = max(lastmod for _, lastmod in urls)
+        lines.append(f"<sitemap><loc>{escape(loc)}</loc><lastmod>{lastmod}</lastmod></sitemap>")
+    lines.append("</sitemapindex>")
+    return "\n".join(lines) + "\n"
+
+
+def render_feed(section, records, config, path):
+    """Atom feed of the newest FEED_LIMIT entries, laid out like jekyll-feed's"""
+    entries = [r for r in records.values() if r["section"] == section and not r["excluded"] and not is_future_post(r)]
+    entries.sort(key=lambda r: (r["published"] or "", r["url"]), reverse=True)
+    entries = entries[:FEED_LIMIT]
+    site_url = absolute(config, "/")
+    feed_url = absolute(config, path)
+    title = str(config.get("title") or "")
+    if section != "posts":
+        title = f"{title} | {section.title()}"
+
+    lines = [
+        '<?xml version="1.0" encoding="utf-8"?>',
+        '<feed xmlns="http://www.w3.org/2005/Atom">',
+        f'<link href={quoteattr(feed_url)} rel="self" type="application/atom+xml" />',
+        f'<link href={quoteattr(site_url)} rel="alternate" type="text/html" />',
+        # The newest change among the entries, so an unchanged feed stays byte-identical
+        f"<updated>{max((e['lastmod'] for e in entries), default='1970-01-01T00:00:00+00:00')}</updated>",
+        f"<id>{escape(feed_url)}</id>",
+        f"<title type=\"html\">{escape(title)}</title>",
+    ]
+    if config.get("description"):
+        lines.append(f"<subtitle>{escape(str(config['description']))}</subtitle>")
+    if config.get("name"):
+        lines.append(f"<author><name>{escape(str(config['name']))}</name></author>")
+    for e in entries:
+        url = absolute(config, e["url"])
+        lines += [
+            "<entry>",
+            f"<title type=\"html\">{escape(e['title'])}</title>",
+            f'<link href={quoteattr(url)} rel="alternate" type="text/html" title={quoteattr(e["title"])} />',
+            f"<published>{e['published'] or e['lastmod'][:10]}</published>",
+            f"<updated>{e['lastmod']}</updated>",
+            f"<id>{escape(url)}</id>",
+            f"<summary type=\"html\">{escape(e['summary'])}</summary>",
+            "</entry>",
+        ]
+    lines.append("</feed>")
+    return "\n".join(lines) + "\n"
+
+
+def write_if_changed(path, text):
+    if path.is_file() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def generate():
+    """Refresh the sitemap and the feeds; return the paths that were rewritten"""
+    config = load_config()
+    cache = load_json(CACHE_FILE)
+    records = collect(config, cache)
+
+    outputs = {}
+    shards = sitemap_shards(records, config)
+    for name, urls in shards.items():
+        outputs[SHARD_DIR / f"{name}.xml"] = render_urlset(urls)
+    outputs[SITEMAP_FILE] = render_index(shards, config)
+
+    sections = {r["section"] for r in records.values()}
+    for section in sorted(sections - {"pages"}):
+        path = "/feed.xml" if section == "posts" else f"/feed/{section}.xml"
+        outputs[SITE_ROOT / path.lstrip("/")] = render_feed(section, records, config, path)
+
+    changed = [path for path, text in outputs.items() if write_if_changed(path, text)]
+    if SHARD_DIR.is_dir():
+        for path in SHARD_DIR.glob("*.xml"):
+            if path not in outputs:
+                path.unlink()
+                changed.append(path)
+
+    save_json(CACHE_FILE, cache)
+    return changed
+
+
+def main():
+    changed = generate()
+    if changed:
+        for path in changed:
+            print(f"✓ Updated: {path.relative_to(SITE_ROOT)}")
+    else:
+        print("➖ Sitemap and feeds already up to date")
+
+
+if __name__ == "__main__":
+    main()
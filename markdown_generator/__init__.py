@@ -0,0 +1,63 @@
+"""
+Markdown generators for the _publications and _talks collections
+
+Every generator can still be run as a script from this directory. Imported as
+a package, the same code renders in memory: the render_* functions take a
+path or a file-like object and return a list of (filename, markdown) pairs,
+without touching the filesystem, so other tools can generate collections for
+any site root. write_outputs() stages such a list through an OutputSink.
+
+    import io
+    from markdown_generator import render_bibtex, write_outputs
+
+    outputs = render_bibtex(io.StringIO(bib_text))
+    print(write_outputs(outputs, "_publications").summary())
+
+read_publications() and render_publications() are those of
+custom_publication_generator.py, which reads this site's publications.tsv
+(pub_date, title, authors, venue, url_slug, links, category). The original
+academicpages generator for TSVs with a citation column stays available as
+markdown_generator.publications.
+
+Only the modules that need nothing beyond the standard library are imported
+here; pandas and python-frontmatter are imported when a TSV is actually read
+or rendered. The pybtex based generators are available as submodules:
+
+    from markdown_generator.bibtex_to_publications import render_bibtex
+    from markdown_generator.pubsFromBib import render_bibliography
+"""
+
+from .latex import decode_latex
+from .output_sink import CollisionError, OutputSink
+from .custom_publication_generator import publication_to_markdown, read_publications, render_publications
+from .simple_bibtex_converter import entry_to_markdown, parse_bibtex_string, render_bibtex
+from .talks import read_talks, render_talks
+from .talks_from_ics import render_ics
+from .venues import categorize, normalize_venue
+
+
+def write_outputs(outputs, output_dir):
+    """Write (filename, markdown) pairs to ``output_dir``; return the committed sink"""
+    with OutputSink(output_dir) as sink:
+        for filename, markdown in outputs:
+            sink.write(filename, markdown)
+    return sink
+
+
+__all__ = [
+    "CollisionError",
+    "OutputSink",
+    "categorize",
+    "decode_latex",
+    "entry_to_markdown",
+    "normalize_venue",
+    "parse_bibtex_string",
+    "publication_to_markdown",
+    "read_publications",
+    "read_talks",
+    "render_bibtex",
+    "render_ics",
+    "render_publications",
+    "render_talks",
+    "write_outputs",
+]
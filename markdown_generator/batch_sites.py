@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Multi-site batch generation from one shared bibliography
+
+Lab members each run their own copy of this site from the same group
+bibliography. Instead of every site re-parsing the whole .bib file, this
+script parses the shared sources once, builds an author -> entries index and
+renders the _publications tree of every site from it. Sites are rendered in
+parallel worker processes, each receiving only the entries of its authors.
+
+Sites are described in a YAML file:
+
+    sources:
+      - group.bib
+      - workshops.bib
+    sites:
+      - name: alice
+        output: ../../alice.github.io/_publications
+        authors: ["Alice Kim", "Kim, A."]  # every spelling of the site owner
+        highlight: "<strong>{}</strong>"   # optional, this is the default
+        categories:                        # optional category renames
+          manuscripts: preprints
+        include: [conferences, journals]   # optional, after renaming
+      - name: bob
+        output: ../../bob.github.io/_publications
+        authors: ["Bob Lee"]
+
+Authors are matched on the whole name, ignoring case, accents, punctuation
+and "Last, First" order, so "Kim, Alice", "Alice Kim" and "{Kim}, Alice"
+are the same author. Names in other scripts keep their letters ("김준경"
+matches "김준경" only); a name with no letters at all matches nothing. Initials are not expanded: "A. Kim" only matches a
+site that lists "Kim, A." (or "A. Kim") among its spellings, since another
+"A. Kim" may well be someone else.
+
+Relative paths are resolved against the directory of the YAML file.
+Entries are parsed with simple_bibtex_converter.py, so the output of each
+site is exactly what that converter would write for the same entries.
+
+Usage:
+    python3 batch_sites.py sites.yml
+    python3 batch_sites.py sites.yml --site alice --jobs 4
+"""
+
+import argparse
+import os
+import re
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from .latex import decode_latex, strip_accents
+    from .output_sink import CollisionError, OutputSink
+    from .simple_bibtex_converter import determine_category, entry_to_markdown, extract_venue, parse_bibtex_file
+except ImportError:  # run as a script from markdown_generator/
+    from latex import decode_latex, strip_accents
+    from output_sink import CollisionError, OutputSink
+    from simple_bibtex_converter import determine_category, entry_to_markdown, extract_venue, parse_bibtex_file
+
+DEFAULT_HIGHLIGHT = "<strong>{}</strong>"
+
+_NON_LETTER = re.compile(r"[\W\d_]+")
+
+
+def split_authors(author_field):
+    return [a.strip() for a in re.split(r"\s+and\s+", author_field or "") if a.strip()]
+
+
+def author_key(name):
+    """Match key for a name: the full name in "first last" order, e.g. "alice kim".
+
+    "Alice Kim", "Kim, Alice" and "{Kim}, Alice" map to the same key; "A. Kim"
+    maps to "a kim", which only matches sites listing that spelling.
+    """
+    # "M{\"u}ller", "Müller" and "Muller" all become "muller"; NFKC puts
+    # Hangul syllables back together after strip_accents() decomposed them
+    name = unicodedata.normalize("NFKC", strip_accents(decode_latex(name))).casefold()
+    parts = name.split(",")
+    if len(parts) == 2:  # "Last, First"
+        name = f"{parts[1]} {parts[0]}"
+    elif len(parts) >= 3:  # "Last, Jr, First"
+        name = f"{parts[2]} {parts[0]} {parts[1]}"
+    return " ".join(_NON_LETTER.sub(" ", name).split())
+
+
+def author_keys(names):
+    """Match keys of ``names``, leaving out the empty key of a name without letters"""
+    return {key for key in map(author_key, names) if key}
+
+
+def build_author_index(entries):
+    """Return {author key: [entry index, ...]} over all entries"""
+    index = {}
+    for i, entry in enumerate(entries):
+        for key in author_keys(split_authors(entry.get("author"))):
+            index.setdefault(key, []).append(i)
+    return index
+
+
+def load_sources(paths):
+    """Parse every source once; later sources win for duplicate citation keys"""
+    entries, seen = [], {}
+    for path in paths:
+        for entry in parse_bibtex_file(path):
+            key = entry.get("key")
+            if key in seen:
+                entries[seen[key]] = entry
+                continue
+            seen[key] = len(entries)
+            entries.append(entry)
+    return entries
+
+
+def highlight_authors(author_field, keys, template):
+    return " and ".join(
+        template.format(a) if author_key(a) in keys else a for a in split_authors(author_field)
+    )
+
+
+def render_site(site, entries):
+    """Write the _publications tree of one site; runs in a worker process"""
+    keys = author_keys(site["authors"])
+    renames = site.get("categories") or {}
+    include = site.get("include")
+    template = site.get("highlight") or DEFAULT_HIGHLIGHT
+
+    skipped = []
+    with OutputSink(site["output"]) as sink:
+        for entry in entries:
+            category = determine_category(entry.get("type", ""), extract_venue(entry))
+            category = renames.get(category, category)
+            if include and category not in include:
+                continue
+            entry = dict(entry, author=highlight_authors(entry.get("author"), keys, template))
+            rendered = entry_to_markdown(entry, category=category)
+            if rendered is None:
+                skipped.append(entry.get("key", "unknown"))
+                continue
+            filename, markdown, _ = rendered
+            try:
+                sink.write(filename, markdown, source=entry.get("key"))
+            except CollisionError as e:
+                skipped.append(str(e))
+    return site["name"], sink.summary(), skipped
+
+
+def entries_for_site(site, entries, index):
+    """Entries of any of the site's authors, in bibliography order"""
+    found = set()
+    for key in author_keys(site["authors"]):
+        found.update(index.get(key, []))
+    return [entries[i] for i in sorted(found)]
+
+
+def load_config(config_path):
+    try:
+        import yaml
+    except ImportError:
+        print("Error: PyYAML is required to read the site list. Install with: pip install pyyaml")
+        sys.exit(1)
+
+    base = Path(config_path).resolve().parent
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+
+    sources = [base / s for s in config.get("sources", [])]
+    sites = config.get("sites", [])
+    for site in sites:
+        if not site.get("name") or not site.get("output") or not site.get("authors"):
+            print(f"Error: every site needs name, output and authors ({site})")
+            sys.exit(1)
+        if isinstance(site["authors"], str):
+            site["authors"] = [site["authors"]]
+        site["output"] = str(base / site["output"])
+    return sources, sites
+
+
+def main():
+    """Main function to handle command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Generate the _publications trees of several sites from one shared bibliography"
+    )
+    parser.add_argument("config", help="YAML file listing the sources and the sites")
+    parser.add_argument("--site", action="append", default=[], help="Only generate this site (repeatable)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.config):
+        print(f"Error: config file '{args.config}' not found")
+        sys.exit(1)
+
+    sources, sites = load_config(args.config)
+    if args.site:
+        sites = [s for s in sites if s["name"] in args.site]
+    missing = [str(s) for s in sources if not s.exists()]
+    if missing:
+        print(f"Error: BibTeX file(s) not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    entries = load_sources(sources)
+    index = build_author_index(entries)
+    print(f"Parsed {len(entries)} entries by {len(index)} authors from {len(sources)} file(s)")
+
+    with ProcessPoolExecutor(max_workers=max(1, min(args.jobs, len(sites) or 1))) as pool:
+        futures = [pool.submit(render_site, site, entries_for_site(site, entries, index)) for site in sites]
+        for future in futures:
+            name, summary, skipped = future.result()
+            print(f"✓ {name}: {summary}")
+            for reason in skipped:
+                print(f"  Warning: skipped {reason}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,29 +16,38 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from .latex import decode_latex, strip_accents
+    from .output_sink import OutputSink
+    from .simple_bibtex_converter import yaml_quote
+    from .venues import categorize, normalize_venue
+except ImportError:  # run as a script from markdown_generator/
+    from latex import decode_latex, strip_accents
+    from output_sink import OutputSink
+    from simple_bibtex_converter import yaml_quote
+    from venues import categorize, normalize_venue
+
 try:
     from pybtex.database.input import bibtex
-    from pybtex.database import BibliographyData
 except ImportError:
-    print("Error: pybtex library not found. Install with: pip install pybtex")
-    sys.exit(1)
+    # Reported when a conversion is attempted, so the package stays importable
+    bibtex = None
+
+PYBTEX_MISSING = "pybtex library not found. Install with: pip install pybtex"
 
 
 def clean_string(text):
-    """Clean BibTeX strings by removing braces and escaping quotes"""
+    """Decode LaTeX in a BibTeX string; quote it with yaml_quote() for front matter"""
     if not text:
         return ""
-    # Remove braces and clean up formatting
-    cleaned = text.replace("{", "").replace("}", "").replace("\\", "")
-    # Escape quotes for YAML
-    cleaned = cleaned.replace('"', '\\"')
-    return cleaned.strip()
+    # LaTeX accents, symbols and markup to Unicode
+    return decode_latex(text).strip()
 
 
 def create_url_slug(title):
     """Create URL-friendly slug from title"""
-    # Remove special characters and convert to lowercase
-    slug = re.sub(r"[^\w\s-]", "", title.lower())
+    # Remove accents and special characters and convert to lowercase
+    slug = re.sub(r"[^\w\s-]", "", strip_accents(title).lower())
     # Replace spaces and multiple dashes with single dash
     slug = re.sub(r"[-\s]+", "-", slug)
     return slug.strip("-")
@@ -46,30 +55,7 @@ def create_url_slug(title):
 
 def determine_category(entry_type, venue):
     """Determine publication category based on entry type and venue"""
-    entry_type = entry_type.lower()
-    venue_lower = venue.lower() if venue else ""
-
-    # Check for preprint indicators
-    preprint_indicators = ["arxiv", "preprint", "submitted", "under review"]
-    if any(indicator in venue_lower for indicator in preprint_indicators):
-        return "manuscripts"
-
-    # Check entry type
-    if entry_type in ["inproceedings", "conference"]:
-        return "conferences"
-    elif entry_type in ["article", "journal"]:
-        return "journals"
-    else:
-        # Default based on venue keywords
-        conference_keywords = ["conference", "proceedings", "workshop", "symposium"]
-        journal_keywords = ["journal", "transactions", "letters"]
-
-        if any(keyword in venue_lower for keyword in conference_keywords):
-            return "conferences"
-        elif any(keyword in venue_lower for keyword in journal_keywords):
-            return "journals"
-        else:
-            return "manuscripts"  # Default to manuscripts
+    return categorize(entry_type, venue)
 
 
 def extract_date_info(entry):
@@ -119,7 +105,7 @@ def extract_authors(entry):
         first_names = " ".join(person.first_names)
         # Get last names
         last_names = " ".join(person.last_names)
-        authors.append(f"{first_names} {last_names}".strip())
+        authors.append(decode_latex(f"{first_names} {last_names}").strip())
 
     return ", ".join(authors)
 
@@ -143,7 +129,8 @@ def extract_venue(entry):
             or fields.get("publisher", "")
         )
 
-    return clean_string(venue)
+    # Known venues are rewritten to their canonical "Name (ABBR), year" form
+    return normalize_venue(clean_string(venue), fields.get("year"))
 
 
 def extract_urls(entry):
@@ -171,13 +158,93 @@ def extract_urls(entry):
     return buttons
 
 
+def parse_bibtex(source):
+    """Parse a BibTeX path or file-like object with pybtex"""
+    if bibtex is None:
+        raise ImportError(PYBTEX_MISSING)
+    # A fresh parser per call: pybtex parsers accumulate the entries they read
+    parser = bibtex.Parser()
+    if hasattr(source, "read"):
+        return parser.parse_stream(source)
+    return parser.parse_file(source)
+
+
+def entry_to_markdown(entry):
+    """Render one pybtex entry; return (filename, markdown, category), or None without a title"""
+    fields = entry.fields
+
+    # Extract basic information
+    title = clean_string(fields.get("title", ""))
+    if not title:
+        return None
+
+    authors = extract_authors(entry)
+    venue = extract_venue(entry)
+    date = extract_date_info(entry)
+    category = determine_category(entry.original_type, venue)
+
+    # Create URL slug and filename
+    url_slug = create_url_slug(title)
+    filename = f"{date}-{url_slug}.md"
+
+    # Extract URLs
+    buttons = extract_urls(entry)
+
+    # Build markdown content
+    md_content = []
+    md_content.append("---")
+    md_content.append(f"title: {yaml_quote(title)}")
+    md_content.append("collection: publications")
+    md_content.append(f"category: {category}")
+    md_content.append(f"date: {date}")
+    md_content.append(f"permalink: /publication/{url_slug}")
+
+    # Add authors if available
+    if authors:
+        md_content.append(f"authors: {yaml_quote(authors)}")
+
+    # Add venue if available
+    if venue:
+        md_content.append(f"venue: {yaml_quote(venue)}")
+
+    # Add buttons if available
+    if buttons:
+        md_content.append("buttons:")
+        for button in buttons:
+            md_content.append(f"  - type: {button['type']}")
+            md_content.append(f"    url: {button['url']}")
+
+    md_content.append("---")
+    md_content.append("")
+
+    # Add abstract or note if available
+    abstract = clean_string(fields.get("abstract", ""))
+    note = clean_string(fields.get("note", ""))
+
+    if abstract:
+        md_content.append(abstract)
+    elif note:
+        md_content.append(note)
+
+    return filename, "\n".join(md_content), category
+
+
+def render_bibtex(source):
+    """Render a BibTeX path or file-like object; return list of (filename, markdown)"""
+    outputs = []
+    for entry in parse_bibtex(source).entries.values():
+        rendered = entry_to_markdown(entry)
+        if rendered:
+            outputs.append(rendered[:2])
+    return outputs
+
+
 def convert_bibtex_to_markdown(bib_file_path, output_dir):
     """Convert BibTeX file to Jekyll markdown files"""
 
     # Parse BibTeX file
-    parser = bibtex.Parser()
     try:
-        bib_data = parser.parse_file(bib_file_path)
+        bib_data = parse_bibtex(bib_file_path)
     except Exception as e:
         print(f"Error parsing BibTeX file: {e}")
         return
@@ -187,79 +254,29 @@ def convert_bibtex_to_markdown(bib_file_path, output_dir):
     output_path.mkdir(parents=True, exist_ok=True)
 
     successful_conversions = 0
+    with OutputSink(output_path) as sink:
 
-    # Process each entry
-    for bib_id, entry in bib_data.entries.items():
-        try:
-            fields = entry.fields
+        # Process each entry
+        for bib_id, entry in bib_data.entries.items():
+            try:
+                rendered = entry_to_markdown(entry)
+                if rendered is None:
+                    print(f"Warning: No title found for entry {bib_id}, skipping...")
+                    continue
+                filename, markdown, category = rendered
 
-            # Extract basic information
-            title = clean_string(fields.get("title", ""))
-            if not title:
-                print(f"Warning: No title found for entry {bib_id}, skipping...")
-                continue
+                # Stage the file; nothing is written until every entry is processed
+                sink.write(filename, markdown, source=bib_id)
 
-            authors = extract_authors(entry)
-            venue = extract_venue(entry)
-            date = extract_date_info(entry)
-            category = determine_category(entry.original_type, venue)
-
-            # Create URL slug and filename
-            url_slug = create_url_slug(title)
-            filename = f"{date}-{url_slug}.md"
-
-            # Extract URLs
-            buttons = extract_urls(entry)
-
-            # Build markdown content
-            md_content = []
-            md_content.append("---")
-            md_content.append(f'title: "{title}"')
-            md_content.append("collection: publications")
-            md_content.append(f"category: {category}")
-            md_content.append(f"date: {date}")
-            md_content.append(f"permalink: /publication/{url_slug}")
-
-            # Add authors if available
-            if authors:
-                md_content.append(f"authors: {authors}")
-
-            # Add venue if available
-            if venue:
-                md_content.append(f"venue: {venue}")
-
-            # Add buttons if available
-            if buttons:
-                md_content.append("buttons:")
-                for button in buttons:
-                    md_content.append(f"  - type: {button['type']}")
-                    md_content.append(f"    url: {button['url']}")
-
-            md_content.append("---")
-            md_content.append("")
-
-            # Add abstract or note if available
-            abstract = clean_string(fields.get("abstract", ""))
-            note = clean_string(fields.get("note", ""))
-
-            if abstract:
-                md_content.append(abstract)
-            elif note:
-                md_content.append(note)
-
-            # Write to file
-            output_file = output_path / filename
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write("\n".join(md_content))
-
-            print(f"✓ Created: {filename} ({category})")
-            successful_conversions += 1
-
-        except Exception as e:
-            print(f"Error processing entry {bib_id}: {e}")
-            continue
+                print(f"✓ Created: {filename} ({category})")
+                successful_conversions += 1
+
+            except Exception as e:
+                print(f"Error processing entry {bib_id}: {e}")
+                continue
 
     print(f"\nSuccessfully converted {successful_conversions} publications!")
+    print(f"Files written: {sink.summary()}")
     print(f"Files saved to: {output_path}")
 
 
@@ -278,6 +295,10 @@ def main():
 
     args = parser.parse_args()
 
+    if bibtex is None:
+        print(f"Error: {PYBTEX_MISSING}")
+        sys.exit(1)
+
     # Check if BibTeX file exists
     if not os.path.exists(args.bibtex_file):
         print(f"Error: BibTeX file '{args.bibtex_file}' not found")
@@ -1,28 +1,38 @@
-import pandas as pd
 import os
-import frontmatter
+
+try:
+    from .output_sink import OutputSink
+except ImportError:  # markdown_generator/ 에서 스크립트로 실행할 때
+    from output_sink import OutputSink
 
 # 경로 설정
 TSV_FILE = "publications.tsv"
 OUTPUT_DIR = "../_publications"
 DEFAULT_THUMBNAIL = "/images/default-thumbnail.png"
 
+
 # 필요한 열: pub_date, title, authors, venue, url_slug, paper_url, video_url, code_url, image_path, category
-df = pd.read_csv(TSV_FILE, sep="\t")
+def read_publications(source=TSV_FILE):
+    """TSV 경로나 파일 객체를 행마다 dict 하나로 읽기 (빈 칸은 None)"""
+    import pandas as pd
+    df = pd.read_csv(source, sep="\t")
+    return df.astype(object).where(df.notna(), None).to_dict("records")
 
 
 def to_button_list(row):
     buttons = []
-    if pd.notna(row.get("paper_url")):
+    if row.get("paper_url"):
         buttons.append({"type": "paper", "url": row["paper_url"]})
-    if pd.notna(row.get("video_url")):
+    if row.get("video_url"):
         buttons.append({"type": "video", "url": row["video_url"]})
-    if pd.notna(row.get("code_url")):
+    if row.get("code_url"):
         buttons.append({"type": "code", "url": row["code_url"]})
     return buttons
 
 
-for idx, row in df.iterrows():
+def publication_to_markdown(row):
+    """레코드 하나를 (filename, markdown) 으로 변환"""
+    import frontmatter
     md = frontmatter.Post("")
     slug = row["url_slug"]
     date = row["pub_date"]
@@ -30,18 +40,35 @@ for idx, row in df.iterrows():
 
     md["title"] = row["title"]
     md["collection"] = "publications"
-    md["category"] = row.get("category", "conferences")
+    md["category"] = row.get("category") or "conferences"
     md["date"] = date
     md["permalink"] = f"/publication/{slug}"
     md["authors"] = row["authors"]
     md["venue"] = row["venue"]
 
-    md["header"] = {"teaser": row.get("image_path", DEFAULT_THUMBNAIL)}
+    md["header"] = {"teaser": row.get("image_path") or DEFAULT_THUMBNAIL}
 
     buttons = to_button_list(row)
     if buttons:
         md["buttons"] = buttons
 
-    with open(os.path.join(OUTPUT_DIR, filename), "w", encoding="utf-8") as f:
-        f.write(frontmatter.dumps(md))
-        print(f"✅ 생성됨: {filename}")
+    return filename, frontmatter.dumps(md)
+
+
+def render_publications(records):
+    """레코드 목록을 [(filename, markdown), ...] 으로 변환"""
+    return [publication_to_markdown(row) for row in records]
+
+
+def main(source=TSV_FILE, output_dir=OUTPUT_DIR):
+    # 모든 파일을 모아 두었다가 마지막에 한 번에 기록 (변경 없는 파일은 건너뜀)
+    with OutputSink(output_dir) as sink:
+        for row in read_publications(source):
+            filename, markdown = publication_to_markdown(row)
+            sink.write(filename, markdown, source=row["url_slug"])
+            print(f"✅ 생성됨: {filename}")
+    print(f"📁 {sink.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+LaTeX to Unicode decoding for BibTeX field values
+
+BibTeX fields carry LaTeX markup: accents ({\\"o}, \\'{e}, \\c{c}), special
+letters (\\ss, \\o, \\L), escaped symbols (\\&, \\%), dashes and quotes
+(--, ``...''), a little math ($\\alpha$) and formatting commands (\\emph{...}).
+decode_latex() turns all of it into plain Unicode text, so titles, author
+names and venues read as they would in the typeset bibliography.
+
+Every token the decoder knows is compiled once into a character trie. A
+string is decoded in a single left-to-right pass: plain text is copied up to
+the next character that can start a token, and at that point the trie gives
+the longest token matching there, so the cost is linear in the field length
+however many tokens the tables hold.
+
+Braces and math dollars are dropped, formatting commands keep their argument,
+and unknown commands keep their name without the backslash (\\LaTeX becomes
+"LaTeX"), as the old brace-stripping cleaners did. strip_accents() folds the
+result back to plain letters where ASCII is wanted (URL slugs, author keys).
+
+Only the standard library is used, so this works for
+simple_bibtex_converter.py as well.
+"""
+
+import re
+import unicodedata
+
+# Accent commands and the combining character they put on the next letter
+ACCENTS = {
+    "`": "\u0300", "'": "\u0301", "^": "\u0302", "~": "\u0303", "=": "\u0304",
+    "u": "\u0306", ".": "\u0307", '"': "\u0308", "r": "\u030a", "H": "\u030b",
+    "v": "\u030c", "d": "\u0323", "c": "\u0327", "k": "\u0328", "b": "\u0331",
+}
+
+# Commands that stand for a character or a symbol
+SYMBOLS = {
+    "ss": "ß", "SS": "SS", "o": "ø", "O": "Ø", "ae": "æ", "AE": "Æ", "oe": "œ", "OE": "Œ",
+    "aa": "å", "AA": "Å", "l": "ł", "L": "Ł", "i": "ı", "j": "ȷ", "dh": "ð", "DH": "Ð",
+    "th": "þ", "TH": "Þ", "ng": "ŋ", "NG": "Ŋ",
+    "&": "&", "%": "%", "$": "$", "#": "#", "_": "_", "{": "{", "}": "}", " ": " ",
+    ",": " ", ";": " ", "\\": " ", "-": "",
+    "textendash": "–", "textemdash": "—", "ldots": "…", "dots": "…", "textellipsis": "…",
+    "textquoteleft": "‘", "textquoteright": "’", "textquotedblleft": "“", "textquotedblright": "”",
+    "guillemotleft": "«", "guillemotright": "»", "textbullet": "•", "textperiodcentered": "·",
+    "textregistered": "®", "texttrademark": "™", "copyright": "©", "textcopyright": "©",
+    "S": "§", "P": "¶", "dag": "†", "ddag": "‡", "textdegree": "°", "textasciitilde": "~",
+    "textbackslash": "\\", "textunderscore": "_", "textbar": "|", "textless": "<", "textgreater": ">",
+    "euro": "€", "pounds": "£", "textsterling": "£",
+    "alpha": "α", "beta": "β", "gamma": "γ", "delta": "δ", "epsilon": "ϵ", "varepsilon": "ε",
+    "zeta": "ζ", "eta": "η", "theta": "θ", "vartheta": "ϑ", "iota": "ι", "kappa": "κ",
+    "lambda": "λ", "mu": "μ", "nu": "ν", "xi": "ξ", "pi": "π", "varpi": "ϖ", "rho": "ρ",
+    "sigma": "σ", "varsigma": "ς", "tau": "τ", "upsilon": "υ", "phi": "ϕ", "varphi": "φ",
+    "chi": "χ", "psi": "ψ", "omega": "ω",
+    "Gamma": "Γ", "Delta": "Δ", "Theta": "Θ", "Lambda": "Λ", "Xi": "Ξ", "Pi": "Π",
+    "Sigma": "Σ", "Upsilon": "Υ", "Phi": "Φ", "Psi": "Ψ", "Omega": "Ω",
+    "times": "×", "div": "÷", "pm": "±", "mp": "∓", "cdot": "·", "circ": "∘", "ast": "∗",
+    "leq": "≤", "le": "≤", "geq": "≥", "ge": "≥", "neq": "≠", "ne": "≠", "approx": "≈",
+    "sim": "∼", "simeq": "≃", "equiv": "≡", "propto": "∝", "ll": "≪", "gg": "≫",
+    "infty": "∞", "partial": "∂", "nabla": "∇", "sum": "∑", "prod": "∏", "int": "∫",
+    "sqrt": "√", "in": "∈", "notin": "∉", "subset": "⊂", "subseteq": "⊆", "cup": "∪",
+    "cap": "∩", "emptyset": "∅", "forall": "∀", "exists": "∃", "neg": "¬", "wedge": "∧",
+    "vee": "∨", "to": "→", "rightarrow": "→", "leftarrow": "←", "leftrightarrow": "↔",
+    "Rightarrow": "⇒", "Leftarrow": "⇐", "Leftrightarrow": "⇔", "mapsto": "↦",
+    "uparrow": "↑", "downarrow": "↓", "ell": "ℓ", "hbar": "ℏ", "Re": "ℜ", "Im": "ℑ",
+    "aleph": "ℵ", "prime": "′", "degree": "°", "star": "⋆", "quad": "\u2003", "qquad": "\u2003\u2003",
+}
+
+# Formatting commands: the command goes, its argument stays
+FORMATTING = [
+    "emph", "textbf", "textit", "textsl", "textsc", "texttt", "textrm", "textsf", "textup",
+    "textmd", "textnormal", "text", "mbox", "hbox", "mathrm", "mathbf", "mathit", "mathsf",
+    "mathtt", "mathcal", "mathbb", "mathfrak", "boldsymbol", "operatorname", "bf", "it",
+    "em", "sc", "tt", "rm", "sf", "sl", "small", "footnotesize", "large", "Large",
+    "relax", "protect", "noopsort", "url", "nolinkurl", "left", "right",
+]
+
+# Character sequences outside commands
+LIGATURES = {
+    "---": "—", "--": "–", "``": "“", "''": "”", "~": "\u00a0",
+    "{": "", "}": "", "$": "",
+}
+
+# Dotless i and j are what {\i} and {\j} leave under an accent
+DOTLESS = {"ı": "i", "ȷ": "j"}
+
+# Letters with no Unicode decomposition, and the dashes decode_latex() makes
+# of -- and ---, that strip_accents() still folds to ASCII
+FOLDED = str.maketrans({
+    "ß": "ss", "ø": "o", "Ø": "O", "æ": "ae", "Æ": "AE", "œ": "oe", "Œ": "OE", "ł": "l", "Ł": "L",
+    "ı": "i", "ȷ": "j", "đ": "d", "Đ": "D", "ð": "d", "Ð": "D", "þ": "th", "Þ": "Th",
+    "–": "-", "—": "-",
+})
+
+_ACCENT = 1  # trie value kinds
+_TEXT = 2
+_END = ""  # key of the value stored at the node a token ends on
+
+
+def _build_trie():
+    trie = {}
+
+    def add(token, kind, value):
+        node = trie
+        for c in token:
+            node = node.setdefault(c, {})
+        node[_END] = (kind, value)
+
+    for token, text in LIGATURES.items():
+        add(token, _TEXT, text)
+    for name in FORMATTING:
+        add("\\" + name, _TEXT, "")
+    for name, text in SYMBOLS.items():
+        add("\\" + name, _TEXT, text)
+    for name, mark in ACCENTS.items():
+        add("\\" + name, _ACCENT, mark)
+    return trie
+
+
+TRIE = _build_trie()
+TOKEN_START = re.compile("[%s]" % re.escape("".join(c for c in TRIE if c != _END)))
+COMMAND_NAME = re.compile(r"\\([a-zA-Z]+)")
+
+
+def _match(text, pos):
+    """Longest known token at ``pos``: (end, kind, value), or None"""
+    node, best = TRIE, None
+    for i in range(pos, len(text)):
+        node = node.get(text[i])
+        if node is None:
+            break
+        value = node.get(_END)
+        if value is not None:
+            # A control word only ends where the letters end: \i is not the start of \item
+            if not (text[i].isalpha() and text[pos] == "\\" and text[i + 1:i + 2].isalpha()):
+                best = (i + 1, *value)
+    return best
+
+
+def decode_latex(text):
+    """Return ``text`` with LaTeX accents, symbols and markup turned into Unicode"""
+    if not text:
+        return ""
+    out = []
+    accent = None  # combining mark waiting for the next letter
+    pos = 0
+    while pos < len(text):
+        match = TOKEN_START.search(text, pos)
+        end = match.start() if match else len(text)
+        if end > pos:
+            chunk = text[pos:end]
+            if accent:
+                out.append(DOTLESS.get(chunk[0], chunk[0]) + accent + chunk[1:])
+                accent = None
+            else:
+                out.append(chunk)
+            pos = end
+            if not match:
+                break
+
+        token = _match(text, pos)
+        if token is None:
+            command = COMMAND_NAME.match(text, pos)
+            if command:
+                token = (command.end(), _TEXT, command.group(1))  # unknown command keeps its name
+            else:
+                token = (pos + 1, _TEXT, text[pos])
+        pos, kind, value = token
+
+        if kind == _ACCENT:
+            while pos < len(text) and text[pos] == " ":  # \c c is \c{c}
+                pos += 1
+            accent = value
+        elif value and accent:
+            out.append(DOTLESS.get(value[0], value[0]) + accent + value[1:])
+            accent = None
+        elif value:
+            out.append(value)
+    return unicodedata.normalize("NFC", "".join(out))
+
+
+def strip_accents(text):
+    """Fold accented letters to plain ones, for slugs and match keys ("Łukasz Schölkopf" -> "Lukasz Scholkopf")"""
+    text = unicodedata.normalize("NFKD", text.translate(FOLDED))
+    return "".join(c for c in text if not unicodedata.combining(c))
@@ -0,0 +1,181 @@
+"""
+Transactional output for the markdown generators
+
+Generators stage every file they produce in an OutputSink instead of writing
+it straight into ../_publications/ or ../_talks/. As files are staged, a
+thread pool
+
+- skips files whose bytes are already on disk, and
+- writes the changed ones to temporary files next to their targets.
+
+Nothing touches the collection until commit(), which renames all of the
+temporary files into place once every one of them was written.
+
+A crash or an exception while generating therefore leaves the collection as
+it was, and a rerun that produces the same output does no writes at all.
+Use the sink as a context manager, as every generator here does: leaving the
+block with an exception discards the staged temporary files, so none are
+left behind in the collection for Jekyll to pick up.
+
+Two different outputs staged under the same path (for instance two titles
+that truncate to the same slug) raise CollisionError instead of silently
+overwriting each other.
+
+Usage:
+    with OutputSink("../_publications") as sink:
+        sink.write("2025-01-01-paper.md", md, source=bib_id)
+    print(sink.summary())
+"""
+
+import hashlib
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+MAX_WORKERS = 8
+MAX_PENDING = 4 * MAX_WORKERS  # staged files allowed to wait in memory for a worker
+
+
+class CollisionError(Exception):
+    """Raised when two different outputs are staged under the same path"""
+
+
+class OutputSink:
+    def __init__(self, root, max_workers=MAX_WORKERS):
+        self.root = Path(root)
+        self.max_workers = max_workers
+        self.staged = {}
+        self.sources = {}
+        self.written = []
+        self.unchanged = []
+        self._pool = None
+        self._pending = threading.BoundedSemaphore(MAX_PENDING)
+
+    def write(self, relpath, content, source=None):
+        """Stage ``content`` (str or bytes) for ``root/relpath``.
+
+        The comparison with the existing file and the temporary copy happen
+        on the thread pool right away, so only a digest per path is kept in
+        memory and arbitrarily long runs stream through the sink.
+        """
+        data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        relpath = os.path.normpath(relpath)
+        digest = hashlib.sha256(data).digest()
+
+        if relpath in self.staged:
+            if self.staged[relpath][0] != digest:
+                raise CollisionError(
+                    f"{relpath} is produced by both {self.sources[relpath]} and {source or 'another entry'}"
+                )
+            return
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._pending.acquire()
+        future = self._pool.submit(self._stage, self.root / relpath, data)
+        future.add_done_callback(lambda _: self._pending.release())
+        self.staged[relpath] = (digest, future)
+        self.sources[relpath] = source or relpath
+
+    def _is_unchanged(self, path, data):
+        try:
+            if path.stat().st_size != len(data):
+                return False
+            with open(path, "rb") as f:
+                return f.read() == data
+        except FileNotFoundError:
+            return False
+
+    def _create_temp(self, path):
+        """Create a temporary file next to ``path``; return (fd, name)
+
+        Unlike mkstemp, which makes files readable by the owner only, it is
+        created with mode 0o666 less the umask, as open(..., "w") would, so
+        new outputs get the usual permissions without reading the umask.
+        """
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+        while True:
+            tmp = str(path.with_name(f".{path.name}.{secrets.token_hex(4)}.tmp"))
+            try:
+                return os.open(tmp, flags, 0o666), tmp
+            except FileExistsError:
+                continue
+
+    def _stage(self, path, data):
+        """Write ``data`` to a temporary file next to ``path``; None if unchanged"""
+        if self._is_unchanged(path, data):
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = self._create_temp(path)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                os.chmod(tmp, path.stat().st_mode & 0o777)  # an existing file keeps its mode
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return tmp
+
+    def _collect(self):
+        """Wait for all staging; return {relpath: temp path or None}"""
+        temps, error = {}, None
+        for relpath, (_, future) in self.staged.items():
+            try:
+                temps[relpath] = future.result()
+            except BaseException as e:
+                error = error or e
+        return temps, error
+
+    def _close(self):
+        self.staged.clear()
+        self.sources.clear()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def commit(self):
+        """Move every changed file into place; return the list of paths written"""
+        temps, error = self._collect()
+        if error is not None:
+            for tmp in temps.values():
+                if tmp:
+                    os.unlink(tmp)
+            self._close()
+            raise error
+
+        changed = sorted((self.root / relpath, tmp) for relpath, tmp in temps.items() if tmp)
+        self.unchanged = sorted(self.root / relpath for relpath, tmp in temps.items() if not tmp)
+
+        # Every new file is already on disk; the renames are atomic and cheap
+        if changed:
+            list(self._pool.map(lambda item: os.replace(item[1], item[0]), changed))
+
+        self.written = [path for path, _ in changed]
+        self._close()
+        return self.written
+
+    def discard(self):
+        """Drop everything staged without touching the collection"""
+        temps, _ = self._collect()
+        for tmp in temps.values():
+            if tmp:
+                os.unlink(tmp)
+        self._close()
+
+    def summary(self):
+        return f"{len(self.written)} written, {len(self.unchanged)} unchanged"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
@@ -17,25 +17,28 @@
 # - `url_slug` will be the descriptive part of the .md file and the permalink URL for the page about the paper. The .md file will be `YYYY-MM-DD-[url_slug].md` and the permalink will be `https://[yourdomain]/publications/YYYY-MM-DD-[url_slug]`
 
 
-# ## Import pandas
-# 
-# We are using the very handy pandas library for dataframes.
-
-# In[2]:
-
-import pandas as pd
-
-
 # ## Import TSV
 # 
 # Pandas makes this easy with the read_csv function. We are using a TSV, so we specify the separator as a tab, or `\t`.
 # 
 # I found it important to put this data in a tab-separated values format, because there are a lot of commas in this kind of data and comma-separated values can get messed up. However, you can modify the import statement, as pandas also has read_excel(), read_json(), and others.
+#
+# `read_publications` takes a path or a file-like object and returns one dict per row, so the rest of this file also works on records built in memory.
 
 # In[3]:
 
-publications = pd.read_csv("publications.tsv", sep="\t", header=0)
-publications
+import os
+
+try:
+    from .output_sink import OutputSink
+except ImportError:  # run as a script from markdown_generator/
+    from output_sink import OutputSink
+
+
+def read_publications(source="publications.tsv"):
+    """Read a TSV path or file-like object into one dict per row"""
+    import pandas as pd
+    return pd.read_csv(source, sep="\t", header=0).to_dict("records")
 
 
 # ## Escape special characters
@@ -61,48 +64,60 @@ def html_escape(text):
 
 # In[5]:
 
-import os
-for row, item in publications.iterrows():
-    
-    md_filename = str(item.pub_date) + "-" + item.url_slug + ".md"
-    html_filename = str(item.pub_date) + "-" + item.url_slug
-    year = item.pub_date[:4]
+def publication_to_markdown(item):
+    """Build (md_filename, md) for one publication record"""
+    item = dict(item)
+    md_filename = str(item["pub_date"]) + "-" + item["url_slug"] + ".md"
+    html_filename = str(item["pub_date"]) + "-" + item["url_slug"]
     
     ## YAML variables
     
-    md = "---\ntitle: \""   + item.title + '"\n'
+    md = "---\ntitle: \""   + item["title"] + '"\n'
     
     md += """collection: publications"""
     
     md += """\npermalink: /publication/""" + html_filename
     
-    if len(str(item.excerpt)) > 5:
-        md += "\nexcerpt: '" + html_escape(item.excerpt) + "'"
+    if len(str(item.get("excerpt"))) > 5:
+        md += "\nexcerpt: '" + html_escape(item["excerpt"]) + "'"
     
-    md += "\ndate: " + str(item.pub_date) 
+    md += "\ndate: " + str(item["pub_date"]) 
     
-    md += "\nvenue: '" + html_escape(item.venue) + "'"
+    md += "\nvenue: '" + html_escape(item["venue"]) + "'"
     
-    if len(str(item.paper_url)) > 5:
-        md += "\npaperurl: '" + item.paper_url + "'"
+    if len(str(item.get("paper_url"))) > 5:
+        md += "\npaperurl: '" + item["paper_url"] + "'"
     
-    md += "\ncitation: '" + html_escape(item.citation) + "'"
+    md += "\ncitation: '" + html_escape(item["citation"]) + "'"
     
     md += "\n---"
     
     ## Markdown description for individual page
     
-    if len(str(item.paper_url)) > 5:
-        md += "\n\n<a href='" + item.paper_url + "'>Download paper here</a>\n" 
+    if len(str(item.get("paper_url"))) > 5:
+        md += "\n\n<a href='" + item["paper_url"] + "'>Download paper here</a>\n" 
         
-    if len(str(item.excerpt)) > 5:
-        md += "\n" + html_escape(item.excerpt) + "\n"
+    if len(str(item.get("excerpt"))) > 5:
+        md += "\n" + html_escape(item["excerpt"]) + "\n"
         
-    md += "\nRecommended citation: " + item.citation
+    md += "\nRecommended citation: " + item["citation"]
     
-    md_filename = os.path.basename(md_filename)
-       
-    with open("../_publications/" + md_filename, 'w') as f:
-        f.write(md)
+    return os.path.basename(md_filename), md
+
+
+def render_publications(records):
+    """Render publication records; return list of (filename, markdown)"""
+    return [publication_to_markdown(item) for item in records]
+
+
+def main(source="publications.tsv", output_dir="../_publications/"):
+    # Files are staged and written together at the end; unchanged files are not rewritten
+    with OutputSink(output_dir) as sink:
+        for item in read_publications(source):
+            md_filename, md = publication_to_markdown(item)
+            sink.write(md_filename, md, source=item["title"])
+    print(sink.summary())
 
 
+if __name__ == "__main__":
+    main()
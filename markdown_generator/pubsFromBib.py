@@ -24,6 +24,13 @@ import html
 import os
 import re
 
+try:
+    from .latex import decode_latex, strip_accents
+    from .output_sink import CollisionError, OutputSink
+except ImportError:  # run as a script from markdown_generator/
+    from latex import decode_latex, strip_accents
+    from output_sink import CollisionError, OutputSink
+
 #todo: incorporate different collection types rather than a catch all publications, requires other changes to template
 publist = {
     "proceeding": {
@@ -54,107 +61,149 @@ def html_escape(text):
     return "".join(html_escape_table.get(c,c) for c in text)
 
 
-for pubsource in publist:
+def parse_bib(source):
+    """Parse a BibTeX path or file-like object; a fresh parser is used for every call"""
     parser = bibtex.Parser()
-    bibdata = parser.parse_file(publist[pubsource]["file"])
-
-    #loop through the individual references in a given bibtex file
-    for bib_id in bibdata.entries:
-        #reset default date
-        pub_year = "1900"
-        pub_month = "01"
-        pub_day = "01"
-        
-        b = bibdata.entries[bib_id].fields
+    if hasattr(source, "read"):
+        return parser.parse_stream(source)
+    return parser.parse_file(source)
+
+
+def bib_entry_to_markdown(entry, pubsource):
+    """Build (md_filename, md) for one entry using a publist-style source config.
+
+    Raises KeyError if the entry lacks a field the citation needs.
+    """
+    #reset default date
+    pub_year = "1900"
+    pub_month = "01"
+    pub_day = "01"
+
+    b = entry.fields
+
+    pub_year = f'{b["year"]}'
+
+    #todo: this hack for month and day needs some cleanup
+    if "month" in b.keys(): 
+        if(len(b["month"])<3):
+            pub_month = "0"+b["month"]
+            pub_month = pub_month[-2:]
+        elif(b["month"] not in range(12)):
+            tmnth = strptime(b["month"][:3],'%b').tm_mon   
+            pub_month = "{:02d}".format(tmnth) 
+        else:
+            pub_month = str(b["month"])
+    if "day" in b.keys(): 
+        pub_day = str(b["day"])
+
         
+    pub_date = pub_year+"-"+pub_month+"-"+pub_day
+    
+    #decode LaTeX accents and markup (some bibtex entries that maintain formatting)
+    title = decode_latex(b["title"])
+    #slugs stay ASCII so existing permalinks keep working
+    clean_title = strip_accents(title).replace(" ","-")
+
+    url_slug = re.sub("\\[.*\\]|[^a-zA-Z0-9_-]", "", clean_title)
+    url_slug = url_slug.replace("--","-")
+
+    md_filename = (str(pub_date) + "-" + url_slug + ".md").replace("--","-")
+    html_filename = (str(pub_date) + "-" + url_slug).replace("--","-")
+
+    #Build Citation from text
+    citation = ""
+
+    #citation authors - todo - add highlighting for primary author?
+    for author in entry.persons["author"]:
+        citation = citation+" "+decode_latex(author.first_names[0])+" "+decode_latex(author.last_names[0])+", "
+
+    #citation title
+    citation = citation + "\"" + html_escape(title) + ".\""
+
+    #add venue logic depending on citation type
+    venue = pubsource["venue-pretext"]+decode_latex(b[pubsource["venuekey"]])
+
+    citation = citation + " " + html_escape(venue)
+    citation = citation + ", " + pub_year + "."
+
+    
+    ## YAML variables
+    md = "---\ntitle: \""   + html_escape(title) + '"\n'
+    
+    md += """collection: """ +  pubsource["collection"]["name"]
+
+    md += """\npermalink: """ + pubsource["collection"]["permalink"]  + html_filename
+    
+    note = False
+    if "note" in b.keys():
+        if len(str(b["note"])) > 5:
+            md += "\nexcerpt: '" + html_escape(b["note"]) + "'"
+            note = True
+
+    md += "\ndate: " + str(pub_date) 
+
+    md += "\nvenue: '" + html_escape(venue) + "'"
+    
+    url = False
+    if "url" in b.keys():
+        if len(str(b["url"])) > 5:
+            md += "\npaperurl: '" + b["url"] + "'"
+            url = True
+
+    md += "\ncitation: '" + html_escape(citation) + "'"
+
+    md += "\n---"
+
+    
+    ## Markdown description for individual page
+    if note:
+        md += "\n" + html_escape(b["note"]) + "\n"
+
+    if url:
+        md += "\n[Access paper here](" + b["url"] + "){:target=\"_blank\"}\n" 
+    else:
+        md += "\nUse [Google Scholar](https://scholar.google.com/scholar?q="+html.escape(clean_title.replace("-","+"))+"){:target=\"_blank\"} for full citation"
+
+    md_filename = os.path.basename(md_filename)
+
+    return md_filename, md
+
+
+def render_bibliography(source, pubsource):
+    """Render every usable entry of a BibTeX path or file-like object; return list of (filename, markdown)"""
+    outputs = []
+    bibdata = parse_bib(source)
+    for bib_id, entry in bibdata.entries.items():
         try:
-            pub_year = f'{b["year"]}'
-
-            #todo: this hack for month and day needs some cleanup
-            if "month" in b.keys(): 
-                if(len(b["month"])<3):
-                    pub_month = "0"+b["month"]
-                    pub_month = pub_month[-2:]
-                elif(b["month"] not in range(12)):
-                    tmnth = strptime(b["month"][:3],'%b').tm_mon   
-                    pub_month = "{:02d}".format(tmnth) 
-                else:
-                    pub_month = str(b["month"])
-            if "day" in b.keys(): 
-                pub_day = str(b["day"])
-
-                
-            pub_date = pub_year+"-"+pub_month+"-"+pub_day
-            
-            #strip out {} as needed (some bibtex entries that maintain formatting)
-            clean_title = b["title"].replace("{", "").replace("}","").replace("\\","").replace(" ","-")    
-
-            url_slug = re.sub("\\[.*\\]|[^a-zA-Z0-9_-]", "", clean_title)
-            url_slug = url_slug.replace("--","-")
-
-            md_filename = (str(pub_date) + "-" + url_slug + ".md").replace("--","-")
-            html_filename = (str(pub_date) + "-" + url_slug).replace("--","-")
-
-            #Build Citation from text
-            citation = ""
-
-            #citation authors - todo - add highlighting for primary author?
-            for author in bibdata.entries[bib_id].persons["author"]:
-                citation = citation+" "+author.first_names[0]+" "+author.last_names[0]+", "
-
-            #citation title
-            citation = citation + "\"" + html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")) + ".\""
-
-            #add venue logic depending on citation type
-            venue = publist[pubsource]["venue-pretext"]+b[publist[pubsource]["venuekey"]].replace("{", "").replace("}","").replace("\\","")
-
-            citation = citation + " " + html_escape(venue)
-            citation = citation + ", " + pub_year + "."
-
-            
-            ## YAML variables
-            md = "---\ntitle: \""   + html_escape(b["title"].replace("{", "").replace("}","").replace("\\","")) + '"\n'
-            
-            md += """collection: """ +  publist[pubsource]["collection"]["name"]
-
-            md += """\npermalink: """ + publist[pubsource]["collection"]["permalink"]  + html_filename
-            
-            note = False
-            if "note" in b.keys():
-                if len(str(b["note"])) > 5:
-                    md += "\nexcerpt: '" + html_escape(b["note"]) + "'"
-                    note = True
-
-            md += "\ndate: " + str(pub_date) 
-
-            md += "\nvenue: '" + html_escape(venue) + "'"
-            
-            url = False
-            if "url" in b.keys():
-                if len(str(b["url"])) > 5:
-                    md += "\npaperurl: '" + b["url"] + "'"
-                    url = True
-
-            md += "\ncitation: '" + html_escape(citation) + "'"
-
-            md += "\n---"
-
-            
-            ## Markdown description for individual page
-            if note:
-                md += "\n" + html_escape(b["note"]) + "\n"
-
-            if url:
-                md += "\n[Access paper here](" + b["url"] + "){:target=\"_blank\"}\n" 
-            else:
-                md += "\nUse [Google Scholar](https://scholar.google.com/scholar?q="+html.escape(clean_title.replace("-","+"))+"){:target=\"_blank\"} for full citation"
-
-            md_filename = os.path.basename(md_filename)
-
-            with open("../_publications/" + md_filename, 'w', encoding="utf-8") as f:
-                f.write(md)
-            print(f'SUCESSFULLY PARSED {bib_id}: \"', b["title"][:60],"..."*(len(b['title'])>60),"\"")
-        # field may not exist for a reference
+            outputs.append(bib_entry_to_markdown(entry, pubsource))
         except KeyError as e:
-            print(f'WARNING Missing Expected Field {e} from entry {bib_id}: \"', b["title"][:30],"..."*(len(b['title'])>30),"\"")
-            continue
+            print(f'WARNING Missing Expected Field {e} from entry {bib_id}')
+    return outputs
+
+
+def main(publist=publist, output_dir="../_publications/"):
+    # Every file is staged and only written once all sources parsed cleanly
+    with OutputSink(output_dir) as sink:
+        for pubsource in publist:
+            bibdata = parse_bib(publist[pubsource]["file"])
+
+            #loop through the individual references in a given bibtex file
+            for bib_id in bibdata.entries:
+                b = bibdata.entries[bib_id].fields
+                try:
+                    md_filename, md = bib_entry_to_markdown(bibdata.entries[bib_id], publist[pubsource])
+                    sink.write(md_filename, md, source=bib_id)
+                    print(f'SUCESSFULLY PARSED {bib_id}: \"', b["title"][:60],"..."*(len(b['title'])>60),"\"")
+                # field may not exist for a reference
+                except KeyError as e:
+                    print(f'WARNING Missing Expected Field {e} from entry {bib_id}: \"', b["title"][:30],"..."*(len(b['title'])>30),"\"")
+                    continue
+                except CollisionError as e:
+                    print(f'WARNING Skipping {bib_id}: {e}')
+                    continue
+
+    print(f'Publications: {sink.summary()}')
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,12 @@ Simple BibTeX to Publications Converter (No External Dependencies)
 This script converts BibTeX entries to Jekyll markdown files without requiring pybtex.
 It uses basic string parsing to extract publication information.
 
+The file is read in two passes. The first collects @string macros and indexes
+entries by citation key; the second resolves every entry against those
+tables, expanding macros and "#" concatenation and filling fields inherited
+through crossref (a proceedings title becomes the booktitle of its papers).
+Proceedings that are only crossref targets are not converted themselves.
+
 Usage:
     python3 simple_bibtex_converter.py your_publications.bib
 """
@@ -15,59 +21,205 @@ import re
 import sys
 from pathlib import Path
 
-def parse_bibtex_entry(entry_text):
-    """Parse a single BibTeX entry using basic string operations"""
-    entry = {}
-    
-    # Extract entry type and key
-    type_match = re.match(r'@(\w+)\{([^,]+),', entry_text)
-    if type_match:
-        entry['type'] = type_match.group(1).lower()
-        entry['key'] = type_match.group(2).strip()
-    
-    # Extract fields - improved regex to handle nested braces better
-    field_pattern = r'(\w+)\s*=\s*[{"]([^{}]*(?:\{[^{}]*\}[^{}]*)*)[}"]'
-    
-    for match in re.finditer(field_pattern, entry_text, re.DOTALL):
-        field_name = match.group(1).lower()
-        field_value = match.group(2).strip()
-        # Clean up the field value
-        field_value = re.sub(r'\s+', ' ', field_value)  # Normalize whitespace
-        entry[field_name] = field_value
-    
+try:
+    from .latex import decode_latex, strip_accents
+    from .output_sink import OutputSink
+    from .venues import categorize, normalize_venue
+except ImportError:  # run as a script from markdown_generator/
+    from latex import decode_latex, strip_accents
+    from output_sink import OutputSink
+    from venues import categorize, normalize_venue
+
+# Month macros that every BibTeX style predefines
+PREDEFINED_MACROS = {
+    'jan': 'January', 'feb': 'February', 'mar': 'March', 'apr': 'April',
+    'may': 'May', 'jun': 'June', 'jul': 'July', 'aug': 'August',
+    'sep': 'September', 'oct': 'October', 'nov': 'November', 'dec': 'December',
+}
+
+# Crossref targets of these types are containers, not publications of their own
+CONTAINER_TYPES = {'proceedings', 'mvproceedings', 'book', 'mvbook', 'collection'}
+
+ENTRY_START = re.compile(r'@\s*(\w+)\s*([{(])')
+FIELD_NAME = re.compile(r'[\s,]*([^\s=,{}"#()]+)\s*=\s*')
+BARE_VALUE = re.compile(r'[^\s,#{}"()]+')
+
+def find_closing(text, pos, close):
+    """Index of the ``close`` delimiter ending the block that starts at ``pos``"""
+    depth = 0
+    for i in range(pos, len(text)):
+        c = text[i]
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            if depth == 0 and close == '}':
+                return i
+            depth -= 1
+        elif c == close and depth == 0:
+            return i
+    return len(text)
+
+def read_value(text, pos):
+    """Read ``part # part # ...`` from ``pos``; return (tokens, end position).
+
+    Tokens are ('text', string) for braced, quoted and numeric parts and
+    ('macro', name) for @string references, resolved later.
+    """
+    tokens = []
+    while pos < len(text):
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            break
+        c = text[pos]
+        if c == '{':
+            end = find_closing(text, pos + 1, '}')
+            tokens.append(('text', text[pos + 1:end]))
+            pos = end + 1
+        elif c == '"':
+            end = find_closing(text, pos + 1, '"')
+            tokens.append(('text', text[pos + 1:end]))
+            pos = end + 1
+        else:
+            match = BARE_VALUE.match(text, pos)
+            if not match:
+                break
+            word = match.group(0)
+            tokens.append(('text', word) if word.isdigit() else ('macro', word.lower()))
+            pos = match.end()
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos < len(text) and text[pos] == '#':
+            pos += 1
+            continue
+        break
+    return tokens, pos
+
+def read_fields(body):
+    """Return [(field name, tokens), ...] from the body of an entry"""
+    fields = []
+    pos = 0
+    while True:
+        match = FIELD_NAME.match(body, pos)
+        if not match:
+            break
+        tokens, pos = read_value(body, match.end())
+        fields.append((match.group(1).lower(), tokens))
+    return fields
+
+def resolve_value(tokens, macros):
+    """Join the parts of a value, looking @string macros up by name"""
+    parts = []
+    for kind, value in tokens:
+        if kind == 'macro':
+            if value not in macros:
+                print(f"Warning: undefined @string macro '{value}'")
+            parts.append(macros.get(value, ''))
+        else:
+            parts.append(value)
+    return re.sub(r'\s+', ' ', ''.join(parts)).strip()  # Normalize whitespace
+
+def scan_bibtex(content):
+    """First pass: collect @string macros, raw entries and an index of entries by key"""
+    macros = dict(PREDEFINED_MACROS)
+    entries = []
+    index = {}
+    pos = 0
+    while True:
+        match = ENTRY_START.search(content, pos)
+        if not match:
+            break
+        kind = match.group(1).lower()
+        close = '}' if match.group(2) == '{' else ')'
+        end = find_closing(content, match.end(), close)
+        body = content[match.end():end]
+        pos = end + 1
+
+        if kind in ('comment', 'preamble'):
+            continue
+        if kind == 'string':
+            # Macros may use the macros defined before them
+            for name, tokens in read_fields(body):
+                macros[name] = resolve_value(tokens, macros)
+            continue
+
+        key, _, rest = body.partition(',')
+        key = key.strip()
+        index[key.lower()] = len(entries)
+        entries.append((kind, key, read_fields(rest)))
+    return macros, entries, index
+
+def resolve_entry(raw, macros):
+    kind, key, fields = raw
+    entry = {'type': kind, 'key': key}
+    for name, tokens in fields:
+        entry[name] = resolve_value(tokens, macros)
     return entry
 
+def inherit(entry, parent):
+    """Fill the fields an entry lacks from its crossref parent"""
+    for name, value in parent.items():
+        if name not in ('type', 'key', 'crossref') and not entry.get(name):
+            entry[name] = value
+    # The title of a proceedings volume is the booktitle of its papers
+    if not entry.get('booktitle') and parent.get('type') in CONTAINER_TYPES and parent.get('title'):
+        entry['booktitle'] = parent['title']
+    return entry
+
+def iter_bibtex_entries(content):
+    """Second pass: yield every entry with macros and crossrefs resolved"""
+    macros, entries, index = scan_bibtex(content)
+    crossref_targets = set()
+    for _, _, fields in entries:
+        for name, tokens in fields:
+            if name == 'crossref':
+                crossref_targets.add(resolve_value(tokens, macros).lower())
+
+    for raw in entries:
+        kind, key, _ = raw
+        if kind in CONTAINER_TYPES and key.lower() in crossref_targets:
+            continue
+        entry = resolve_entry(raw, macros)
+        parent_key = entry.get('crossref', '').lower()
+        if parent_key in index:
+            inherit(entry, resolve_entry(entries[index[parent_key]], macros))
+        elif parent_key:
+            print(f"Warning: crossref '{entry['crossref']}' of {key} not found")
+        yield entry
+
+def parse_bibtex_entry(entry_text, macros=None):
+    """Parse a single BibTeX entry, resolving macros from ``macros``"""
+    macros = dict(PREDEFINED_MACROS, **(macros or {}))
+    _, entries, _ = scan_bibtex(entry_text)
+    return resolve_entry(entries[0], macros) if entries else {}
+
+def parse_bibtex_string(content):
+    """Parse BibTeX source text and return list of entries"""
+    return list(iter_bibtex_entries(content))
+
 def parse_bibtex_file(file_path):
-    """Parse BibTeX file and return list of entries"""
+    """Parse BibTeX file (a path or a file-like object) and return list of entries"""
+    if hasattr(file_path, 'read'):
+        return parse_bibtex_string(file_path.read())
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
-    
-    # Split into individual entries
-    entries = []
-    entry_pattern = r'@\w+\{[^@]*(?=@|\Z)'
-    
-    for match in re.finditer(entry_pattern, content, re.DOTALL):
-        entry_text = match.group(0)
-        entry = parse_bibtex_entry(entry_text)
-        if entry:
-            entries.append(entry)
-    
-    return entries
+    return parse_bibtex_string(content)
 
 def clean_string(text):
-    """Clean text for YAML output"""
+    """Decode LaTeX in a field value; quote it with yaml_quote() for front matter"""
     if not text:
         return ""
-    # Remove extra braces and clean up formatting
-    cleaned = text.replace('{}', '').replace('\\', '')
-    # Escape quotes for YAML
-    cleaned = cleaned.replace('"', '\\"')
-    return cleaned.strip()
+    # LaTeX accents, symbols and markup to Unicode
+    return decode_latex(text).strip()
+
+def yaml_quote(text):
+    """Double-quoted YAML scalar for ``text``, escaping backslashes and quotes"""
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
 
 def create_url_slug(title):
     """Create URL-friendly slug from title"""
-    # Remove special characters and convert to lowercase
-    slug = re.sub(r'[^\w\s-]', '', title.lower())
+    # Remove accents and special characters and convert to lowercase
+    slug = re.sub(r'[^\w\s-]', '', strip_accents(title).lower())
     # Replace spaces and multiple dashes with single dash
     slug = re.sub(r'[-\s]+', '-', slug)
     # Limit length to avoid filesystem issues
@@ -76,30 +228,7 @@ def create_url_slug(title):
 
 def determine_category(entry_type, venue):
     """Determine publication category"""
-    entry_type = entry_type.lower()
-    venue_lower = venue.lower() if venue else ""
-    
-    # Check for preprint indicators
-    preprint_indicators = ['arxiv', 'preprint', 'submitted', 'under review']
-    if any(indicator in venue_lower for indicator in preprint_indicators):
-        return 'manuscripts'
-    
-    # Check entry type
-    if entry_type in ['inproceedings', 'conference']:
-        return 'conferences'
-    elif entry_type in ['article', 'journal']:
-        return 'journals'
-    else:
-        # Default based on venue keywords
-        conference_keywords = ['conference', 'proceedings', 'workshop', 'symposium']
-        journal_keywords = ['journal', 'transactions', 'letters']
-        
-        if any(keyword in venue_lower for keyword in conference_keywords):
-            return 'conferences'
-        elif any(keyword in venue_lower for keyword in journal_keywords):
-            return 'journals'
-        else:
-            return 'manuscripts'
+    return categorize(entry_type, venue)
 
 def extract_date_info(entry):
     """Extract date from entry"""
@@ -140,7 +269,8 @@ def extract_venue(entry):
                 entry.get('venue', '') or 
                 entry.get('publisher', ''))
     
-    return clean_string(venue)
+    # Known venues are rewritten to their canonical "Name (ABBR), year" form
+    return normalize_venue(clean_string(venue), entry.get('year'))
 
 def extract_urls(entry):
     """Extract URL information from entry"""
@@ -174,6 +304,74 @@ def extract_urls(entry):
     
     return buttons
 
+def entry_to_markdown(entry, category=None):
+    """Render one parsed entry; return (filename, markdown, category), or None without a title
+
+    ``category`` overrides the category derived from the entry type and venue.
+    """
+    title = clean_string(entry.get('title', ''))
+    if not title:
+        return None
+    
+    author = clean_string(entry.get('author', ''))
+    venue = extract_venue(entry)
+    date = extract_date_info(entry)
+    category = category or determine_category(entry.get('type', ''), venue)
+    
+    # Create URL slug and filename
+    url_slug = create_url_slug(title)
+    filename = f"{date}-{url_slug}.md"
+    
+    # Extract URLs
+    buttons = extract_urls(entry)
+    
+    # Build markdown content
+    md_content = []
+    md_content.append("---")
+    md_content.append(f"title: {yaml_quote(title)}")
+    md_content.append("collection: publications")
+    md_content.append(f"category: {category}")
+    md_content.append(f"date: {date}")
+    md_content.append(f"permalink: /publication/{url_slug}")
+    
+    # Add authors if available
+    if author:
+        md_content.append(f"authors: {yaml_quote(author)}")
+    
+    # Add venue if available
+    if venue:
+        md_content.append(f"venue: {yaml_quote(venue)}")
+    
+    # Add buttons if available
+    if buttons:
+        md_content.append("buttons:")
+        for button in buttons:
+            md_content.append(f"  - type: {button['type']}")
+            md_content.append(f"    url: {button['url']}")
+    
+    md_content.append("---")
+    md_content.append("")
+    
+    # Add abstract or note if available
+    abstract = clean_string(entry.get('abstract', ''))
+    note = clean_string(entry.get('note', ''))
+    
+    if abstract:
+        md_content.append(abstract)
+    elif note:
+        md_content.append(note)
+    
+    return filename, '\n'.join(md_content), category
+
+def render_bibtex(source):
+    """Render a BibTeX path or file-like object; return list of (filename, markdown)"""
+    outputs = []
+    for entry in parse_bibtex_file(source):
+        rendered = entry_to_markdown(entry)
+        if rendered:
+            outputs.append(rendered[:2])
+    return outputs
+
 def convert_bibtex_to_markdown(bib_file_path, output_dir):
     """Convert BibTeX file to Jekyll markdown files"""
     
@@ -189,77 +387,29 @@ def convert_bibtex_to_markdown(bib_file_path, output_dir):
     output_path.mkdir(parents=True, exist_ok=True)
     
     successful_conversions = 0
+    with OutputSink(output_path) as sink:
     
-    # Process each entry
-    for entry in entries:
-        try:
-            # Extract basic information
-            title = clean_string(entry.get('title', ''))
-            if not title:
-                print(f"Warning: No title found for entry {entry.get('key', 'unknown')}, skipping...")
-                continue
-            
-            author = clean_string(entry.get('author', ''))
-            venue = extract_venue(entry)
-            date = extract_date_info(entry)
-            category = determine_category(entry.get('type', ''), venue)
-            
-            # Create URL slug and filename
-            url_slug = create_url_slug(title)
-            filename = f"{date}-{url_slug}.md"
-            
-            # Extract URLs
-            buttons = extract_urls(entry)
-            
-            # Build markdown content
-            md_content = []
-            md_content.append("---")
-            md_content.append(f'title: "{title}"')
-            md_content.append("collection: publications")
-            md_content.append(f"category: {category}")
-            md_content.append(f"date: {date}")
-            md_content.append(f"permalink: /publication/{url_slug}")
-            
-            # Add authors if available
-            if author:
-                md_content.append(f"authors: {author}")
-            
-            # Add venue if available
-            if venue:
-                md_content.append(f"venue: {venue}")
+        # Process each entry
+        for entry in entries:
+            try:
+                rendered = entry_to_markdown(entry)
+                if rendered is None:
+                    print(f"Warning: No title found for entry {entry.get('key', 'unknown')}, skipping...")
+                    continue
+                filename, markdown, category = rendered
             
-            # Add buttons if available
-            if buttons:
-                md_content.append("buttons:")
-                for button in buttons:
-                    md_content.append(f"  - type: {button['type']}")
-                    md_content.append(f"    url: {button['url']}")
+                # Stage the file; nothing is written until every entry is processed
+                sink.write(filename, markdown, source=entry.get('key'))
             
-            md_content.append("---")
-            md_content.append("")
+                print(f"✓ Created: {filename} ({category})")
+                successful_conversions += 1
             
-            # Add abstract or note if available
-            abstract = clean_string(entry.get('abstract', ''))
-            note = clean_string(entry.get('note', ''))
-            
-            if abstract:
-                md_content.append(abstract)
-            elif note:
-                md_content.append(note)
-            
-            # Write to file
-            output_file = output_path / filename
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(md_content))
-            
-            print(f"✓ Created: {filename} ({category})")
-            successful_conversions += 1
-            
-        except Exception as e:
-            print(f"Error processing entry {entry.get('key', 'unknown')}: {e}")
-            continue
-    
+            except Exception as e:
+                print(f"Error processing entry {entry.get('key', 'unknown')}: {e}")
+                continue
+
     print(f"\nSuccessfully converted {successful_conversions} publications!")
+    print(f"Files written: {sink.summary()}")
     print(f"Files saved to: {output_path}")
 
 def main():
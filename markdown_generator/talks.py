@@ -9,8 +9,13 @@
 
 # In[1]:
 
-import pandas as pd
 import os
+import re
+
+try:
+    from .output_sink import OutputSink
+except ImportError:  # run as a script from markdown_generator/
+    from output_sink import OutputSink
 
 
 # ## Data format
@@ -33,8 +38,10 @@ import os
 
 # In[3]:
 
-talks = pd.read_csv("talks.tsv", sep="\t", header=0)
-talks
+def read_talks(source="talks.tsv"):
+    """Read a TSV path or file-like object into one dict per row"""
+    import pandas as pd
+    return pd.read_csv(source, sep="\t", header=0).to_dict("records")
 
 
 # ## Escape special characters
@@ -56,56 +63,78 @@ def html_escape(text):
         return "False"
 
 
+# Talks without a `url_slug` (e.g. imported by talks_from_ics.py) get one made from the title.
+
+def create_url_slug(title):
+    slug = re.sub(r"[^\w\s-]", "", title.lower())
+    return re.sub(r"[-\s]+", "-", slug).strip("-")
+
+
 # ## Creating the markdown files
 # 
 # This is where the heavy lifting is done. This loops through all the rows in the TSV dataframe, then starts to concatentate a big string (```md```) that contains the markdown for each type. It does the YAML metadata first, then does the description for the individual page.
 
 # In[5]:
 
-loc_dict = {}
+def present(value):
+    """Blank TSV cells come through as NaN, in-memory records as None or an empty string"""
+    return value is not None and value == value and str(value).strip() != ""
 
-for row, item in talks.iterrows():
-    
-    md_filename = str(item.date) + "-" + item.url_slug + ".md"
-    html_filename = str(item.date) + "-" + item.url_slug 
-    year = item.date[:4]
+
+def talk_to_markdown(item):
+    """Build (md_filename, md) for one talk record"""
+    item = dict(item)
+    if not present(item.get("url_slug")):
+        item["url_slug"] = create_url_slug(item["title"])
+    md_filename = str(item["date"]) + "-" + item["url_slug"] + ".md"
+    html_filename = str(item["date"]) + "-" + item["url_slug"] 
     
-    md = "---\ntitle: \""   + item.title + '"\n'
+    md = "---\ntitle: \""   + html_escape(str(item["title"])) + '"\n'
     md += "collection: talks" + "\n"
     
-    if len(str(item.type)) > 3:
-        md += 'type: "' + item.type + '"\n'
+    if present(item.get("type")):
+        md += 'type: "' + item["type"] + '"\n'
     else:
         md += 'type: "Talk"\n'
     
     md += "permalink: /talks/" + html_filename + "\n"
     
-    if len(str(item.venue)) > 3:
-        md += 'venue: "' + item.venue + '"\n'
+    if present(item.get("venue")):
+        md += 'venue: "' + html_escape(str(item["venue"])) + '"\n'
         
-    if len(str(item.location)) > 3:
-        md += "date: " + str(item.date) + "\n"
+    md += "date: " + str(item["date"]) + "\n"
     
-    if len(str(item.location)) > 3:
-        md += 'location: "' + str(item.location) + '"\n'
+    if present(item.get("location")):
+        md += 'location: "' + html_escape(str(item["location"])) + '"\n'
            
     md += "---\n"
     
     
-    if len(str(item.talk_url)) > 3:
-        md += "\n[More information here](" + item.talk_url + ")\n" 
+    if present(item.get("talk_url")):
+        md += "\n[More information here](" + item["talk_url"] + ")\n" 
         
     
-    if len(str(item.description)) > 3:
-        md += "\n" + html_escape(item.description) + "\n"
+    if present(item.get("description")):
+        md += "\n" + html_escape(item["description"]) + "\n"
         
-        
-    md_filename = os.path.basename(md_filename)
-    #print(md)
-    
-    with open("../_talks/" + md_filename, 'w') as f:
-        f.write(md)
+    return os.path.basename(md_filename), md
+
+
+def render_talks(records):
+    """Render talk records; return list of (filename, markdown)"""
+    return [talk_to_markdown(item) for item in records]
 
 
 # These files are in the talks directory, one directory below where we're working from.
 
+def main(source="talks.tsv", output_dir="../_talks/"):
+    # Files are staged and written together at the end; unchanged files are not rewritten
+    with OutputSink(output_dir) as sink:
+        for item in read_talks(source):
+            md_filename, md = talk_to_markdown(item)
+            sink.write(md_filename, md, source=item["title"])
+    print(sink.summary())
+
+
+if __name__ == "__main__":
+    main()
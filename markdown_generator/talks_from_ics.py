@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+iCalendar to Talks Converter
+
+Reads talks from an exported .ics calendar instead of talks.tsv and writes
+them to ../_talks/ in the same format as talks.py. The calendar is read line
+by line and each VEVENT is converted and handed to the output sink as soon
+as it ends, so a calendar spanning many years is imported in constant
+memory.
+
+Event fields map to talk fields as follows:
+    SUMMARY -> title        DTSTART  -> date
+    LOCATION -> location    URL      -> talk_url
+    DESCRIPTION -> description
+    X-VENUE, or the organizer's CN, -> venue
+
+Usage:
+    python3 talks_from_ics.py calendar.ics --category talk
+    python3 talks_from_ics.py calendar.ics --keyword seminar --keyword keynote
+"""
+
+import argparse
+import os
+import re
+import sys
+
+try:
+    from .output_sink import CollisionError, OutputSink
+    from .talks import talk_to_markdown
+except ImportError:  # run as a script from markdown_generator/
+    from output_sink import CollisionError, OutputSink
+    from talks import talk_to_markdown
+
+ICS_UNESCAPE = re.compile(r"\\([\\,;nN])")
+
+
+def unescape(value):
+    return ICS_UNESCAPE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def unfolded_lines(f):
+    """Yield logical lines, joining RFC 5545 continuation lines"""
+    current = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def parse_property(line):
+    """Split ``NAME;PARAM=V:value`` into (name, params, value)"""
+    # The value starts at the first colon that is not inside a quoted parameter
+    in_quotes = False
+    for i, c in enumerate(line):
+        if c == '"':
+            in_quotes = not in_quotes
+        elif c == ":" and not in_quotes:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return None, {}, ""
+
+    name, *param_parts = head.split(";")
+    params = {}
+    for part in param_parts:
+        key, _, val = part.partition("=")
+        params[key.upper()] = val.strip('"')
+    return name.upper(), params, value
+
+
+def iter_events(f):
+    """Yield one dict per VEVENT, holding only the current event in memory"""
+    event = None
+    depth = 0  # VALARM and friends nest inside VEVENT
+    for line in unfolded_lines(f):
+        name, params, value = parse_property(line)
+        if name == "BEGIN":
+            if value.upper() == "VEVENT":
+                event = {}
+            elif event is not None:
+                depth += 1
+        elif name == "END":
+            if value.upper() == "VEVENT" and event is not None:
+                yield event
+                event = None
+            elif event is not None:
+                depth -= 1
+        elif event is not None and depth == 0 and name:
+            if name == "ORGANIZER":
+                event["ORGANIZER_CN"] = params.get("CN", "")
+            elif name == "CATEGORIES":
+                event.setdefault("CATEGORIES", []).extend(
+                    c.strip().lower() for c in unescape(value).split(",") if c.strip()
+                )
+            else:
+                event[name] = unescape(value) if name not in ("DTSTART", "URL") else value
+
+
+def event_date(event):
+    """DTSTART as YYYY-MM-DD, for both DATE and DATE-TIME values"""
+    match = re.match(r"(\d{4})(\d{2})(\d{2})", event.get("DTSTART", ""))
+    return "-".join(match.groups()) if match else None
+
+
+def matches(event, categories, keywords):
+    if categories and not set(categories) & set(event.get("CATEGORIES", [])):
+        return False
+    if keywords:
+        text = f"{event.get('SUMMARY', '')} {event.get('DESCRIPTION', '')}".lower()
+        if not any(keyword in text for keyword in keywords):
+            return False
+    return True
+
+
+def event_to_talk(event, talk_type="Talk"):
+    """Return (filename, markdown) for one event, rendered by talks.py"""
+    title = event.get("SUMMARY", "").strip()
+    date = event_date(event)
+    if not title or not date:
+        return None
+
+    return talk_to_markdown({
+        "title": title,
+        "type": talk_type,
+        "venue": event.get("X-VENUE") or event.get("ORGANIZER_CN", ""),
+        "date": date,
+        "location": event.get("LOCATION", ""),
+        "talk_url": event.get("URL", ""),
+        "description": event.get("DESCRIPTION", "").strip(),
+    })
+
+
+def render_ics(source, categories=(), keywords=(), talk_type="Talk"):
+    """Render a calendar path or file-like object; return list of (filename, markdown)"""
+    categories = [c.lower() for c in categories]
+    keywords = [k.lower() for k in keywords]
+    if not hasattr(source, "read"):
+        with open(source, "r", encoding="utf-8", newline="") as f:
+            return render_ics(f, categories, keywords, talk_type)
+    talks = (event_to_talk(e, talk_type) for e in iter_events(source) if matches(e, categories, keywords))
+    return [talk for talk in talks if talk]
+
+
+def convert_ics_to_talks(ics_path, output_dir, categories=(), keywords=(), talk_type="Talk"):
+    """Stream events from ``ics_path`` into talk files; return the sink used"""
+    categories = [c.lower() for c in categories]
+    keywords = [k.lower() for k in keywords]
+    with OutputSink(output_dir) as sink, open(ics_path, "r", encoding="utf-8", newline="") as f:
+        for event in iter_events(f):
+            if not matches(event, categories, keywords):
+                continue
+            talk = event_to_talk(event, talk_type)
+            if talk is None:
+                print(f"Warning: event {event.get('UID', 'unknown')} has no title or date, skipping...")
+                continue
+            try:
+                sink.write(*talk, source=event.get("UID"))
+            except CollisionError as e:
+                print(f"Warning: {e}")
+                continue
+            print(f"✓ {talk[0]}")
+    return sink
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an iCalendar export to talk markdown files")
+    parser.add_argument("ics_file", help="Path to .ics file")
+    parser.add_argument("--category", "-c", action="append", default=[], help="Only events with this CATEGORIES value (repeatable)")
+    parser.add_argument("--keyword", "-k", action="append", default=[], help="Only events mentioning this keyword (repeatable)")
+    parser.add_argument("--type", default="Talk", help='Talk type written to front matter (default: "Talk")')
+    parser.add_argument(
+        "--output", "-o",
+        default="../_talks/",
+        help="Output directory for markdown files (default: ../_talks/)",
+    )
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.ics_file):
+        print(f"Error: calendar file '{args.ics_file}' not found")
+        sys.exit(1)
+
+    sink = convert_ics_to_talks(args.ics_file, args.output, args.category, args.keyword, args.type)
+    print(f"\nTalks: {sink.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Venue normalization and publication category classification
+
+VENUES lists the venues we know by canonical name, abbreviation, category and
+the spellings they show up under in BibTeX exports. Every spelling, together
+with the generic keywords that hint at a category ("arxiv", "journal",
+"workshop", ...), is compiled once into a single Aho-Corasick automaton, so a
+venue string is classified in one pass over its characters no matter how
+many venues the table holds.
+
+A spelling only identifies a venue when, together with the venue's other
+spellings (typically the abbreviation in parentheses), it covers the whole
+string apart from boilerplate: years, ordinals, volume numbers, publisher
+prefixes and "Proceedings of". "International Conference on Machine
+Learning and Applications (ICMLA)" contains the ICML spelling but is not
+ICML, so it is left alone.
+
+Results are cached per distinct raw venue
+string (bounded, for long-running processes importing the package), since a
+bibliography repeats the same few venues many times.
+
+Only the standard library is used, so this works for
+simple_bibtex_converter.py as well.
+"""
+
+import re
+from collections import deque, namedtuple
+from functools import lru_cache
+
+Venue = namedtuple("Venue", ["abbr", "name", "category", "aliases"])
+
+VENUES = [
+    Venue("ICRA", "IEEE International Conference on Robotics and Automation", "conferences", [
+        "international conference on robotics and automation",
+        "int conf on robotics and automation",
+        "conference on robotics and automation",
+    ]),
+    Venue("IROS", "IEEE/RSJ International Conference on Intelligent Robots and Systems", "conferences", [
+        "international conference on intelligent robots and systems",
+        "int conf on intelligent robots and systems",
+    ]),
+    Venue("CoRL", "Conference on Robot Learning", "conferences", [
+        "conference on robot learning",
+    ]),
+    Venue("RSS", "Robotics: Science and Systems", "conferences", [
+        "robotics science and systems",
+    ]),
+    Venue("HRI", "ACM/IEEE International Conference on Human-Robot Interaction", "conferences", [
+        "international conference on human robot interaction",
+    ]),
+    Venue("ACC", "American Control Conference", "conferences", [
+        "american control conference",
+    ]),
+    Venue("CDC", "IEEE Conference on Decision and Control", "conferences", [
+        "conference on decision and control",
+    ]),
+    Venue("NeurIPS", "Conference on Neural Information Processing Systems", "conferences", [
+        "neural information processing systems", "conference on neural information processing systems", "nips",
+    ]),
+    Venue("ICML", "International Conference on Machine Learning", "conferences", [
+        "international conference on machine learning",
+    ]),
+    Venue("ICLR", "International Conference on Learning Representations", "conferences", [
+        "international conference on learning representations",
+    ]),
+    Venue("AAAI", "AAAI Conference on Artificial Intelligence", "conferences", [
+        "aaai conference on artificial intelligence",
+    ]),
+    Venue("IJCAI", "International Joint Conference on Artificial Intelligence", "conferences", [
+        "international joint conference on artificial intelligence",
+    ]),
+    Venue("AAMAS", "International Conference on Autonomous Agents and Multiagent Systems", "conferences", [
+        "international conference on autonomous agents and multiagent systems",
+        "autonomous agents and multi agent systems",
+    ]),
+    Venue("CVPR", "IEEE/CVF Conference on Computer Vision and Pattern Recognition", "conferences", [
+        "conference on computer vision and pattern recognition",
+    ]),
+    Venue("ICCV", "IEEE/CVF International Conference on Computer Vision", "conferences", [
+        "international conference on computer vision",
+    ]),
+    Venue("ECCV", "European Conference on Computer Vision", "conferences", [
+        "european conference on computer vision",
+    ]),
+    Venue("RA-L", "IEEE Robotics and Automation Letters", "journals", [
+        "robotics and automation letters", "ral", "ra l",
+    ]),
+    Venue("T-RO", "IEEE Transactions on Robotics", "journals", [
+        "transactions on robotics", "tro", "t ro",
+    ]),
+    Venue("T-ASE", "IEEE Transactions on Automation Science and Engineering", "journals", [
+        "transactions on automation science and engineering", "tase", "t ase",
+    ]),
+    Venue("IJRR", "The International Journal of Robotics Research", "journals", [
+        "international journal of robotics research",
+    ]),
+    Venue("AURO", "Autonomous Robots", "journals", [
+        "autonomous robots",
+    ]),
+    Venue("RAS", "Robotics and Autonomous Systems", "journals", [
+        "robotics and autonomous systems",
+    ]),
+    Venue("JFR", "Journal of Field Robotics", "journals", [
+        "journal of field robotics",
+    ]),
+    Venue("TMLR", "Transactions on Machine Learning Research", "journals", [
+        "transactions on machine learning research",
+    ]),
+    Venue("JMLR", "Journal of Machine Learning Research", "journals", [
+        "journal of machine learning research",
+    ]),
+]
+
+# Generic hints, matched anywhere in the text like the old substring checks
+KEYWORDS = {
+    "preprint": ["arxiv", "preprint", "submitted", "under review", "under revision"],
+    "conference": ["conference", "proceedings", "workshop", "symposium"],
+    "journal": ["journal", "transactions", "letters"],
+    "workshop": ["workshop"],
+}
+
+# Words a venue string may carry around its name without naming another venue
+BOILERPLATE = set("""
+    proceedings proc in of the on at advances
+    ieee acm rsj cvf ifac ieeeras ras siam usenix pmlr
+    annual vol volume no number pp pages
+    first second third fourth fifth sixth seventh eighth ninth tenth eleventh twelfth
+    thirteenth fourteenth fifteenth sixteenth seventeenth eighteenth nineteenth
+    twentieth thirtieth fortieth fiftieth twenty thirty forty fifty
+""".split())
+_ORDINAL_OR_NUMBER = re.compile(r"^\d+(st|nd|rd|th)?$")
+
+CONFERENCE_TYPES = {"inproceedings", "conference"}
+JOURNAL_TYPES = {"article", "journal"}
+
+Classification = namedtuple("Classification", ["venue", "hints"])
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_text(text):
+    """Lowercase, collapse punctuation to single spaces and pad with spaces"""
+    return " " + _NON_ALNUM.sub(" ", text.lower()).strip() + " "
+
+
+class Automaton:
+    """Aho-Corasick automaton over characters"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pattern, value in patterns:
+            self._add(pattern, value)
+        self._link()
+
+    def _add(self, pattern, value):
+        state = 0
+        for c in pattern:
+            if c not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.goto[state][c] = len(self.goto) - 1
+            state = self.goto[state][c]
+        self.out[state].append(value)
+
+    def _link(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and c not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(c, 0)
+                self.out[child] = self.out[child] + self.out[self.fail[child]]
+
+    def search(self, text):
+        """Yield (end index, value) for every pattern occurrence in ``text``"""
+        state = 0
+        for i, c in enumerate(text):
+            while state and c not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(c, 0)
+            for value in self.out[state]:
+                yield i, value
+
+
+def _compile():
+    patterns = []
+    for venue in VENUES:
+        # Venue spellings must match whole words, so they are space padded
+        for alias in [venue.abbr] + venue.aliases:
+            pattern = normalize_text(alias)
+            patterns.append((pattern, ("venue", (len(pattern), venue))))
+    for hint, words in KEYWORDS.items():
+        for word in words:
+            patterns.append((normalize_text(word).strip(), ("hint", hint)))
+    return Automaton(patterns)
+
+
+AUTOMATON = _compile()
+
+
+def _is_boilerplate(word):
+    return word in BOILERPLATE or bool(_ORDINAL_OR_NUMBER.match(word))
+
+
+def _covers_whole_venue(text, spans):
+    """True if the spans leave nothing but boilerplate words of ``text`` uncovered"""
+    covered = bytearray(len(text))
+    for start, end in spans:
+        covered[start:end] = b"\x01" * (end - start)
+    rest = "".join(" " if covered[i] else c for i, c in enumerate(text))
+    return all(_is_boilerplate(word) for word in rest.split())
+
+
+@lru_cache(maxsize=4096)
+def classify(raw_venue):
+    """Return the known venue and the category hints in ``raw_venue``.
+
+    The venue is the one with the longest matching spelling, provided its
+    spellings cover the whole string up to boilerplate; otherwise None.
+    """
+    text = normalize_text(raw_venue or "")
+    best, best_len, hints = None, 0, set()
+    spans = {}
+    for end, (kind, value) in AUTOMATON.search(text):
+        if kind == "hint":
+            hints.add(value)
+            continue
+        length, venue = value
+        spans.setdefault(venue.abbr, []).append((end + 1 - length, end + 1))
+        if length > best_len:
+            best_len, best = value
+    if best is not None and not _covers_whole_venue(text, spans[best.abbr]):
+        best = None
+    return Classification(best, frozenset(hints))
+
+
+def categorize(entry_type, raw_venue):
+    """Publication category for an entry, preferring what the venue tells us"""
+    entry_type = (entry_type or "").lower()
+    venue, hints = classify(raw_venue or "")
+
+    if "preprint" in hints:
+        return "manuscripts"
+    if venue is not None:
+        return venue.category
+    if entry_type in CONFERENCE_TYPES:
+        return "conferences"
+    if entry_type in JOURNAL_TYPES:
+        return "journals"
+    if "conference" in hints:
+        return "conferences"
+    if "journal" in hints:
+        return "journals"
+    return "manuscripts"
+
+
+def normalize_venue(raw_venue, year=None):
+    """Canonical "Name (ABBR), year" for known venues; anything else is returned as is.
+
+    Workshops are left alone, since they only borrow the name of the main
+    conference.
+    """
+    venue, hints = classify(raw_venue or "")
+    if venue is None or "workshop" in hints or "preprint" in hints:
+        return raw_venue
+    normalized = f"{venue.name} ({venue.abbr})"
+    return f"{normalized}, {year}" if year else normalized
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Minify and precompress the generated site
+
+Run after ``jekyll build`` and prune_css.py, and before fingerprint_assets.py,
+so the fingerprinted copies are made of the minified files. Replaces _layouts/compress.html, which minified
+every page in Liquid one string operation at a time. Each HTML, CSS and JS
+file in _site is minified in a process pool and written back, together
+with .gz and (when the brotli package is installed) .br siblings for servers
+that serve precompressed files.
+
+    HTML  whitespace collapsed and trimmed around block-level tags, like
+          compress.html's ``clippings: all``; <pre>, <code>, <textarea>
+          and <script> are left untouched, <style> is minified as CSS
+    CSS   comments (except /*! ... */) and insignificant whitespace removed
+    JS    conservative: blank lines, indentation and whole-line // comments
+          removed outside strings and template literals; a file the
+          scanner cannot follow is left as it is, and files already named
+          *.min.js are only compressed
+
+Files fingerprint_assets.py has written (the names in
+_site/assets/manifest.json) are never rewritten, since their names are the
+hash of their content; they are only compressed. Running this script again
+after fingerprint_assets.py thus precompresses those copies and the pages
+it rewrote, and takes everything else from the cache.
+
+Results are cached in .build-cache/minify/ by the hash of the input file,
+so unchanged files are copied from the cache rather than processed again.
+Entries no file has used for CACHE_MAX_AGE are removed.
+
+Usage:
+    python3 minify_site.py
+    python3 minify_site.py --jobs 4 --site path/to/_site
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from build_utils import CACHE_DIR, SITE_DIR, content_hash
+
+MINIFY_CACHE = CACHE_DIR / "minify"
+MINIFIER_VERSION = "2"  # bump when a minifier changes so cached output is not reused
+MINIFY_EXTENSIONS = {".html", ".css", ".js"}
+COMPRESS_EXTENSIONS = MINIFY_EXTENSIONS | {".xml", ".json", ".svg", ".txt", ".ico"}
+MIN_COMPRESS_SIZE = 256  # smaller files are not worth a second request path
+CACHE_MAX_AGE = 30 * 24 * 3600  # seconds an unused cache entry is kept
+
+BLOCK_TAGS = (
+    "html head title base link meta style body article section nav aside h1 h2 h3 h4 h5 h6 hgroup "
+    "header footer address p hr blockquote ol ul li dl dt dd figure figcaption main div table caption "
+    "colgroup col tbody thead tfoot tr td th"
+).split()
+
+PROTECTED = re.compile(r"(<(pre|code|textarea|script)\b.*?</\2\s*>)", re.I | re.S)
+STYLE_BLOCK = re.compile(r"(<style\b[^>]*>)(.*?)(</style\s*>)", re.I | re.S)
+WHITESPACE = re.compile(r"\s+")
+CLIPPING = re.compile(r"\s*(</?(?:%s)\b[^>]*>)\s*" % "|".join(BLOCK_TAGS), re.I)
+
+CSS_TOKENS = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*!.*?\*/)|/\*.*?\*/""", re.S)
+CSS_SPACES = re.compile(r"\s*([{};,>])\s*")
+DECLARATIONS = re.compile(r"\{[^{}]*\}")
+JS_LINE_COMMENT = re.compile(r"^//(?!#)")
+JS_SPECIAL = re.compile(r"""[`'"/{}]""")
+JS_WORD = re.compile(r"[\w$]+$")
+# After these a "/" starts a regular expression, not a division
+JS_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+JS_REGEX_KEYWORDS = {"return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw", "case", "do", "else", "yield", "await"}
+MANIFEST = "assets/manifest.json"  # written by fingerprint_assets.py
+
+
+def minify_css(text):
+    # Strings and /*! license */ comments are kept verbatim, other comments dropped
+    kept = []
+
+    def keep(match):
+        if match.group(1) is None:
+            return " "
+        kept.append(match.group(1))
+        return f"\0{len(kept) - 1}\0"
+
+    text = CSS_TOKENS.sub(keep, text)
+    text = WHITESPACE.sub(" ", text)
+    text = CSS_SPACES.sub(r"\1", text)
+    # Outside declaration blocks a space before ":" is a descendant combinator (a :hover)
+    text = DECLARATIONS.sub(lambda m: re.sub(r"\s*:\s*", ":", m.group(0)), text)
+    text = re.sub(r":\s+", ":", text).replace(";}", "}").strip()
+    return re.sub(r"\0(\d+)\0", lambda m: kept[int(m.group(1))], text)
+
+
+def js_lines(text):
+    """Yield (line, starts in code, ends in code) for each line of a script
+
+    "In code" means outside string, template literal and regular expression
+    literals, where leading and trailing whitespace can go. Returns None if
+    the script ends inside one of them, i.e. the scanner lost track.
+    """
+    mode = "code"  # code, block (comment), string, template, regex
+    quote = ""
+    braces = []  # open { inside each ${...} of the enclosing template literals
+    previous = ""  # last significant code character, for regex detection
+    word = ""  # the identifier or keyword ending at ``previous``
+    result = []
+    for line in text.splitlines():
+        starts_in_code = mode in ("code", "block")
+        i, escaped = 0, False
+        while i < len(line):
+            c = line[i]
+            if mode == "block":
+                end = line.find("*/", i)
+                if end == -1:
+                    break
+                mode, i = "code", end + 2
+                continue
+            if mode in ("string", "template", "regex"):
+                if escaped:
+                    escaped = False
+                elif c == "\\":
+                    escaped = True
+                elif mode == "string" and c == quote:
+                    mode, previous, word = "code", quote, ""
+                elif mode == "template" and c == "`":
+                    mode, previous, word = "code", "`", ""
+                elif mode == "template" and line.startswith("${", i):
+                    mode = "code"
+                    braces.append(0)
+                    previous, word = "{", ""
+                    i += 1
+                elif mode == "regex" and c == "[" and quote != "[":
+                    quote = "["  # inside a character class "/" does not end the regex
+                elif mode == "regex" and c == "]" and quote == "[":
+                    quote = ""
+                elif mode == "regex" and c == "/" and quote != "[":
+                    mode, previous, word = "code", ")", ""  # a regex is followed by an operator
+                i += 1
+                continue
+            # Code: jump to the next character that can change the mode
+            match = JS_SPECIAL.search(line, i)
+            skipped = line[i:match.start() if match else len(line)].rstrip()
+            if skipped:
+                previous = skipped[-1]
+                tail = JS_WORD.search(skipped)
+                word = tail.group(0) if tail else ""
+            if not match:
+                break
+            i = match.start()
+            c = line[i]
+            if c in "'\"":
+                mode, quote = "string", c
+            elif c == "`":
+                mode = "template"
+            elif line.startswith("//", i):
+                break
+            elif line.startswith("/*", i):
+                mode, i = "block", i + 1
+            elif c == "/":
+                if previous in JS_REGEX_PRECEDERS or previous == "" or word in JS_REGEX_KEYWORDS:
+                    mode, quote = "regex", ""
+                else:
+                    previous, word = c, ""
+            elif c == "{" and braces:
+                braces[-1] += 1
+                previous, word = c, ""
+            elif c == "}" and braces:
+                if braces[-1]:
+                    braces[-1] -= 1
+                    previous, word = c, ""
+                else:
+                    braces.pop()
+                    mode = "template"
+            else:
+                previous, word = c, ""
+            i += 1
+        if mode == "regex" or (mode == "string" and not escaped):
+            return None  # neither continues past the end of a line
+        result.append((line, starts_in_code, mode in ("code", "block")))
+    if mode != "code" or braces:
+        return None
+    return result
+
+
+def minify_js(text):
+    scanned = js_lines(text)
+    if scanned is None:
+        return text
+    lines = []
+    for line, starts_in_code, ends_in_code in scanned:
+        if starts_in_code:
+            line = line.lstrip()
+        if ends_in_code:
+            line = line.rstrip()
+        if starts_in_code and ends_in_code and (not line or JS_LINE_COMMENT.match(line)):
+            continue
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+def minify_html(text):
+    parts = PROTECTED.split(text)
+    out = []
+    # split() with two groups yields: text, block, tag name, text, block, tag name, ...
+    for i in range(0, len(parts), 3):
+        chunk = STYLE_BLOCK.sub(lambda m: m.group(1) + minify_css(m.group(2)) + m.group(3), parts[i])
+        chunk = WHITESPACE.sub(" ", chunk)
+        out.append(CLIPPING.sub(r"\1", chunk))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return "".join(out).strip() + "\n"
+
+
+MINIFIERS = {".html": minify_html, ".css": minify_css, ".js": minify_js}
+
+
+def minify(path, data):
+    if path.suffix not in MINIFIERS or path.name.endswith(".min.js") or path.name.endswith(".min.css"):
+        return data
+    text = data.decode("utf-8", "surrogateescape")
+    return MINIFIERS[path.suffix](text).encode("utf-8", "surrogateescape")
+
+
+def compressed_variants(path, data):
+    """{suffix: bytes} of the precompressed siblings worth writing"""
+    if path.suffix not in COMPRESS_EXTENSIONS or len(data) < MIN_COMPRESS_SIZE:
+        return {}
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    return {suffix: blob for suffix, blob in variants.items() if len(blob) < len(data)}
+
+
+def atomic_write(path, data):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def process(path, fingerprinted=False):
+    """Minify and compress one file, through the cache; return (bytes in, bytes out, cached)
+
+    A fingerprinted copy is only compressed: its name is the hash of its content.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    kind = "copy" if fingerprinted else path.suffix
+    key = content_hash(MINIFIER_VERSION + kind + ("br" if brotli else "")) + content_hash(data)
+    entry = MINIFY_CACHE / key
+    cached = entry.is_dir()
+
+    if not cached:
+        output = data if fingerprinted else minify(path, data)
+        tmp = Path(tempfile.mkdtemp(dir=MINIFY_CACHE, prefix=".tmp-"))
+        (tmp / "out").write_bytes(output)
+        for suffix, blob in compressed_variants(path, output).items():
+            (tmp / f"out{suffix}").write_bytes(blob)
+        try:
+            tmp.rename(entry)
+        except OSError:  # another worker cached the same input first
+            shutil.rmtree(tmp)
+
+    os.utime(entry)  # marks the entry as used, see main()
+    output = (entry / "out").read_bytes()
+    if output != data:
+        atomic_write(path, output)
+    for suffix in (".gz", ".br"):
+        sibling = path.with_name(path.name + suffix)
+        blob = entry / f"out{suffix}"
+        if blob.is_file():
+            blob_data = blob.read_bytes()
+            if not sibling.is_file() or sibling.read_bytes() != blob_data:
+                atomic_write(sibling, blob_data)
+        elif sibling.is_file():
+            sibling.unlink()
+    return len(data), len(output), cached
+
+
+def site_files(site_dir):
+    for path in sorted(site_dir.rglob("*")):
+        if path.is_file() and path.suffix in COMPRESS_EXTENSIONS:
+            yield path
+
+
+def fingerprinted_files(site_dir):
+    """Paths of the copies fingerprint_assets.py has written, from its manifest"""
+    try:
+        with open(site_dir / MANIFEST, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    return {str(site_dir / relpath) for relpath in manifest.values()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minify and precompress the generated site")
+    parser.add_argument("--site", type=Path, default=SITE_DIR, help="Generated site directory (default: _site)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    if not args.site.is_dir():
+        print(f"✗ {args.site} not found; run jekyll build first")
+        sys.exit(1)
+    if brotli is None:
+        print("➖ brotli not installed, writing .gz only. Install with: pip install brotli")
+
+    MINIFY_CACHE.mkdir(parents=True, exist_ok=True)
+    files = [str(path) for path in site_files(args.site)]
+    copies = fingerprinted_files(args.site)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(process, files, [f in copies for f in files], chunksize=16))
+
+    before = sum(r[0] for r in results)
+    after = sum(r[1] for r in results)
+    reused = sum(1 for r in results if r[2])
+
+    # Entries of files that have not been built for a while
+    cutoff = time.time() - CACHE_MAX_AGE
+    for entry in MINIFY_CACHE.iterdir():
+        if entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry)
+    print(f"✓ {len(results)} files ({reused} from cache): {before:,} → {after:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
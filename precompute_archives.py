@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Precompute news and blog archive data
+
+_pages/about.md sorts _data/news.yml, and the year, tag and category
+archives regroup every post, in Liquid on every build. This script does that
+work once and writes the results as data files under _data/archive/:
+
+    posts.yml       one record per post, keyed by id, with the fields
+                    _includes/archive-single.html reads
+    news.yml        news items newest first, and their total
+    years.yml       posts grouped by year, newest first
+    tags.yml        posts grouped by tag, tags in alphabetical order
+    categories.yml  posts grouped by category, likewise
+
+Groups only hold post ids, so the templates do one hash lookup per listed
+post. Posts dated after today are left out, as generate_sitemap.py leaves
+them out of the sitemap and feeds (build_utils.is_future). Posts are
+re-parsed only when their file changed, and a file is rewritten only when
+its content changed.
+
+Usage:
+    python3 precompute_archives.py
+"""
+
+import re
+from collections import defaultdict
+
+import frontmatter
+import yaml
+
+from build_utils import CACHE_DIR, SITE_ROOT, file_hash, is_future, load_json, save_json
+
+POSTS_DIR = SITE_ROOT / "_posts"
+NEWS_FILE = SITE_ROOT / "_data" / "news.yml"
+ARCHIVE_DIR = SITE_ROOT / "_data" / "archive"
+CACHE_FILE = CACHE_DIR / "archive_posts.json"
+
+POST_FILENAME = re.compile(r"^(\d{4})-(\d{2})-(\d{2})-(.+)\.(md|markdown|html)$")
+POST_FIELDS = ["title", "venue", "citation", "paperurl", "header"]
+
+
+def slugify(text):
+    """Match Jekyll's default slugify filter"""
+    return re.sub(r"[^\w]+|_+", "-", str(text).lower()).strip("-")
+
+
+def as_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return value.split()
+    return [str(v) for v in value]
+
+
+def first_paragraph(content):
+    """Jekyll's default excerpt: everything up to the first blank line"""
+    return content.strip().split("\n\n", 1)[0].strip()
+
+
+def post_url(metadata, slug):
+    """Resolve a post URL the way _config.yml's ``permalink: /:categories/:title/`` does"""
+    if metadata.get("permalink"):
+        return str(metadata["permalink"])
+    categories = as_list(metadata.get("categories") or metadata.get("category"))
+    parts = [slugify(c) for c in categories] + [slug]
+    return "/" + "/".join(parts) + "/"
+
+
+def load_post(filepath):
+    """Build the archive record for one post, or None if it is not published"""
+    match = POST_FILENAME.match(filepath.name)
+    if not match:
+        return None
+
+    post = frontmatter.load(filepath)
+    metadata = post.metadata
+    if metadata.get("published") is False:
+        return None
+
+    year, month, day, slug = match.group(1, 2, 3, 4)
+    date = metadata.get("date") or f"{year}-{month}-{day}"
+    date = str(date)[:10]
+
+    record = {field: metadata[field] for field in POST_FIELDS if metadata.get(field)}
+    record["id"] = f"/{year}/{month}/{day}/{slug}"
+    record["date"] = date
+    record["url"] = post_url(metadata, slug)
+    record["excerpt"] = str(metadata.get("excerpt") or first_paragraph(post.content))
+    record["tags"] = as_list(metadata.get("tags"))
+    record["categories"] = as_list(metadata.get("categories") or metadata.get("category"))
+    return record
+
+
+def load_posts(posts_dir, cache):
+    """Load every post, reusing cached records for files that have not changed"""
+    records = {}
+    for filepath in sorted(posts_dir.glob("*")):
+        if not filepath.is_file():
+            continue
+        source = file_hash(filepath)
+        cached = cache.get(filepath.name)
+        if cached and cached["source"] == source:
+            record = cached["record"]
+        else:
+            record = load_post(filepath)
+            cache[filepath.name] = {"source": source, "record": record}
+        if record:
+            records[filepath.name] = record
+
+    for name in list(cache):
+        if name not in records and not (posts_dir / name).is_file():
+            del cache[name]
+    return list(records.values())
+
+
+def group_posts(posts, key, order_desc=False):
+    """Group post ids by ``key(post)``, keeping posts newest first within a group"""
+    groups = defaultdict(list)
+    for post in posts:
+        for name in key(post):
+            groups[name].append(post["id"])
+
+    names = sorted(groups, reverse=order_desc)
+    return [
+        {"name": name, "slug": slugify(name), "count": len(groups[name]), "ids": groups[name]}
+        for name in names
+    ]
+
+
+def sorted_news(news_file):
+    with open(news_file, "r", encoding="utf-8") as f:
+        items = yaml.safe_load(f) or []
+    items.sort(key=lambda item: str(item.get("date", "")), reverse=True)
+    return {"total": len(items), "items": items}
+
+
+def write_shard(name, data, archive_dir):
+    """Write a data file only if it differs from what is already there"""
+    path = archive_dir / f"{name}.yml"
+    text = yaml.safe_dump(data, sort_keys=True, allow_unicode=True)
+    if path.is_file() and path.read_text(encoding="utf-8") == text:
+        return False
+    path.write_text(text, encoding="utf-8")
+    return True
+
+
+def precompute(posts_dir=POSTS_DIR, news_file=NEWS_FILE, archive_dir=ARCHIVE_DIR, cache_file=CACHE_FILE):
+    """Refresh every data file; return the names of the files that were rewritten"""
+    cache = load_json(cache_file)
+    posts = [post for post in load_posts(posts_dir, cache) if not is_future(post["date"])]
+    # Same order as site.posts iterated in Liquid: newest first
+    posts.sort(key=lambda post: (post["date"], post["id"]), reverse=True)
+
+    shards = {
+        "posts": {post["id"]: post for post in posts},
+        "years": group_posts(posts, lambda post: [post["date"][:4]], order_desc=True),
+        "tags": group_posts(posts, lambda post: post["tags"]),
+        "categories": group_posts(posts, lambda post: post["categories"]),
+    }
+    if news_file.is_file():
+        shards["news"] = sorted_news(news_file)
+
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    changed = [name for name, data in shards.items() if write_shard(name, data, archive_dir)]
+    save_json(cache_file, cache)
+    return changed
+
+
+def main():
+    changed = precompute()
+    if changed:
+        print(f"✓ Updated: {', '.join(changed)}")
+    else:
+        print("➖ Archive data already up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Precompute content statistics for every page and document
+
+_includes/read-time.html counts the words of a page with
+``content | strip_html | number_of_words`` every time it is included, and
+archive listings include it once per item. This script does the text
+processing once per changed file and writes _data/content_stats.yml, keyed
+by the document path (``page.path`` / ``post.path`` in Liquid):
+
+    words    word count of the text, markup removed
+    minutes  words / words_per_minute from _config.yml
+    excerpt  first paragraph as plain text
+    toc      headings as {level, text, id}, ids as kramdown's auto_ids makes them
+
+The count is taken on the Markdown source with markup stripped rather than
+on the rendered HTML, so it can differ from Liquid's by a few words.
+
+Results are cached by content hash in .build-cache/, and the data file is
+rewritten only when a statistic changed.
+
+Usage:
+    python3 precompute_content_stats.py
+"""
+
+import re
+
+import frontmatter
+import yaml
+
+from build_utils import CACHE_DIR, SITE_ROOT, file_hash, load_json, save_json
+from precompute_archives import first_paragraph
+
+CONFIG_FILE = SITE_ROOT / "_config.yml"
+STATS_FILE = SITE_ROOT / "_data" / "content_stats.yml"
+CACHE_FILE = CACHE_DIR / "content_stats.json"
+EXTENSIONS = {".md", ".markdown", ".html"}
+DEFAULT_WPM = 200
+STATS_VERSION = "1"  # bump when the statistics below are computed differently
+
+FENCE = re.compile(r"^(```|~~~)")
+ATX_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+SETEXT_UNDERLINE = re.compile(r"^(=+|-+)\s*$")
+HEADING_ID = re.compile(r"\s*\{:?\s*#([\w-]+)[^}]*\}\s*$")
+
+MARKUP = [
+    (re.compile(r"\{%.*?%\}|\{\{.*?\}\}", re.S), " "),  # Liquid
+    (re.compile(r"<!--.*?-->", re.S), " "),
+    (re.compile(r"<[^>]+>"), " "),  # HTML tags
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),  # images keep their alt text
+    (re.compile(r"\[([^\]]*)\]\([^)]*\)"), r"\1"),  # links keep their text
+    (re.compile(r"\[([^\]]*)\]\[[^\]]*\]"), r"\1"),
+    (re.compile(r"^\s*\[[^\]]+\]:\s+\S+.*$", re.M), " "),  # link definitions
+    (re.compile(r"\{:[^}]*\}"), " "),  # kramdown attribute lists
+    (re.compile(r"^\s{0,3}(#{1,6}|>|[-*+]|\d+\.)\s+", re.M), " "),
+    (re.compile(r"^\s*(```|~~~).*$", re.M), " "),
+    (re.compile(r"^\s*([=\-*_|:]\s*){3,}$", re.M), " "),  # rules, setext underlines, table borders
+    (re.compile(r"[*_`|]+"), " "),
+]
+
+
+def strip_markup(text):
+    for pattern, replacement in MARKUP:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def count_words(text):
+    """Words as Liquid's number_of_words counts them: whitespace separated runs"""
+    return len(strip_markup(text).split())
+
+
+def heading_id(text, used):
+    """The id kramdown's auto_ids gives a heading, made unique like kramdown does"""
+    slug = re.sub(r"^[^a-zA-Z]+", "", text)
+    slug = re.sub(r"[^a-zA-Z0-9 -]", "", slug).replace(" ", "-").lower() or "section"
+    if slug in used:
+        used[slug] += 1
+        return f"{slug}-{used[slug]}"
+    used[slug] = 0
+    return slug
+
+
+def headings(content):
+    """Collect ATX and setext headings outside fenced code blocks"""
+    toc, used = [], {}
+    in_fence = False
+    previous = ""
+    for line in content.splitlines():
+        if FENCE.match(line.strip()):
+            in_fence = not in_fence
+            previous = ""
+            continue
+        if in_fence:
+            continue
+
+        level, text = None, None
+        atx = ATX_HEADING.match(line)
+        if atx:
+            level, text = len(atx.group(1)), atx.group(2)
+        elif previous.strip() and SETEXT_UNDERLINE.match(line) and not previous.startswith((" ", "\t", "-", "*", "|")):
+            level, text = (1 if line.startswith("=") else 2), previous.strip()
+
+        if level:
+            explicit = HEADING_ID.search(text)
+            text = HEADING_ID.sub("", text)
+            plain = " ".join(strip_markup(text).split())
+            toc.append({
+                "level": level,
+                "text": plain,
+                "id": explicit.group(1) if explicit else heading_id(plain, used),
+            })
+            previous = ""
+        else:
+            previous = line
+    return toc
+
+
+def compute_stats(path):
+    post = frontmatter.load(path)
+    content = post.content
+    excerpt = post.metadata.get("excerpt") or first_paragraph(content)
+    return {
+        "words": count_words(content),
+        "excerpt": " ".join(strip_markup(str(excerpt)).split()),
+        "toc": headings(content) if path.suffix != ".html" else [],
+    }
+
+
+def documents(config):
+    """Yield every page, post and collection document, with or without output"""
+    dirs = ["_pages", "_posts", "_drafts"] + [f"_{label}" for label in (config.get("collections") or {})]
+    for name in dict.fromkeys(dirs):
+        for path in sorted((SITE_ROOT / name).rglob("*")):
+            if path.is_file() and path.suffix in EXTENSIONS:
+                yield path
+
+
+def precompute():
+    """Refresh _data/content_stats.yml; return True if it was rewritten"""
+    with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+        config = yaml.safe_load(f) or {}
+    wpm = config.get("words_per_minute") or DEFAULT_WPM
+
+    cache = load_json(CACHE_FILE)
+    stats = {}
+    for path in documents(config):
+        relpath = path.relative_to(SITE_ROOT).as_posix()
+        source = STATS_VERSION + file_hash(path)
+        cached = cache.get(relpath)
+        if cached and cached["source"] == source:
+            record = cached["stats"]
+        else:
+            record = compute_stats(path)
+            cache[relpath] = {"source": source, "stats": record}
+        stats[relpath] = dict(record, minutes=record["words"] // wpm)
+
+    for relpath in list(cache):
+        if relpath not in stats:
+            del cache[relpath]
+
+    text = yaml.safe_dump(stats, sort_keys=True, allow_unicode=True)
+    changed = not (STATS_FILE.is_file() and STATS_FILE.read_text(encoding="utf-8") == text)
+    if changed:
+        STATS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        STATS_FILE.write_text(text, encoding="utf-8")
+    save_json(CACHE_FILE, cache)
+    return changed
+
+
+def main():
+    if precompute():
+        print(f"✓ Updated: {STATS_FILE.relative_to(SITE_ROOT)}")
+    else:
+        print("➖ Content statistics already up to date")
+
+
+if __name__ == "__main__":
+    main()
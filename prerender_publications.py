@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Prerender publication cards
+
+Renders every publication in _publications/ to the same HTML that
+_includes/custom-publication.html produces and stores it as
+_includes/publication-cards/<hash>.html, where the hash covers the front
+matter the card uses plus TEMPLATE_VERSION. _data/publication_cards.yml maps
+each publication to its fragment, and _pages/publications.html includes the
+fragment instead of rendering the card in Liquid.
+
+Only cards whose record changed are rendered again; fragments that are no
+longer referenced are removed. Bump TEMPLATE_VERSION whenever the markup
+below changes.
+
+Usage:
+    python3 prerender_publications.py
+"""
+
+import html
+import os
+
+import frontmatter
+import yaml
+
+from build_utils import CACHE_DIR, SITE_ROOT, content_hash, file_hash, load_json, save_json
+
+PUBLICATION_DIR = SITE_ROOT / "_publications"
+CARD_DIR = SITE_ROOT / "_includes" / "publication-cards"
+CARD_INDEX = SITE_ROOT / "_data" / "publication_cards.yml"
+CACHE_FILE = CACHE_DIR / "publication_cards.json"
+DEFAULT_TEASER_PATH = "/images/default-thumbnail.png"
+TEMPLATE_VERSION = "1"
+
+CARD_FIELDS = ["title", "authors", "venue", "header", "buttons"]
+
+BUTTON_LABELS = {
+    "paper": ("fas fa-file-pdf", "Paper"),
+    "video": ("fas fa-video", "Video"),
+    "code": ("fas fa-code", "Code"),
+    "website": ("fas fa-globe", "Website"),
+    "presentation": ("fas fa-chalkboard-teacher", "Presentation"),
+}
+
+
+def card_record(metadata):
+    """The subset of front matter that affects the rendered card"""
+    return {field: metadata.get(field) for field in CARD_FIELDS}
+
+
+def card_key(record):
+    """Fragment name for a record under the current template version"""
+    payload = yaml.safe_dump(record, sort_keys=True, allow_unicode=True, default_flow_style=True)
+    return content_hash(TEMPLATE_VERSION + payload)
+
+
+def render_card(record):
+    """Render a card exactly like _includes/custom-publication.html.
+
+    Like the Liquid template, text fields are emitted as-is because authors
+    and venues may contain markup such as <u> and <sup>.
+    """
+    header = record.get("header") or {}
+    teaser = header.get("teaser") if isinstance(header, dict) else None
+    title = record.get("title") or ""
+
+    lines = [
+        '<div class="pub-item">',
+        '  <div class="pub-item__thumb">',
+        f'    <img src="{teaser or DEFAULT_TEASER_PATH}" alt="{title}">',
+        "  </div>",
+        '  <div class="pub-item__body">',
+        f'    <h3 class="pub-item__title">{title}</h3>',
+    ]
+
+    if record.get("authors"):
+        lines.append(f'    <p class="pub-item__authors">{record["authors"]}</p>')
+    if record.get("venue"):
+        lines.append(f'    <p class="pub-item__venue">{record["venue"]}</p>')
+
+    buttons = record.get("buttons") or []
+    if buttons:
+        lines.append('    <p class="pub-item__links">')
+        for button in buttons:
+            icon, label = BUTTON_LABELS.get(button.get("type"), (None, None))
+            inner = f'<i class="{icon}"></i> <span>{label}</span>' if icon else ""
+            url = html.escape(str(button.get("url", "")), quote=True)
+            lines.append(f'      <a class="pub-button" href="{url}" target="_blank">{inner}</a>')
+        lines.append("    </p>")
+
+    lines += ["  </div>", "</div>", ""]
+    return "\n".join(lines)
+
+
+def prerender(publication_dir=PUBLICATION_DIR, card_dir=CARD_DIR, index_file=CARD_INDEX,
+              cache_file=CACHE_FILE):
+    """Bring the card fragments and their index up to date; return (rendered, total)"""
+    cache = load_json(cache_file)
+    card_dir.mkdir(parents=True, exist_ok=True)
+    index = {}
+    rendered = 0
+
+    for filepath in sorted(publication_dir.glob("*.md")):
+        rel = filepath.relative_to(publication_dir.parent).as_posix()
+        # The template version is part of it, so a bump renders every card again
+        source = content_hash(TEMPLATE_VERSION + file_hash(filepath))
+        cached = cache.get(rel, {})
+
+        # Unchanged source and template, fragment still on disk: no need to even parse it
+        if cached.get("source") == source and (card_dir / cached.get("card", "")).is_file():
+            index[rel] = cached["card"]
+            continue
+
+        record = card_record(frontmatter.load(filepath).metadata)
+        card = f"{card_key(record)}.html"
+        if not (card_dir / card).is_file():
+            with open(card_dir / card, "w", encoding="utf-8") as f:
+                f.write(render_card(record))
+            rendered += 1
+            print(f"✓ Rendered: {filepath.name}")
+
+        cache[rel] = {"source": source, "card": card}
+        index[rel] = card
+
+    live = set(index.values())
+    for stale in card_dir.glob("*.html"):
+        if stale.name not in live:
+            os.remove(stale)
+    cache = {rel: entry for rel, entry in cache.items() if rel in index}
+
+    new_index = yaml.safe_dump(index, sort_keys=True, allow_unicode=True)
+    if not index_file.is_file() or index_file.read_text(encoding="utf-8") != new_index:
+        index_file.write_text(new_index, encoding="utf-8")
+
+    save_json(cache_file, cache)
+    return rendered, len(index)
+
+
+def main():
+    rendered, total = prerender()
+    print(f"\n{rendered} of {total} publication cards rendered, {total - rendered} up to date")
+
+
+if __name__ == "__main__":
+    main()
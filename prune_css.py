@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Remove unused rules from the compiled stylesheet
+
+Run after ``jekyll build``. assets/css/main.scss pulls in all of
+_sass/vendor/ (font-awesome, susy, breakpoint, magnific-popup), while the
+site uses a small part of it. This script collects every element, class and
+id that appears in _site/**/*.html, plus every word in a string literal of
+_site/**/*.js (classes added at runtime usually appear there), and drops each
+selector of _site/assets/css/main.css that needs something outside that set.
+Rules left without selectors are removed, as are @media blocks left empty.
+@font-face, @keyframes and other at-rules are kept as they are.
+
+Classes that only come into existence at runtime and never appear literally
+are kept by SAFELIST patterns; add more with --safelist.
+
+With --critical, the rules needed by the start of each layout's pages (the
+first CRITICAL_BYTES of <body>) are also written to
+_site/assets/css/critical/<layout>.css and inlined into the <head> of those
+pages, and main.css is then loaded without blocking rendering. Pages are
+grouped by the data-layout attribute _layouts/default.html puts on <body>.
+Relative url() references (fonts in @font-face, background images) are
+rewritten against main.css's own URL, since inlined they would otherwise
+resolve against the page.
+
+Run it before minify_site.py and fingerprint_assets.py.
+
+Usage:
+    python3 prune_css.py
+    python3 prune_css.py --safelist '^tooltip' --critical
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from urllib.parse import urljoin
+
+from build_utils import SITE_DIR
+
+STYLESHEET = "assets/css/main.css"
+CRITICAL_DIR = "assets/css/critical"
+CRITICAL_BYTES = 14 * 1024  # roughly what arrives in the first round trip
+
+SAFELIST = [
+    r"^is-", r"^is--", r"^js$", r"^no-js$", r"^mfp-", r"^greedy-nav", r"^hidden$",
+    r"^visually-hidden$", r"^fitvids", r"^active$", r"^open$", r"^close$",
+]
+
+TAG = re.compile(r"<([a-zA-Z][\w-]*)")
+CLASS_ATTR = re.compile(r"""\bclass\s*=\s*(["'])(.*?)\1""", re.I | re.S)
+ID_ATTR = re.compile(r"""\bid\s*=\s*(["'])(.*?)\1""", re.I | re.S)
+STRING_LITERAL = re.compile(r""""((?:\\.|[^"\\\n])*)"|'((?:\\.|[^'\\\n])*)'""")
+WORD = re.compile(r"[\w-]+")
+LAYOUT_ATTR = re.compile(r"""<body\b[^>]*\bdata-layout\s*=\s*(["'])(.*?)\1""", re.I)
+BODY_START = re.compile(r"<body\b", re.I)
+
+COMMENT = re.compile(r"/\*.*?\*/", re.S)
+CHARSET = re.compile(r"@charset[^;]*;\s*")
+ATTRIBUTE_SELECTOR = re.compile(r"\[[^\]]*\]")
+PSEUDO = re.compile(r"::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?")
+CLASS_SELECTOR = re.compile(r"\.((?:\\.|[\w-])+)")
+ID_SELECTOR = re.compile(r"#((?:\\.|[\w-])+)")
+COMBINATOR = re.compile(r"[\s>+~]+")
+CSS_URL = re.compile(r"""(url\(\s*)(["']?)([^"')]+)\2(\s*\))""")
+ABSOLUTE_URL = re.compile(r"^(?:[a-z][a-z0-9+.-]*:|/|#)", re.I)
+GROUPING_AT_RULES = ("@media", "@supports", "@document", "@layer")
+
+
+class UsedNames:
+    """Element names, classes and ids found in the generated site"""
+
+    def __init__(self, safelist=()):
+        self.tags = {"html", "body"}
+        self.classes = set()
+        self.ids = set()
+        self.safelist = [re.compile(p) for p in list(SAFELIST) + list(safelist)]
+
+    def add_html(self, text):
+        self.tags.update(t.lower() for t in TAG.findall(text))
+        for _, value in CLASS_ATTR.findall(text):
+            self.classes.update(value.split())
+        for _, value in ID_ATTR.findall(text):
+            self.ids.update(value.split())
+
+    def add_js(self, text):
+        self.tags.update(t.lower() for t in TAG.findall(text))
+        for double, single in STRING_LITERAL.findall(text):
+            words = WORD.findall(double or single)
+            self.classes.update(words)
+            self.ids.update(words)
+
+    def allows(self, name, names):
+        return name in names or any(p.search(name) for p in self.safelist)
+
+    def matches(self, selector):
+        """True unless the selector needs an element, class or id the site never uses"""
+        # Arguments of :not(), :is() etc. and attribute selectors never rule a selector out
+        simple = PSEUDO.sub("", ATTRIBUTE_SELECTOR.sub("", selector))
+        for name in CLASS_SELECTOR.findall(simple):
+            if not self.allows(name.replace("\\", ""), self.classes):
+                return False
+        for name in ID_SELECTOR.findall(simple):
+            if not self.allows(name.replace("\\", ""), self.ids):
+                return False
+        for compound in COMBINATOR.split(simple.strip()):
+            tag = re.match(r"[a-zA-Z][\w-]*", compound)
+            if tag and tag.group(0).lower() not in self.tags:
+                return False
+        return True
+
+
+def split_top_level(text, separator=","):
+    """Split on ``separator`` outside parentheses, brackets and strings"""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, c in enumerate(text):
+        if quote:
+            if c == quote and text[i - 1] != "\\":
+                quote = None
+        elif c in "\"'":
+            quote = c
+        elif c in "([":
+            depth += 1
+        elif c in ")]":
+            depth -= 1
+        elif c == separator and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def find_block_end(css, start):
+    """Index of the brace closing the block opened at ``start``"""
+    depth, quote = 0, None
+    for i in range(start, len(css)):
+        c = css[i]
+        if quote:
+            if c == quote and css[i - 1] != "\\":
+                quote = None
+        elif c in "\"'":
+            quote = c
+        elif c == "{":
+            depth += 1
+        elif c == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css) - 1
+
+
+def prune(css, used):
+    """Return ``css`` with every selector that cannot match removed"""
+    out, i = [], 0
+    while i < len(css):
+        brace = css.find("{", i)
+        semicolon = css.find(";", i)
+        if brace == -1:
+            break
+        if semicolon != -1 and semicolon < brace and css[i:semicolon].strip().startswith("@"):
+            out.append(css[i:semicolon + 1].strip())  # @charset, @import
+            i = semicolon + 1
+            continue
+
+        prelude = css[i:brace].strip()
+        end = find_block_end(css, brace)
+        body = css[brace + 1:end]
+        i = end + 1
+
+        if prelude.startswith(GROUPING_AT_RULES):
+            inner = prune(body, used)
+            if inner:
+                out.append(f"{prelude}{{{inner}}}")
+        elif prelude.startswith("@"):
+            out.append(f"{prelude}{{{body}}}")
+        else:
+            selectors = [s.strip() for s in split_top_level(prelude) if used.matches(s.strip())]
+            if selectors:
+                out.append(f"{','.join(selectors)}{{{body}}}")
+    return "\n".join(out)
+
+
+def collect(site_dir, safelist):
+    used = UsedNames(safelist)
+    for path in site_dir.rglob("*.html"):
+        used.add_html(path.read_text(encoding="utf-8", errors="replace"))
+    for path in site_dir.rglob("*.js"):
+        used.add_js(path.read_text(encoding="utf-8", errors="replace"))
+    return used
+
+
+def above_the_fold(text):
+    """The head and the first CRITICAL_BYTES of the body"""
+    body = BODY_START.search(text)
+    return text[:body.start() + CRITICAL_BYTES] if body else text[:CRITICAL_BYTES]
+
+
+def absolute_urls(css, base):
+    """Resolve relative url() references against ``base``, the stylesheet's URL"""
+    def resolve(match):
+        url = match.group(3).strip()
+        if ABSOLUTE_URL.match(url):
+            return match.group(0)
+        return match.group(1) + match.group(2) + urljoin(base, url) + match.group(2) + match.group(4)
+    return CSS_URL.sub(resolve, css)
+
+
+def write_critical(site_dir, css, safelist):
+    """Write and inline one critical stylesheet per layout; return {layout: size}"""
+    pages = {}
+    for path in sorted(site_dir.rglob("*.html")):
+        text = path.read_text(encoding="utf-8", errors="replace")
+        layout = LAYOUT_ATTR.search(text)
+        if layout:
+            pages.setdefault(layout.group(2) or "default", []).append((path, text))
+
+    link = re.compile(r"""<link\b[^>]*href=(["'])([^"']*/%s)\1[^>]*>""" % re.escape(STYLESHEET))
+    sizes = {}
+    for layout, members in pages.items():
+        used = UsedNames(safelist)
+        for _, text in members:
+            used.add_html(above_the_fold(text))
+        critical = CHARSET.sub("", prune(css, used))  # not allowed inside <style>
+        # Inlined, url(../fonts/x) would resolve against the page, not assets/css/
+        href = "/" + STYLESHEET
+        for _, text in members:
+            match = link.search(text)
+            if match:
+                href = match.group(2)
+                break
+        critical = absolute_urls(critical, href)
+        target = site_dir / CRITICAL_DIR / f"{layout}.css"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(critical, encoding="utf-8")
+        sizes[layout] = len(critical)
+
+        for path, text in members:
+            match = link.search(text)
+            if not match or "data-critical" in text:
+                continue
+            tag = match.group(0)
+            deferred = tag.replace("<link", '<link media="print" onload="this.media=\'all\'"', 1)
+            replacement = f"<style data-critical>{critical}</style>{deferred}<noscript>{tag}</noscript>"
+            path.write_text(text[:match.start()] + replacement + text[match.end():], encoding="utf-8")
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Remove unused rules from the compiled stylesheet")
+    parser.add_argument("--site", type=Path, default=SITE_DIR, help="Generated site directory (default: _site)")
+    parser.add_argument("--safelist", action="append", default=[], help="Regex of class or id names to always keep (repeatable)")
+    parser.add_argument("--critical", action="store_true", help="Also extract and inline critical CSS per layout")
+    args = parser.parse_args()
+
+    stylesheet = args.site / STYLESHEET
+    if not stylesheet.is_file():
+        print(f"✗ {stylesheet} not found; run jekyll build first")
+        sys.exit(1)
+
+    original = stylesheet.read_text(encoding="utf-8")
+    css = COMMENT.sub("", original)
+    pruned = prune(css, collect(args.site, args.safelist)) + "\n"
+    stylesheet.write_text(pruned, encoding="utf-8")
+    print(f"✓ {STYLESHEET}: {len(original.encode()):,} → {len(pruned.encode()):,} bytes")
+
+    if args.critical:
+        for layout, size in write_critical(args.site, pruned, args.safelist).items():
+            print(f"✓ critical CSS for {layout}: {size:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Subset the icon fonts to the icons the site uses
+
+The stylesheet ships every Font Awesome icon (_sass/vendor/font-awesome)
+and academicons.css every Academicons icon, together with fonts holding all
+of their glyphs, while the site shows a few dozen. This script scans the
+templates, content and data (and _site/ when it exists) for fa-* and ai-*
+classes, and writes
+
+    assets/fonts/subset/*.woff2   the icon fonts cut down to those glyphs
+    assets/css/icons.css          @font-face rules for them, the icon rules
+                                  that are used, and the rest of
+                                  academicons.css
+    _data/icon_subset.yml         the icon list; while it exists main.scss
+                                  leaves out Font Awesome's icon rules and
+                                  @font-face, and the head loads icons.css
+                                  instead of academicons.css
+
+Nothing is regenerated until the set of used icons or a source font changes.
+Delete _data/icon_subset.yml to go back to the full icon sets.
+
+Requires: fonttools, brotli (for WOFF2)
+
+Usage:
+    python3 subset_icons.py
+"""
+
+import re
+import sys
+
+import yaml
+
+from build_utils import CACHE_DIR, EXIT_SKIPPED, SITE_DIR, SITE_ROOT, content_hash, file_hash, load_json, save_json
+
+FA_DIR = SITE_ROOT / "_sass" / "vendor" / "font-awesome"
+FA_FONT_DIR = SITE_ROOT / "assets" / "webfonts"
+ACADEMICONS_CSS = SITE_ROOT / "assets" / "css" / "academicons.css"
+ACADEMICONS_FONT = SITE_ROOT / "assets" / "fonts" / "academicons.ttf"
+SUBSET_DIR = SITE_ROOT / "assets" / "fonts" / "subset"
+ICON_CSS = SITE_ROOT / "assets" / "css" / "icons.css"
+ICON_DATA = SITE_ROOT / "_data" / "icon_subset.yml"
+CACHE_FILE = CACHE_DIR / "icon_subset.json"
+SUBSET_VERSION = "1"  # bump when the generated stylesheet changes
+
+SCAN_DIRS = [
+    "_includes", "_layouts", "_pages", "_posts", "_publications", "_projects",
+    "_talks", "_teaching", "_portfolio", "_data", "assets/js",
+]
+SCAN_FILES = ["_config.yml", "prerender_publications.py"]
+SCAN_EXTENSIONS = {".html", ".md", ".markdown", ".yml", ".yaml", ".js", ".py"}
+
+# (font-family, weight, font file, class aliases for the weight) per Font Awesome style
+FA_STYLES = [
+    ("Font Awesome 6 Free", 900, "fa-solid-900", ".fas,.fa-solid"),
+    ("Font Awesome 6 Free", 400, "fa-regular-400", ".far,.fa-regular"),
+    ("Font Awesome 6 Brands", 400, "fa-brands-400", ".fab,.fa-brands"),
+]
+FA_ROOT_VARS = (
+    ":root,:host{"
+    "--fa-style-family-classic:'Font Awesome 6 Free';"
+    "--fa-font-solid:normal 900 1em/1 'Font Awesome 6 Free';"
+    "--fa-font-regular:normal 400 1em/1 'Font Awesome 6 Free';"
+    "--fa-style-family-brands:'Font Awesome 6 Brands';"
+    "--fa-font-brands:normal 400 1em/1 'Font Awesome 6 Brands'}"
+)
+
+ICON_CLASS = re.compile(r"(?<![\w-])(fa|ai)-([a-z0-9]+(?:-[a-z0-9]+)*)")
+FA_VAR = re.compile(r"^\$fa-var-([\w-]+):\s*\\([0-9a-f]+);", re.M)
+FA_MAP = re.compile(r"^\$(fa-icons|fa-brand-icons):\s*\((.*?)\)", re.M | re.S)
+FA_MAP_ENTRY = re.compile(r'"([\w-]+)":\s*\$fa-var-([\w-]+)')
+AI_RULE = re.compile(r"\.ai-([\w-]+):before\s*\{\s*content:\s*\"\\([0-9a-f]+)\";\s*\}\s*", re.I)
+AI_FONT_FACE = re.compile(r"@font-face\s*\{.*?\}\s*", re.S)
+
+
+def font_awesome_icons():
+    """Return ({name: codepoint}, {brand icon names}) from the Sass variables"""
+    text = (FA_DIR / "_variables.scss").read_text(encoding="utf-8")
+    codepoints = {name: int(code, 16) for name, code in FA_VAR.findall(text)}
+    icons, brands = {}, set()
+    for map_name, body in FA_MAP.findall(text):
+        for name, var in FA_MAP_ENTRY.findall(body):
+            if var in codepoints:
+                icons[name] = codepoints[var]
+                if map_name == "fa-brand-icons":
+                    brands.add(name)
+    return icons, brands
+
+
+def academicons():
+    """Return {name: codepoint} from academicons.css"""
+    text = ACADEMICONS_CSS.read_text(encoding="utf-8")
+    return {name: int(code, 16) for name, code in AI_RULE.findall(text)}
+
+
+def scanned_files():
+    for name in SCAN_DIRS:
+        for path in sorted((SITE_ROOT / name).rglob("*")):
+            if path.is_file() and path.suffix in SCAN_EXTENSIONS and path != ICON_DATA:
+                yield path
+    for name in SCAN_FILES:
+        if (SITE_ROOT / name).is_file():
+            yield SITE_ROOT / name
+    if SITE_DIR.is_dir():
+        yield from sorted(SITE_DIR.rglob("*.html"))
+
+
+def used_icons(fa_icons, ai_icons):
+    """Return (used Font Awesome names, used Academicons names)"""
+    fa, ai = set(), set()
+    for path in scanned_files():
+        text = path.read_text(encoding="utf-8", errors="replace")
+        for prefix, name in ICON_CLASS.findall(text):
+            if prefix == "fa" and name in fa_icons:
+                fa.add(name)
+            elif prefix == "ai" and name in ai_icons:
+                ai.add(name)
+    return sorted(fa), sorted(ai)
+
+
+def subset_font(source, target, codepoints):
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.notdef_outline = True
+    font = TTFont(source)
+    subsetter = subset.Subsetter(options=options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    font.flavor = "woff2"
+    font.save(target)
+
+
+def font_face(family, weight, filename):
+    return (
+        f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+        f"font-display:block;src:url('../fonts/subset/{filename}.woff2') format('woff2')}}"
+    )
+
+
+def icon_stylesheet(fa, ai, fa_icons, brands):
+    lines = ["/* Generated by subset_icons.py from the icons the site uses; do not edit */", FA_ROOT_VARS]
+    for family, weight, filename, classes in FA_STYLES:
+        lines.append(font_face(family, weight, filename))
+        lines.append(f"{classes}{{font-weight:{weight}}}")
+    for name in fa:
+        pseudo = ":before" if name in brands else "::before"
+        lines.append(f'.fa-{name}{pseudo}{{content:"\\{fa_icons[name]:x}"}}')
+
+    # academicons.css minus the icons nobody uses, pointing at the subset font
+    academicons_css = ACADEMICONS_CSS.read_text(encoding="utf-8")
+    academicons_css = AI_FONT_FACE.sub(font_face("Academicons", 400, "academicons") + "\n", academicons_css, count=1)
+    keep = set(ai)
+    academicons_css = AI_RULE.sub(lambda m: m.group(0) if m.group(1) in keep else "", academicons_css)
+    lines.append(academicons_css.strip())
+    return "\n".join(lines) + "\n"
+
+
+def generate():
+    """Write the subset fonts, icons.css and the data file
+
+    Returns True if they were written, False if they were up to date and None
+    if fonttools/brotli are missing.
+    """
+    fa_icons, brands = font_awesome_icons()
+    ai_icons = academicons()
+    fa, ai = used_icons(fa_icons, ai_icons)
+
+    sources = [FA_FONT_DIR / f"{filename}.ttf" for _, _, filename, _ in FA_STYLES] + [ACADEMICONS_FONT, ACADEMICONS_CSS]
+    key = content_hash(
+        SUBSET_VERSION + " ".join(fa) + "|" + " ".join(ai) + "".join(file_hash(p) for p in sources)
+    )
+    outputs = [ICON_CSS, ICON_DATA] + [SUBSET_DIR / f"{p.stem}.woff2" for p in sources[:-1]]
+    if load_json(CACHE_FILE).get("key") == key and all(p.is_file() for p in outputs):
+        return False
+
+    try:
+        import fontTools  # noqa: F401
+        import brotli  # noqa: F401
+    except ImportError:
+        # Not fatal: without the data file the site keeps using the full icon fonts
+        print("➖ fonttools/brotli not installed, keeping the full icon fonts. Install with: pip install fonttools brotli")
+        return None
+
+    SUBSET_DIR.mkdir(parents=True, exist_ok=True)
+    fa_codepoints = [fa_icons[name] for name in fa]
+    for _, _, filename, _ in FA_STYLES:
+        subset_font(FA_FONT_DIR / f"{filename}.ttf", SUBSET_DIR / f"{filename}.woff2", fa_codepoints)
+    subset_font(ACADEMICONS_FONT, SUBSET_DIR / "academicons.woff2", [ai_icons[name] for name in ai])
+
+    ICON_CSS.write_text(icon_stylesheet(fa, ai, fa_icons, brands), encoding="utf-8")
+    data = {"key": key, "stylesheet": "/assets/css/icons.css", "font_awesome": fa, "academicons": ai}
+    ICON_DATA.write_text(yaml.safe_dump(data, sort_keys=True), encoding="utf-8")
+    save_json(CACHE_FILE, {"key": key})
+    return True
+
+
+def main():
+    written = generate()
+    if written is None:
+        sys.exit(EXIT_SKIPPED)
+    if written:
+        data = yaml.safe_load(ICON_DATA.read_text(encoding="utf-8"))
+        print(f"✓ Subset icon fonts to {len(data['font_awesome'])} Font Awesome and {len(data['academicons'])} Academicons icons")
+    elif ICON_DATA.is_file():
+        print("➖ Icon subset already up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,111 @@
 #
 # (c) 2016-2017 R. Stuart Geiger, released under the MIT license
 #
-# Run this from the _talks/ directory, which contains .md files of all your talks. 
+# Run this from the _talks/ directory, which contains .md files of all your talks.
 # This scrapes the location YAML field from each .md file, geolocates it with
-# geopy/Nominatim, and uses the getorg library to output data, HTML,
-# and Javascript for a standalone cluster map.
+# geopy/Nominatim, and precomputes the marker clusters for every zoom level of
+# the map in ../talkmap/map.html.
 #
-# Requires: glob, getorg, geopy
+# Clusters are built bottom-up, supercluster style: talks are grouped on a
+# pixel grid at MAX_ZOOM, then those clusters are grouped again at each lower
+# zoom. Each zoom level is cut into 256px tiles written as
+# ../talkmap/clusters/{z}/{x}/{y}.json, with index.json listing the tiles that
+# exist, so the map page only fetches the clusters in view instead of
+# clustering every talk in the browser.
+#
+# Requires: glob, geopy
 
 import glob
-import getorg
+import json
+import math
+import os
+import shutil
 from geopy import Nominatim
 
+CLUSTER_DIR = "../talkmap/clusters"
+CLUSTER_RADIUS = 80  # pixels, same as maxClusterRadius of the old markercluster map
+MAX_ZOOM = 14  # above this every talk location is shown on its own
+TILE_SIZE = 256
+MAX_TITLES = 5
+
+
+def project(lat, lng):
+    """Web Mercator projection to [0, 1) world coordinates"""
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = (lng + 180.0) / 360.0
+    sin = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin) / (1 - sin)) / (4 * math.pi)
+    return x, y
+
+
+def merge(members):
+    """Combine clusters into one, weighting the centre by talk count"""
+    count = sum(m["count"] for m in members)
+    return {
+        "x": sum(m["x"] * m["count"] for m in members) / count,
+        "y": sum(m["y"] * m["count"] for m in members) / count,
+        "lat": sum(m["lat"] * m["count"] for m in members) / count,
+        "lng": sum(m["lng"] * m["count"] for m in members) / count,
+        "count": count,
+        "titles": [t for m in members for t in m["titles"]][:MAX_TITLES],
+        "bounds": [
+            [min(m["bounds"][0][0] for m in members), min(m["bounds"][0][1] for m in members)],
+            [max(m["bounds"][1][0] for m in members), max(m["bounds"][1][1] for m in members)],
+        ],
+    }
+
+
+def cluster_zoom(clusters, zoom):
+    """Group clusters whose centres share a CLUSTER_RADIUS grid cell at this zoom"""
+    cells = {}
+    scale = TILE_SIZE * 2 ** zoom / CLUSTER_RADIUS
+    for c in clusters:
+        cells.setdefault((int(c["x"] * scale), int(c["y"] * scale)), []).append(c)
+    return [members[0] if len(members) == 1 else merge(members) for members in cells.values()]
+
+
+def build_clusters(points):
+    """Return {zoom: [cluster, ...]} for zoom levels 0..MAX_ZOOM"""
+    leaves = []
+    for title, (lat, lng) in points.items():
+        x, y = project(lat, lng)
+        leaves.append({"x": x, "y": y, "lat": lat, "lng": lng, "count": 1,
+                       "titles": [title], "bounds": [[lat, lng], [lat, lng]]})
+
+    levels = {MAX_ZOOM + 1: leaves}
+    for zoom in range(MAX_ZOOM, -1, -1):
+        levels[zoom] = cluster_zoom(levels[zoom + 1], zoom)
+    del levels[MAX_ZOOM + 1]
+    return levels
+
+
+def write_cluster_tiles(points, out_dir=CLUSTER_DIR):
+    """Write one JSON file per non-empty tile plus an index of those tiles"""
+    if os.path.isdir(out_dir):
+        shutil.rmtree(out_dir)
+    index = {}
+    for zoom, clusters in build_clusters(points).items():
+        tiles = {}
+        for c in clusters:
+            tx = int(c["x"] * 2 ** zoom)
+            ty = int(c["y"] * 2 ** zoom)
+            tiles.setdefault((tx, ty), []).append(
+                {"lat": round(c["lat"], 5), "lng": round(c["lng"], 5), "count": c["count"],
+                 "titles": c["titles"], "bounds": c["bounds"]})
+        for (tx, ty), features in tiles.items():
+            os.makedirs(f"{out_dir}/{zoom}/{tx}", exist_ok=True)
+            with open(f"{out_dir}/{zoom}/{tx}/{ty}.json", "w", encoding="utf-8") as f:
+                json.dump(features, f, separators=(",", ":"))
+        index[zoom] = sorted(f"{tx}/{ty}" for tx, ty in tiles)
+
+    with open(f"{out_dir}/index.json", "w", encoding="utf-8") as f:
+        json.dump({"maxZoom": MAX_ZOOM, "tiles": index}, f, separators=(",", ":"))
+
+
 g = glob.glob("*.md")
 
 
-geocoder = Nominatim()
+geocoder = Nominatim(user_agent="academicpages-talkmap")
 location_dict = {}
 location = ""
 permalink = ""
@@ -33,15 +123,11 @@ for file in g:
             lines_trim = lines[loc_start:]
             loc_end = lines_trim.find('"')
             location = lines_trim[:loc_end]
-                            
-           
-        location_dict[location] = geocoder.geocode(location)
-        print(location, "\n", location_dict[location])
-
-
-m = getorg.orgmap.create_map_obj()
-getorg.orgmap.output_html_cluster_map(location_dict, folder_name="../talkmap", hashed_usernames=False)
 
 
+        location_dict[location] = geocoder.geocode(location)
+        print(location, "\n", location_dict[location])
 
 
+points = {loc: (geo.latitude, geo.longitude) for loc, geo in location_dict.items() if geo}
+write_cluster_tiles(points)
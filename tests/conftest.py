@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The build scripts live at the site root and import build_utils from there
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
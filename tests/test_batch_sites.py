@@ -0,0 +1,64 @@
+from markdown_generator.batch_sites import (
+    author_key,
+    author_keys,
+    build_author_index,
+    entries_for_site,
+    highlight_authors,
+)
+
+ENTRIES = [
+    {"key": "a", "title": "Joonkyung's paper", "author": "Kim, Joonkyung and Lee, Bo"},
+    {"key": "b", "title": "Jinwoo's paper", "author": "Jinwoo Kim and Park, Chan"},
+    {"key": "c", "title": "Initials only", "author": "J. Kim and Lee, Bo"},
+]
+
+
+def site(*authors):
+    return {"name": "s", "output": "unused", "authors": list(authors)}
+
+
+def test_author_key_ignores_order_case_accents_and_braces():
+    assert author_key("Kim, Joonkyung") == author_key("joonkyung KIM") == author_key("{Kim}, Joonkyung")
+    assert author_key(r"M{\"u}ller, Hans") == author_key("Hans Müller")
+    assert author_key("Kim, Joonkyung") != author_key("Kim, Jinwoo")
+
+
+def test_authors_sharing_surname_and_initial_are_kept_apart():
+    index = build_author_index(ENTRIES)
+    assert [e["key"] for e in entries_for_site(site("Joonkyung Kim"), ENTRIES, index)] == ["a"]
+    assert [e["key"] for e in entries_for_site(site("Kim, Jinwoo"), ENTRIES, index)] == ["b"]
+
+
+def test_initials_match_only_when_listed():
+    index = build_author_index(ENTRIES)
+    found = entries_for_site(site("Joonkyung Kim", "Kim, J."), ENTRIES, index)
+    assert [e["key"] for e in found] == ["a", "c"]
+
+
+def test_highlight_only_bolds_the_site_owner():
+    keys = {author_key("Joonkyung Kim")}
+    template = "<strong>{}</strong>"
+    assert highlight_authors(ENTRIES[0]["author"], keys, template) == "<strong>Kim, Joonkyung</strong> and Lee, Bo"
+    assert highlight_authors(ENTRIES[1]["author"], keys, template) == ENTRIES[1]["author"]
+    assert highlight_authors(ENTRIES[2]["author"], keys, template) == ENTRIES[2]["author"]
+
+
+def test_non_latin_names_keep_their_letters():
+    assert author_key("김준경") == "김준경"
+    assert author_key("김, 준경") == "준경 김"
+    assert author_key("김준경") != author_key("김진우")
+
+    entries = [
+        {"key": "k", "title": "Korean names", "author": "김준경 and 박찬"},
+        {"key": "l", "title": "Other Korean names", "author": "김진우 and 박찬"},
+    ]
+    index = build_author_index(entries)
+    assert [e["key"] for e in entries_for_site(site("김준경"), entries, index)] == ["k"]
+
+
+def test_names_without_letters_match_nothing():
+    entries = ENTRIES + [{"key": "d", "title": "Anonymous", "author": "--- and 123"}]
+    index = build_author_index(entries)
+    assert "" not in index
+    assert entries_for_site(site("---"), entries, index) == []
+    assert highlight_authors("--- and Lee, Bo", author_keys(["---"]), "<b>{}</b>") == "--- and Lee, Bo"
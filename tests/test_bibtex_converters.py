@@ -0,0 +1,97 @@
+import io
+
+import yaml
+
+from markdown_generator import bibtex_to_publications, pubsFromBib, simple_bibtex_converter
+
+PUBSOURCE = {
+    "file": "proceedings.bib",
+    "venuekey": "booktitle",
+    "venue-pretext": "In the proceedings of ",
+    "collection": {"name": "publications", "permalink": "/publication/"},
+}
+
+
+def front_matter(markdown):
+    _, header, _ = markdown.split("---\n", 2)
+    return yaml.safe_load(header)
+
+
+def test_pubsfrombib_slug_folds_accents_and_dashes():
+    bib = r"""@inproceedings{s2020,
+      title = {Sch{\"o}lkopf Meets Model--Based RL},
+      author = {Sch{\"o}lkopf, Bernhard},
+      booktitle = {ICML},
+      year = {2020},
+    }"""
+    entry = pubsFromBib.parse_bib(io.StringIO(bib)).entries["s2020"]
+    filename, markdown = pubsFromBib.bib_entry_to_markdown(entry, PUBSOURCE)
+    assert filename == "2020-01-01-Scholkopf-Meets-Model-Based-RL.md"
+    assert "permalink: /publication/2020-01-01-Scholkopf-Meets-Model-Based-RL" in markdown
+    assert 'title: "Schölkopf Meets Model–Based RL"' in markdown
+
+
+def test_simple_converter_slug_folds_accents_and_dashes():
+    entry = {"type": "article", "key": "s", "title": r"Sch{\"o}lkopf Meets Model--Based RL", "year": "2020"}
+    filename, _, _ = simple_bibtex_converter.entry_to_markdown(entry)
+    assert filename == "2020-01-01-scholkopf-meets-model-based-rl.md"
+
+
+def test_simple_converter_front_matter_round_trips_backslashes_and_quotes():
+    entry = {
+        "type": "inproceedings",
+        "key": "p",
+        "title": r'Path \textbackslash{}d and "quotes" \1 stray',
+        "author": "Kim, Alice",
+        "booktitle": r"Workshop on C:\textbackslash{}Users",
+        "year": "2024",
+    }
+    _, markdown, _ = simple_bibtex_converter.entry_to_markdown(entry)
+    data = front_matter(markdown)
+    assert data["title"] == 'Path \\d and "quotes" \\1 stray'
+    assert data["venue"].startswith("Workshop on C:\\Users")
+
+
+def test_pybtex_converter_fields_round_trip_through_yaml():
+    for raw, decoded in [
+        (r"Path \textbackslash{}d", "Path \\d"),
+        (r'Say "hi" \1 there', 'Say "hi" \\1 there'),
+        (r"Sch{\"o}lkopf", "Schölkopf"),
+    ]:
+        assert bibtex_to_publications.clean_string(raw) == decoded
+        quoted = simple_bibtex_converter.yaml_quote(bibtex_to_publications.clean_string(raw))
+        assert yaml.safe_load(f"title: {quoted}")["title"] == decoded
+
+
+def test_body_text_is_not_yaml_escaped():
+    entry = {
+        "type": "article",
+        "key": "b",
+        "title": "A Paper",
+        "abstract": r'We map C:\textbackslash{}data to "clean" output.',
+        "year": "2024",
+    }
+    _, markdown, _ = simple_bibtex_converter.entry_to_markdown(entry)
+    assert markdown.split("---\n", 2)[2] == '\nWe map C:\\data to "clean" output.'
+
+    bib = r"""@article{b2024,
+      title = {A Paper},
+      author = {Doe, John and O"Brien, Se{\'a}n},
+      abstract = {We map C:\textbackslash{}data to "clean" output.},
+      year = {2024},
+    }"""
+    [(_, markdown)] = bibtex_to_publications.render_bibtex(io.StringIO(bib))
+    assert front_matter(markdown)["authors"] == 'John Doe, Seán O"Brien'
+    assert markdown.split("---\n", 2)[2] == '\nWe map C:\\data to "clean" output.'
+
+
+def test_simple_converter_quotes_the_authors_line():
+    entry = {
+        "type": "article",
+        "key": "d",
+        "title": "A Paper",
+        "author": r'Doe, John: Jr and O"Brien, Se{\'a}n and Kim, #1',
+        "year": "2024",
+    }
+    _, markdown, _ = simple_bibtex_converter.entry_to_markdown(entry)
+    assert front_matter(markdown)["authors"] == 'Doe, John: Jr and O"Brien, Seán and Kim, #1'
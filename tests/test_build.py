@@ -0,0 +1,52 @@
+import sys
+
+import build
+from build import Step
+from build_utils import EXIT_SKIPPED
+
+
+def names(steps):
+    return [step.name for step in steps]
+
+
+def test_producer_runs_before_consumer_listed_earlier():
+    order = build.build_order([
+        Step("icons", ["true"], inputs=["_data/*.yml"], outputs=["_data/icon_subset.yml"]),
+        Step("stats", ["true"], inputs=["_posts/*"], outputs=["_data/content_stats.yml"]),
+    ])
+    assert names(order) == ["stats", "icons"]
+
+
+def test_default_steps_settle_in_one_build():
+    order = names(build.build_order(build.STEPS))
+    assert order.index("content_stats") < order.index("icon_subset")
+    assert order.index("prerender_publications") < order.index("icon_subset")
+    assert order.index("add_category") < order.index("add_teaser")
+
+
+def test_steps_rewriting_the_same_files_keep_their_order():
+    steps = [
+        Step("fix_a", ["true"], inputs=["_publications/*.md"], outputs=["_publications/*.md"]),
+        Step("fix_b", ["true"], inputs=["_publications/*.md"], outputs=["_publications/*.md"]),
+    ]
+    assert names(build.build_order(steps)) == ["fix_a", "fix_b"]
+    assert names(build.build_order(steps[::-1])) == ["fix_b", "fix_a"]
+
+
+def test_globs_at_different_depths_do_not_overlap():
+    assert not build.glob_overlap("_data/*.yml", "_data/archive/*")
+    assert build.glob_overlap("_data/*.yml", "_data/content_stats.yml")
+    assert not build.glob_overlap("_data/news.yml", "_data/icon_subset.yml")
+    assert build.glob_overlap("_includes/**/*", "_includes/publication-cards/*")
+
+
+def test_skipped_step_is_not_recorded_as_done():
+    step = Step("optional", [sys.executable, "-c", f"raise SystemExit({EXIT_SKIPPED})"], inputs=["build.py"])
+    cache = {"optional": "stale"}
+    status, _ = build.run_step(step, cache, force=False, dry_run=False)
+    assert status == "skipped"
+    assert "optional" not in cache
+
+
+def test_publications_step_needs_to_be_named():
+    assert "publications" not in [step.name for step in build.STEPS if step.default]
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import check_links
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Local stand-in for the sites publications link to"""
+
+    requests = []
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def handle_request(self):
+        cls = type(self)
+        cls.requests.append((self.command, self.path, dict(self.headers)))
+        if self.path == "/ok":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.reply(304)
+            else:
+                self.reply(200, [("ETag", ETAG), ("Last-Modified", LAST_MODIFIED)])
+        elif self.path == "/no-head":
+            self.reply(405 if self.command == "HEAD" else 200)
+        elif self.path.startswith("/slow/"):
+            with cls.lock:
+                cls.in_flight += 1
+                cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            time.sleep(0.1)
+            with cls.lock:
+                cls.in_flight -= 1
+            self.reply(200)
+        else:
+            self.reply(404)
+
+    do_HEAD = do_GET = handle_request
+
+
+@pytest.fixture
+def server():
+    StandIn.requests = []
+    StandIn.in_flight = StandIn.max_in_flight = 0
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def check(urls, cache, **kwargs):
+    return asyncio.run(check_links.check_urls(urls, cache, **kwargs))
+
+
+def test_ok_link_caches_validators(server):
+    cache = {}
+    assert check([f"{server}/ok"], cache) == 1
+    result = cache[f"{server}/ok"]
+    assert result["ok"] and result["status"] == 200
+    assert result["etag"] == ETAG and result["last_modified"] == LAST_MODIFIED
+
+
+def test_fresh_result_sends_no_request(server):
+    cache = {}
+    check([f"{server}/ok"], cache)
+    StandIn.requests = []
+    assert check([f"{server}/ok"], cache) == 0
+    assert StandIn.requests == []
+
+
+def test_stale_result_is_revalidated_with_304(server):
+    url = f"{server}/ok"
+    cache = {}
+    check([url], cache)
+    first_checked = cache[url]["checked"]
+    StandIn.requests = []
+
+    assert check([url], cache, max_age=0) == 1
+    method, _, headers = StandIn.requests[0]
+    assert method == "HEAD"
+    assert headers["If-None-Match"] == ETAG
+    assert headers["If-Modified-Since"] == LAST_MODIFIED
+    assert cache[url]["ok"] and cache[url]["status"] == 200  # kept from the cache on 304
+    assert cache[url]["checked"] >= first_checked
+
+
+def test_head_refused_falls_back_to_get(server):
+    url = f"{server}/no-head"
+    cache = {}
+    check([url], cache)
+    assert [method for method, _, _ in StandIn.requests] == ["HEAD", "GET"]
+    assert cache[url]["ok"] and cache[url]["status"] == 200
+
+
+def test_404_is_reported(server, capsys):
+    url = f"{server}/gone"
+    cache = {}
+    check([url, f"{server}/ok"], cache)
+    assert not cache[url]["ok"] and cache[url]["status"] == 404
+
+    broken = check_links.report({"_publications/paper.md": [url, f"{server}/ok"]}, cache)
+    assert broken == 1
+    out = capsys.readouterr().out
+    assert "✗ _publications/paper.md" in out
+    assert f"404: {url}" in out
+
+
+def test_connections_are_capped_per_host(server):
+    urls = [f"{server}/slow/{i}" for i in range(6)]
+    cache = {}
+    assert check(urls, cache, per_host=2) == 6
+    assert all(cache[url]["ok"] for url in urls)
+    assert 1 <= StandIn.max_in_flight <= 2
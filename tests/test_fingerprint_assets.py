@@ -0,0 +1,27 @@
+import json
+
+import fingerprint_assets
+
+
+def test_only_copies_from_the_previous_manifest_are_removed(tmp_path, monkeypatch):
+    monkeypatch.setattr(fingerprint_assets, "CACHE_FILE", tmp_path / "cache.json")
+    site = tmp_path / "_site"
+    js = site / "assets" / "js"
+    js.mkdir(parents=True)
+    (js / "app.js").write_text("console.log(1);\n")
+    # A vendored file whose name only looks fingerprinted
+    (js / "vendor.0123456789.js").write_text("vendor();\n")
+    (site / "index.html").write_text('<script src="/assets/js/app.js"></script>\n')
+
+    fingerprint_assets.fingerprint(site)
+    first = json.loads((site / "assets" / "manifest.json").read_text())["assets/js/app.js"]
+    assert (site / first).is_file()
+
+    (js / "app.js").write_text("console.log(2);\n")
+    fingerprint_assets.fingerprint(site)
+    second = json.loads((site / "assets" / "manifest.json").read_text())["assets/js/app.js"]
+
+    assert second != first
+    assert not (site / first).exists()
+    assert (site / second).is_file()
+    assert (js / "vendor.0123456789.js").is_file()
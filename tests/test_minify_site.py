@@ -0,0 +1,60 @@
+import minify_site
+from minify_site import minify_js
+
+TEMPLATE = """function card(item) {
+    // build the card
+    return `<div>
+    // not a comment
+        ${item.tags.map(tag => `<span>
+  ${tag}</span>`).join("")}
+</div>`;
+}
+"""
+
+
+def test_template_literals_are_kept_verbatim():
+    assert minify_js(TEMPLATE) == """function card(item) {
+return `<div>
+    // not a comment
+        ${item.tags.map(tag => `<span>
+  ${tag}</span>`).join("")}
+</div>`;
+}
+"""
+
+
+def test_continued_strings_and_regex_literals():
+    script = """const s = "first \\
+    second";
+    const r = /['`]/g;   // quotes in a regex
+    const half = total / 2;
+"""
+    assert minify_js(script) == """const s = "first \\
+    second";
+const r = /['`]/g;   // quotes in a regex
+const half = total / 2;
+"""
+
+
+def test_script_the_scanner_cannot_follow_is_unchanged():
+    script = "const t = `never closed\n    // kept\n"
+    assert minify_js(script) == script
+
+
+def test_fingerprinted_copies_are_only_compressed(tmp_path, monkeypatch):
+    monkeypatch.setattr(minify_site, "MINIFY_CACHE", tmp_path / "cache")
+    (tmp_path / "cache").mkdir()
+    site = tmp_path / "_site"
+    (site / "assets" / "js").mkdir(parents=True)
+    (site / "assets" / "manifest.json").write_text('{"assets/js/app.js": "assets/js/app.0123456789.js"}')
+    script = "function f() {\n    return 1;\n}\n" * 40
+    for name in ("app.js", "app.0123456789.js"):
+        (site / "assets" / "js" / name).write_text(script)
+
+    copies = minify_site.fingerprinted_files(site)
+    for path in sorted((site / "assets" / "js").glob("*.js")):
+        minify_site.process(str(path), str(path) in copies)
+
+    assert (site / "assets" / "js" / "app.0123456789.js").read_text() == script
+    assert (site / "assets" / "js" / "app.0123456789.js.gz").is_file()
+    assert (site / "assets" / "js" / "app.js").read_text() == "function f() {\nreturn 1;\n}\n" * 40
@@ -0,0 +1,86 @@
+import os
+
+import pytest
+from pybtex.exceptions import PybtexError
+
+from markdown_generator import pubsFromBib
+from markdown_generator.output_sink import OutputSink
+
+BIB = r"""@inproceedings{p2024,
+  title = {A Paper},
+  author = {Kim, Alice},
+  booktitle = {ICRA},
+  year = {2024},
+}"""
+
+
+class EagerSink(OutputSink):
+    """Waits for each file to be staged, so temp files exist before a failure"""
+
+    def write(self, relpath, content, source=None):
+        super().write(relpath, content, source)
+        for _, future in self.staged.values():
+            future.result()
+
+
+def leftovers(directory):
+    return sorted(p.name for p in directory.rglob("*") if p.name.endswith(".tmp"))
+
+
+def test_exception_inside_block_discards_staged_files(tmp_path):
+    with pytest.raises(RuntimeError):
+        with EagerSink(tmp_path) as sink:
+            for i in range(20):
+                sink.write(f"{i}.md", f"content {i}")
+            raise RuntimeError("generator failed")
+    assert leftovers(tmp_path) == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_commit_writes_and_leaves_no_temp_files(tmp_path):
+    with OutputSink(tmp_path) as sink:
+        sink.write("a.md", "a")
+    assert (tmp_path / "a.md").read_text() == "a"
+    assert leftovers(tmp_path) == []
+
+
+def test_pubsfrombib_parse_error_in_second_source_leaves_no_temp_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(pubsFromBib, "OutputSink", EagerSink)
+    good = tmp_path / "good.bib"
+    good.write_text(BIB, encoding="utf-8")
+    broken = tmp_path / "broken.bib"
+    broken.write_text("@article{x, title = {unterminated\n", encoding="utf-8")
+    output = tmp_path / "_publications"
+    publist = {
+        "first": {
+            "file": str(good),
+            "venuekey": "booktitle",
+            "venue-pretext": "",
+            "collection": {"name": "publications", "permalink": "/publication/"},
+        },
+        "second": {
+            "file": str(broken),
+            "venuekey": "booktitle",
+            "venue-pretext": "",
+            "collection": {"name": "publications", "permalink": "/publication/"},
+        },
+    }
+    with pytest.raises(PybtexError):
+        pubsFromBib.main(publist, output_dir=str(output))
+    assert leftovers(tmp_path) == []
+    assert not output.exists() or list(output.iterdir()) == []
+
+
+def test_file_modes_follow_the_umask_and_existing_files(tmp_path):
+    existing = tmp_path / "existing.md"
+    existing.write_text("old")
+    existing.chmod(0o600)
+    previous = os.umask(0o027)
+    try:
+        with OutputSink(tmp_path) as sink:
+            sink.write("new.md", "new")
+            sink.write("existing.md", "new")
+    finally:
+        os.umask(previous)
+    assert (tmp_path / "new.md").stat().st_mode & 0o777 == 0o640
+    assert existing.stat().st_mode & 0o777 == 0o600
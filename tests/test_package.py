@@ -0,0 +1,24 @@
+from pathlib import Path
+
+import frontmatter
+
+import markdown_generator
+
+TSV = Path(__file__).resolve().parent.parent / "markdown_generator" / "publications.tsv"
+
+
+def test_render_publications_reads_the_site_tsv():
+    records = markdown_generator.read_publications(TSV)
+    outputs = markdown_generator.render_publications(records)
+    assert len(outputs) == len(records) > 0
+    for (filename, markdown), row in zip(outputs, records):
+        assert filename == f"{row['pub_date']}-{row['url_slug']}.md"
+        header = frontmatter.loads(markdown).metadata
+        assert header["title"] == row["title"]
+        assert header["permalink"] == f"/publication/{row['url_slug']}"
+
+
+def test_legacy_generator_stays_namespaced():
+    from markdown_generator import publications
+
+    assert markdown_generator.render_publications is not publications.render_publications
@@ -0,0 +1,19 @@
+import yaml
+
+from precompute_archives import precompute
+
+
+def test_future_posts_are_left_out_like_in_the_sitemap(tmp_path):
+    posts = tmp_path / "_posts"
+    posts.mkdir()
+    (posts / "2020-05-01-past.md").write_text("---\ntitle: Past\ntags: [robots]\n---\nHello\n")
+    (posts / "2199-01-01-future.md").write_text("---\ntitle: Future\ntags: [robots]\n---\nLater\n")
+    archive = tmp_path / "archive"
+
+    precompute(posts, tmp_path / "news.yml", archive, tmp_path / "cache.json")
+
+    assert list(yaml.safe_load((archive / "posts.yml").read_text())) == ["/2020/05/01/past"]
+    assert yaml.safe_load((archive / "tags.yml").read_text()) == [
+        {"count": 1, "ids": ["/2020/05/01/past"], "name": "robots", "slug": "robots"},
+    ]
+    assert [group["name"] for group in yaml.safe_load((archive / "years.yml").read_text())] == ["2020"]
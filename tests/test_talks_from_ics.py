@@ -0,0 +1,76 @@
+import io
+
+import yaml
+
+from markdown_generator.talks_from_ics import iter_events, render_ics
+
+CALENDAR = """BEGIN:VCALENDAR\r
+VERSION:2.0\r
+BEGIN:VEVENT\r
+UID:one\r
+SUMMARY:Safe Multi-Robot Planning\\, Revisited: A Long Title That Is Folded \r
+ Onto a Second Line\r
+DTSTART;TZID=Asia/Seoul:20240315T140000\r
+LOCATION:Seoul\\, Korea\r
+ORGANIZER;CN="Lab: Robotics, Seminar":mailto:lab@example.com\r
+CATEGORIES:Talk,Seminar\r
+DESCRIPTION:First line\\nsecond line\\; with a semicolon\r
+BEGIN:VALARM\r
+DESCRIPTION:Reminder\r
+END:VALARM\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:two\r
+SUMMARY:Workshop Keynote\r
+DTSTART;VALUE=DATE:20230601\r
+X-VENUE:MIT\r
+CATEGORIES:keynote\r
+END:VEVENT\r
+BEGIN:VEVENT\r
+UID:three\r
+DTSTART:20230101T090000Z\r
+END:VEVENT\r
+END:VCALENDAR\r
+"""
+
+
+def front_matter(markdown):
+    _, header, body = markdown.split("---\n", 2)
+    return yaml.safe_load(header), body
+
+
+def test_folded_lines_escapes_and_parameters():
+    first = next(iter_events(io.StringIO(CALENDAR)))
+    assert first["SUMMARY"] == (
+        "Safe Multi-Robot Planning, Revisited: A Long Title That Is Folded Onto a Second Line"
+    )
+    assert first["LOCATION"] == "Seoul, Korea"
+    assert first["ORGANIZER_CN"] == "Lab: Robotics, Seminar"
+    assert first["CATEGORIES"] == ["talk", "seminar"]
+    assert first["DESCRIPTION"] == "First line\nsecond line; with a semicolon"  # not the VALARM's
+
+
+def test_timed_and_all_day_starts_render_as_dates():
+    outputs = render_ics(io.StringIO(CALENDAR))
+    assert [filename for filename, _ in outputs] == [
+        "2024-03-15-safe-multi-robot-planning-revisited-a-long-title-that-is-folded-onto-a-second-line.md",
+        "2023-06-01-workshop-keynote.md",
+    ]  # the event without a title is skipped
+
+    header, body = front_matter(outputs[0][1])
+    assert header["date"].isoformat() == "2024-03-15"
+    assert header["location"] == "Seoul, Korea"
+    assert header["venue"] == "Lab: Robotics, Seminar"
+    assert "First line\nsecond line; with a semicolon" in body
+
+    header, _ = front_matter(outputs[1][1])
+    assert header["date"].isoformat() == "2023-06-01"
+    assert header["venue"] == "MIT"
+    assert "location" not in header
+
+
+def test_category_and_keyword_filters():
+    assert [f for f, _ in render_ics(io.StringIO(CALENDAR), categories=["Keynote"])] == [
+        "2023-06-01-workshop-keynote.md",
+    ]
+    assert len(render_ics(io.StringIO(CALENDAR), keywords=["semicolon"])) == 1
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from markdown_generator import custom_publication_generator
+import validate_frontmatter
+
+TSV = Path(__file__).resolve().parent.parent / "markdown_generator" / "publications.tsv"
+
+
+def test_generator_output_validates(tmp_path):
+    output_dir = tmp_path / "_publications"
+    custom_publication_generator.main(source=TSV, output_dir=output_dir)
+    files = sorted(output_dir.glob("*.md"))
+    assert files
+    for path in files:
+        assert "date: '" in path.read_text(encoding="utf-8")  # the generator quotes its dates
+        assert validate_frontmatter.validate_file(path) == [], path.name
+
+
+def write_publication(tmp_path, name, date):
+    directory = tmp_path / "_publications"
+    directory.mkdir(exist_ok=True)
+    path = directory / name
+    path.write_text(
+        f"---\ntitle: Paper\ncollection: publications\ncategory: conferences\ndate: {date}\n"
+        "permalink: /publication/paper\n---\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_quoted_fallback_date_warns(tmp_path):
+    path = write_publication(tmp_path, "2024-01-01-paper.md", "'2024-01-01'")
+    assert validate_frontmatter.validate_file(path) == [
+        (5, "warning", "date is the 2024-01-01 fallback; check year/month in the source"),
+    ]
+
+
+def test_quoted_date_checked_against_filename(tmp_path):
+    path = write_publication(tmp_path, "2023-05-01-paper.md", "'2023-06-01'")
+    assert validate_frontmatter.validate_file(path) == [
+        (5, "warning", "date 2023-06-01 does not match the filename date 2023-05-01"),
+    ]
+
+
+def test_malformed_date_string_is_an_error(tmp_path):
+    path = write_publication(tmp_path, "2023-05-01-paper.md", "'May 2023'")
+    [(line, level, message)] = validate_frontmatter.validate_file(path)
+    assert (line, level) == (5, "error")
+    assert "date" in message
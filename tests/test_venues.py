@@ -0,0 +1,51 @@
+import pytest
+
+from markdown_generator.venues import categorize, classify, normalize_venue
+
+
+@pytest.mark.parametrize("raw, abbr", [
+    ("IEEE International Conference on Robotics and Automation (ICRA)", "ICRA"),
+    ("2024 IEEE International Conference on Robotics and Automation (ICRA)", "ICRA"),
+    ("Proc. of Int. Conf. on Robotics and Automation (ICRA)", "ICRA"),
+    ("IEEE ICRA", "ICRA"),
+    ("ICRA 2025", "ICRA"),
+    ("IEEE/RSJ International Conference on Intelligent Robots and Systems (IROS)", "IROS"),
+    ("Proceedings of The 7th Conference on Robot Learning", "CoRL"),
+    ("Advances in Neural Information Processing Systems", "NeurIPS"),
+    ("Thirty-Seventh Conference on Neural Information Processing Systems", "NeurIPS"),
+    ("IEEE Robotics and Automation Letters, vol. 8, no. 3", "RA-L"),
+    ("IEEE Transactions on Robotics", "T-RO"),
+    ("The International Journal of Robotics Research", "IJRR"),
+])
+def test_known_spellings_are_recognised(raw, abbr):
+    assert classify(raw).venue.abbr == abbr
+
+
+@pytest.mark.parametrize("raw", [
+    "International Conference on Machine Learning and Applications (ICMLA)",
+    "IEEE Transactions on Robotics and Automation",
+    "International Conference on Computer Vision Systems",
+    "IEEE Transactions on Robotics and Automation Letters of Something",
+    "Journal of Field Robotics and Beyond",
+])
+def test_near_misses_are_left_alone(raw):
+    assert classify(raw).venue is None
+    assert normalize_venue(raw, "2020") == raw
+
+
+def test_near_miss_category_comes_from_type_and_keywords():
+    assert categorize("article", "IEEE Transactions on Robotics and Automation") == "journals"
+    assert categorize("inproceedings", "International Conference on Computer Vision Systems") == "conferences"
+    assert categorize("misc", "International Conference on Machine Learning and Applications (ICMLA)") == "conferences"
+
+
+def test_normalize_known_venue():
+    assert normalize_venue("Proc. of Int. Conf. on Robotics and Automation (ICRA)", "2025") == (
+        "IEEE International Conference on Robotics and Automation (ICRA), 2025"
+    )
+
+
+def test_workshops_and_preprints_are_not_normalized():
+    assert normalize_venue("ICRA Workshop on Manipulation", "2024") == "ICRA Workshop on Manipulation"
+    assert normalize_venue("arXiv preprint arXiv:2401.00001", "2024") == "arXiv preprint arXiv:2401.00001"
+    assert categorize("article", "arXiv preprint arXiv:2401.00001") == "manuscripts"
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Front matter validator for the site collections
+
+Checks the YAML front matter of every document against a schema for its
+collection and reports problems with file and line number, e.g.
+
+    _publications/2024-01-01-foo.md:7: venue: mapping values are not allowed here
+    _publications/2024-01-01-foo.md:9: buttons[0].type: 'slides' is not one of code, paper, ...
+
+Schemas are compiled into plain checker functions once per process.
+Publication categories are read from `publication_category` in _config.yml,
+so adding a category there is enough for the validator to accept it. Large
+trees are split across a process pool.
+
+Exits non-zero if there are errors (or warnings with --strict), so it can be
+used as a git pre-commit hook:
+
+    python3 validate_frontmatter.py $(git diff --cached --name-only -- '_*/*.md')
+
+Usage:
+    python3 validate_frontmatter.py              # whole tree
+    python3 validate_frontmatter.py _publications/2025-09-28-care.md
+"""
+
+import argparse
+import datetime
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import yaml
+
+from build_utils import SITE_ROOT
+
+try:
+    Loader = yaml.CSafeLoader
+except AttributeError:
+    Loader = yaml.SafeLoader
+
+COLLECTION_DIRS = ["_publications", "_talks", "_posts", "_projects", "_teaching", "_portfolio", "_pages"]
+DOCUMENT_SUFFIXES = {".md", ".markdown", ".html"}
+PARALLEL_THRESHOLD = 200  # below this, starting worker processes costs more than it saves
+
+# Known buttons, as rendered by _includes/custom-publication.html
+BUTTON_TYPES = ["paper", "video", "code", "website", "presentation"]
+
+# Date extract_date_info() produces when an entry has no year and no month
+FALLBACK_DATE = datetime.date(2024, 1, 1)
+
+FILENAME_DATE = re.compile(r"^(\d{4}-\d{2}-\d{2})-")
+
+
+def publication_categories():
+    with open(SITE_ROOT / "_config.yml", "r", encoding="utf-8") as f:
+        config = yaml.load(f, Loader=Loader)
+    return sorted((config.get("publication_category") or {}).keys())
+
+
+# A schema maps field name -> (required, spec). A spec is a type, a list of
+# allowed values, a nested dict schema, or a one-element tuple for "list of".
+def schemas():
+    button = {"type": (True, BUTTON_TYPES), "url": (True, str)}
+    return {
+        "publications": {
+            "title": (True, str),
+            "collection": (True, ["publications"]),
+            "category": (True, publication_categories()),
+            "date": (True, datetime.date),
+            "permalink": (True, str),
+            "authors": (False, str),
+            "venue": (False, str),
+            "header": (False, {"teaser": (False, str)}),
+            "buttons": (False, (button,)),
+        },
+        "talks": {
+            "title": (True, str),
+            "collection": (True, ["talks"]),
+            "type": (False, str),
+            "permalink": (True, str),
+            "venue": (False, str),
+            "date": (True, datetime.date),
+            "location": (False, str),
+            "talk_url": (False, str),
+        },
+        "posts": {
+            "title": (True, str),
+            "date": (False, datetime.date),
+            "permalink": (False, str),
+            "tags": (False, (str,)),
+        },
+        "default": {
+            "title": (True, str),
+            "permalink": (False, str),
+        },
+    }
+
+
+def as_date(value):
+    """A plain date from a YAML date or a quoted ISO 'YYYY-MM-DD' string, else None.
+
+    custom_publication_generator.py writes quoted dates, which Jekyll accepts.
+    """
+    if isinstance(value, datetime.datetime):
+        return None  # Jekyll expects a plain date here
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.date.fromisoformat(value.strip())
+        except ValueError:
+            return None
+    return None
+
+
+def type_name(spec):
+    return {str: "a string", datetime.date: "a YYYY-MM-DD date"}.get(spec, spec.__name__)
+
+
+def compile_spec(spec):
+    """Turn a spec into check(path, value, node) -> list of (line, message)"""
+    if isinstance(spec, dict):
+        return compile_schema(spec)
+
+    if isinstance(spec, tuple):
+        check_item = compile_spec(spec[0])
+
+        def check_list(path, value, node):
+            if not isinstance(value, list):
+                return [(node.start_mark.line, f"{path}: expected a list")]
+            errors = []
+            for i, (item, item_node) in enumerate(zip(value, node.value)):
+                errors += check_item(f"{path}[{i}]", item, item_node)
+            return errors
+
+        return check_list
+
+    if isinstance(spec, list):
+        allowed = set(spec)
+        listing = ", ".join(spec)
+
+        def check_choice(path, value, node):
+            if value not in allowed:
+                return [(node.start_mark.line, f"{path}: {value!r} is not one of {listing}")]
+            return []
+
+        return check_choice
+
+    def check_type(path, value, node):
+        if spec is datetime.date:
+            valid = as_date(value) is not None
+        else:
+            valid = isinstance(value, spec)
+        if not valid:
+            return [(node.start_mark.line, f"{path}: expected {type_name(spec)}, got {value!r}")]
+        return []
+
+    return check_type
+
+
+def compile_schema(schema):
+    fields = {name: (required, compile_spec(spec)) for name, (required, spec) in schema.items()}
+    required = [name for name, (req, _) in fields.items() if req]
+
+    def check_mapping(path, value, node):
+        prefix = f"{path}." if path else ""
+        if not isinstance(value, dict):
+            return [(node.start_mark.line, f"{path or 'front matter'}: expected a mapping")]
+        errors = [
+            (node.start_mark.line, f"{prefix}{name}: missing")
+            for name in required
+            if value.get(name) in (None, "")
+        ]
+        for key_node, value_node in node.value:
+            name = key_node.value
+            if name in fields and value.get(name) is not None:
+                errors += fields[name][1](prefix + name, value[name], value_node)
+        return errors
+
+    return check_mapping
+
+
+CHECKERS = None
+
+
+def checker_for(collection):
+    global CHECKERS
+    if CHECKERS is None:
+        CHECKERS = {name: compile_schema(schema) for name, schema in schemas().items()}
+    return CHECKERS.get(collection, CHECKERS["default"])
+
+
+def split_front_matter(text):
+    """Return the front matter block, or None if the file has none"""
+    if not text.startswith("---"):
+        return None
+    end = text.find("\n---", 3)
+    if end == -1:
+        return None
+    return text[text.index("\n") + 1:end + 1]
+
+
+def validate_file(filepath):
+    """Validate one document; return a list of (line, level, message)"""
+    filepath = Path(filepath)
+    collection = filepath.parent.name.lstrip("_")
+    with open(filepath, "r", encoding="utf-8") as f:
+        block = split_front_matter(f.read())
+    if block is None:
+        return [] if collection == "pages" else [(1, "error", "no front matter")]
+
+    # Line numbers below are 0-based within the block, which starts on line 2
+    loader = Loader(block)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else {}
+    except yaml.YAMLError as e:
+        mark = getattr(e, "problem_mark", None)
+        line = mark.line + 2 if mark else 1
+        return [(line, "error", getattr(e, "problem", None) or str(e))]
+    finally:
+        loader.dispose()
+    if node is None:
+        return [(1, "error", "empty front matter")]
+
+    issues = [(line + 2, "error", message) for line, message in checker_for(collection)("", data, node)]
+
+    date = as_date(data.get("date")) if isinstance(data, dict) else None
+    if date is not None:
+        line = next(k.start_mark.line for k, _ in node.value if k.value == "date") + 2
+        match = FILENAME_DATE.match(filepath.name)
+        if date == FALLBACK_DATE:
+            issues.append((line, "warning", "date is the 2024-01-01 fallback; check year/month in the source"))
+        elif match and collection in ("publications", "talks") and match.group(1) != str(date)[:10]:
+            issues.append((line, "warning", f"date {date} does not match the filename date {match.group(1)}"))
+
+    return sorted(issues)
+
+
+def validate_batch(filepaths):
+    return [(str(path), validate_file(path)) for path in filepaths]
+
+
+def collect_files(paths):
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files += sorted(p for p in path.iterdir() if p.suffix in DOCUMENT_SUFFIXES)
+        elif path.suffix in DOCUMENT_SUFFIXES:
+            files.append(path)
+    return files
+
+
+def validate(files, jobs=None):
+    """Validate files, in parallel for large trees; return {file: issues}"""
+    if len(files) < PARALLEL_THRESHOLD:
+        return dict(validate_batch(files))
+
+    jobs = jobs or os.cpu_count() or 1
+    chunk = -(-len(files) // (jobs * 4))
+    batches = [files[i:i + chunk] for i in range(0, len(files), chunk)]
+    results = {}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for batch in pool.map(validate_batch, batches):
+            results.update(batch)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate front matter of the site collections")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=[str(SITE_ROOT / d) for d in COLLECTION_DIRS],
+        help="Files or collection directories (default: every collection)",
+    )
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes for large trees")
+    parser.add_argument("--strict", action="store_true", help="Treat warnings as errors")
+
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    results = validate(files, args.jobs)
+
+    counts = {"error": 0, "warning": 0}
+    for filepath in sorted(results):
+        for line, level, message in results[filepath]:
+            counts[level] += 1
+            print(f"{filepath}:{line}: {level}: {message}")
+
+    print(f"\nChecked {len(files)} files: {counts['error']} errors, {counts['warning']} warnings")
+    failed = counts["error"] or (args.strict and counts["warning"])
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()